@@ -0,0 +1,1808 @@
+# Copyright (C) 2016 William Hicks
+#
+# This file is part of Writing3D.
+#
+# Writing3D is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+"""Recording stand-in for the parts of Blender used to build W3D projects
+
+Building a project with :py:meth:`pyw3d.project.W3DProject.blend` normally
+requires running inside Blender. This module provides in-process
+replacements for the ``bpy``, ``_bpy`` and ``mathutils`` modules which
+implement the part of their interface used by pyw3d, starting from
+Blender's default scene (a cube, a lamp and a camera), so that a build can
+be run and profiled by an ordinary Python interpreter.
+
+The stand-in keeps track of data-blocks, their names (made unique and
+sorted by name as in Blender), the objects linked to the scene, selection,
+layers, materials, game properties and logic bricks and the links between
+them. Geometry is only approximated: primitives have Blender's default
+number of vertices, but nothing is rendered and no file is written. The
+``bge`` module is not provided, since pyw3d only refers to it in the game
+scripts it writes.
+
+Every operator call and every method call on a data-block is recorded by
+:py:data:`RECORDER` along with its cost class (one of
+:py:data:`COST_CLASSES`) and the time spent in the stand-in, so that the
+Python-side cost of a build can be separated from the work it asks Blender
+to do. Calls made by the stand-in itself are not recorded.
+
+Install the stand-in before importing pyw3d::
+
+    import fake_blender
+    recorder = fake_blender.install()
+    from pyw3d.project import W3DProject
+"""
+import math
+import os
+import sys
+import time
+import types
+from bisect import bisect_left
+from collections import Counter, OrderedDict, defaultdict, namedtuple
+from contextlib import contextmanager
+from functools import wraps
+from itertools import compress, filterfalse
+from operator import attrgetter
+
+COST_OPERATOR = "operator"
+"""Calls to bpy.ops, each of which pushes an undo step and updates the scene
+in Blender"""
+COST_IO = "io"
+"""Operators and loaders which read or write files"""
+COST_DATA = "data"
+"""Creation and copying of data-blocks"""
+COST_UPDATE = "update"
+"""Evaluation of the scene or of an object's final geometry"""
+COST_RNA = "rna"
+"""Other methods of existing data (linking, writing text, transforms)"""
+COST_CLASSES = (COST_OPERATOR, COST_IO, COST_DATA, COST_UPDATE, COST_RNA)
+
+LAYER_COUNT = 20
+
+Call = namedtuple("Call", ("name", "cost", "phase", "arguments"))
+"""A single recorded call
+
+:ivar str name: Operator name (e.g. ops.logic.sensor_add) or qualified name
+    of method (e.g. data.texts.new, Text.write)
+:ivar str cost: One of :py:data:`COST_CLASSES`
+:ivar phase: Phase of the build in which the call was made
+:ivar dict arguments: Keyword arguments of operator calls (None for other
+    calls)
+"""
+
+
+class Recorder(object):
+    """Record of calls made to the stand-in
+
+    The build may be divided into named phases with :py:meth:`phase`. The
+    wall time of each phase (excluding phases nested within it) and the time
+    spent inside the stand-in are accumulated separately for each phase.
+
+    :ivar list calls: Every recorded :py:class:`Call` in order
+    :ivar phase_times: Maps name of phase to wall time in s
+    :ivar fake_times: Maps name of phase to time spent in the stand-in in s
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        """Forget all recorded calls and times"""
+        self.calls = []
+        self.phase_times = OrderedDict()
+        self.fake_times = defaultdict(float)
+        self._phases = []
+        self._depth = 0
+
+    @property
+    def current_phase(self):
+        """Name of innermost phase currently running (None outside of any
+        phase)"""
+        if self._phases:
+            return self._phases[-1][0]
+        return None
+
+    @contextmanager
+    def phase(self, name):
+        """Attribute calls and time within this context to named phase"""
+        frame = [name, time.perf_counter(), 0.0]
+        self._phases.append(frame)
+        try:
+            yield self
+        finally:
+            self._phases.pop()
+            elapsed = time.perf_counter() - frame[1]
+            self.phase_times[name] = (
+                self.phase_times.get(name, 0.0) + elapsed - frame[2])
+            if self._phases:
+                self._phases[-1][2] += elapsed
+
+    def call(self, call_name, cost, function, *args, **kwargs):
+        """Call function, recording the call unless it was made by the
+        stand-in itself
+
+        The keyword argument named arguments is recorded for operators."""
+        if self._depth:
+            return function(*args, **kwargs)
+        self._depth += 1
+        start_time = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            self._depth -= 1
+            phase = self.current_phase
+            self.fake_times[phase] += time.perf_counter() - start_time
+            self.calls.append(Call(
+                call_name, cost, phase, kwargs.get("arguments")
+                if cost in (COST_OPERATOR, COST_IO) else None
+            ))
+
+    def time_call(self, function, *args, **kwargs):
+        """Call function, counting time spent in it as time in the stand-in
+        without recording a call (used for properties which Blender
+        computes when read)"""
+        if self._depth:
+            return function(*args, **kwargs)
+        self._depth += 1
+        start_time = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            self._depth -= 1
+            self.fake_times[self.current_phase] += \
+                time.perf_counter() - start_time
+
+    def counts(self, field="name", phase=False, cost=None):
+        """Return Counter of recorded calls by given field of
+        :py:class:`Call`
+
+        :param str field: "name", "cost" or "phase"
+        :param phase: If given, only count calls made in this phase
+        :param str cost: If given, only count calls of this cost class
+        """
+        return Counter(
+            getattr(call, field) for call in self.calls
+            if (phase is False or call.phase == phase) and
+            (cost is None or call.cost == cost)
+        )
+
+
+RECORDER = Recorder()
+"""The :py:class:`Recorder` used by the stand-in"""
+
+
+def _recorded(cost):
+    """Decorator recording calls to a method under the name of its class"""
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            return RECORDER.call(
+                "{}.{}".format(type(self).__name__, method.__name__), cost,
+                method, self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# mathutils
+
+
+class Vector(object):
+    """Vector of floats, as mathutils.Vector"""
+
+    __slots__ = ("_values",)
+
+    def __init__(self, values=(0.0, 0.0, 0.0)):
+        self._values = [float(value) for value in values]
+
+    def copy(self):
+        return Vector(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __getitem__(self, index):
+        return self._values[index]
+
+    def __setitem__(self, index, value):
+        self._values[index] = float(value)
+
+    def _axis(index):
+        def get_axis(self):
+            return self._values[index]
+
+        def set_axis(self, value):
+            self._values[index] = float(value)
+        return property(get_axis, set_axis)
+
+    x = _axis(0)
+    y = _axis(1)
+    z = _axis(2)
+    w = _axis(3)
+    del _axis
+
+    def __add__(self, other):
+        return Vector(a + b for a, b in zip(self._values, other))
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return Vector(a - b for a, b in zip(self._values, other))
+
+    def __rsub__(self, other):
+        return Vector(b - a for a, b in zip(self._values, other))
+
+    def __neg__(self):
+        return Vector(-a for a in self._values)
+
+    def __mul__(self, other):
+        if isinstance(other, (Vector, list, tuple)):
+            return self.dot(other)
+        return Vector(a * other for a in self._values)
+
+    def __rmul__(self, other):
+        return self * other
+
+    def __truediv__(self, other):
+        return Vector(a / other for a in self._values)
+
+    def __eq__(self, other):
+        try:
+            return list(self) == [float(value) for value in other]
+        except TypeError:
+            return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    __hash__ = None
+
+    def dot(self, other):
+        return sum(a * b for a, b in zip(self._values, other))
+
+    def cross(self, other):
+        a = self._values
+        b = list(other)
+        return Vector((
+            a[1] * b[2] - a[2] * b[1],
+            a[2] * b[0] - a[0] * b[2],
+            a[0] * b[1] - a[1] * b[0]
+        ))
+
+    @property
+    def length(self):
+        return math.sqrt(self.dot(self._values))
+
+    def normalized(self):
+        length = self.length
+        if length == 0:
+            return self.copy()
+        return self / length
+
+    def normalize(self):
+        self._values = self.normalized()._values
+
+    def to_3d(self):
+        return Vector((list(self._values) + [0.0, 0.0, 0.0])[:3])
+
+    def __repr__(self):
+        return "Vector(({}))".format(
+            ", ".join("{:.4f}".format(value) for value in self._values))
+
+
+class _MatrixColumns(object):
+    """Accessor for columns of a Matrix, as Matrix.col"""
+
+    __slots__ = ("_matrix",)
+
+    def __init__(self, matrix):
+        self._matrix = matrix
+
+    def __getitem__(self, index):
+        return Vector(row[index] for row in self._matrix._rows)
+
+    def __setitem__(self, index, values):
+        for row, value in zip(self._matrix._rows, values):
+            row[index] = value
+
+
+class Matrix(object):
+    """Square matrix of floats, as mathutils.Matrix (2.7x API, in which *
+    is matrix multiplication)"""
+
+    __slots__ = ("_rows",)
+
+    def __init__(self, rows=None):
+        if rows is None:
+            rows = Matrix.Identity(4)._rows
+        self._rows = [Vector(row) for row in rows]
+
+    @classmethod
+    def Identity(matrix_class, size):
+        return matrix_class(
+            [float(row == column) for column in range(size)]
+            for row in range(size)
+        )
+
+    @classmethod
+    def Rotation(matrix_class, angle, size, axis):
+        if isinstance(axis, str):
+            axis = {"X": (1, 0, 0), "Y": (0, 1, 0), "Z": (0, 0, 1)}[axis]
+        x, y, z = Vector(axis).normalized()
+        cosine = math.cos(angle)
+        sine = math.sin(angle)
+        complement = 1 - cosine
+        rotation = matrix_class((
+            (cosine + x * x * complement, x * y * complement - z * sine,
+             x * z * complement + y * sine),
+            (y * x * complement + z * sine, cosine + y * y * complement,
+             y * z * complement - x * sine),
+            (z * x * complement - y * sine, z * y * complement + x * sine,
+             cosine + z * z * complement)
+        ))
+        if size == 4:
+            return rotation.to_4x4()
+        return rotation
+
+    @classmethod
+    def Translation(matrix_class, vector):
+        translation = matrix_class.Identity(4)
+        translation.translation = vector
+        return translation
+
+    @classmethod
+    def Scale(matrix_class, factor, size, axis=None):
+        scale = matrix_class.Identity(size)
+        for index in range(min(size, 3)):
+            scale._rows[index][index] = factor
+        return scale
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def __getitem__(self, index):
+        return self._rows[index]
+
+    @property
+    def col(self):
+        return _MatrixColumns(self)
+
+    def copy(self):
+        return Matrix(self._rows)
+
+    def _resized(self, size):
+        resized = Matrix.Identity(size)
+        for row in range(min(size, len(self))):
+            for column in range(min(size, len(self))):
+                resized._rows[row][column] = self._rows[row][column]
+        return resized
+
+    def to_3x3(self):
+        return self._resized(3)
+
+    def to_4x4(self):
+        return self._resized(4)
+
+    @property
+    def translation(self):
+        return Vector(row[3] for row in self._rows[:3])
+
+    @translation.setter
+    def translation(self, vector):
+        for row, value in zip(self._rows[:3], vector):
+            row[3] = value
+
+    def to_euler(self, order="XYZ"):
+        rows = self._rows
+        return Euler((
+            math.atan2(rows[2][1], rows[2][2]),
+            math.atan2(-rows[2][0], math.hypot(rows[0][0], rows[1][0])),
+            math.atan2(rows[1][0], rows[0][0])
+        ), order)
+
+    def __mul__(self, other):
+        if isinstance(other, Matrix):
+            columns = [other.col[index] for index in range(len(other))]
+            return Matrix(
+                [row.dot(column) for column in columns] for row in self._rows
+            )
+        vector = list(other)
+        if len(vector) < len(self):
+            vector = vector + [1.0]
+        product = Vector(row.dot(vector) for row in self._rows)
+        if len(product) > len(other):
+            return Vector(list(product)[:len(other)])
+        return product
+
+    def __repr__(self):
+        return "Matrix(({}))".format(", ".join(
+            repr(tuple(row)) for row in self._rows))
+
+
+class Euler(object):
+    """Euler rotation in radians, as mathutils.Euler
+
+    Only the XYZ order used by pyw3d is supported"""
+
+    __slots__ = ("_values", "order")
+
+    def __init__(self, angles=(0.0, 0.0, 0.0), order="XYZ"):
+        if order != "XYZ":
+            raise NotImplementedError(
+                "Only XYZ Euler rotations are supported")
+        self._values = [float(angle) for angle in angles]
+        self.order = order
+
+    x = Vector.x
+    y = Vector.y
+    z = Vector.z
+    __len__ = Vector.__len__
+    __iter__ = Vector.__iter__
+    __getitem__ = Vector.__getitem__
+    __setitem__ = Vector.__setitem__
+
+    def copy(self):
+        return Euler(self._values, self.order)
+
+    def to_matrix(self):
+        return (
+            Matrix.Rotation(self._values[2], 3, "Z") *
+            Matrix.Rotation(self._values[1], 3, "Y") *
+            Matrix.Rotation(self._values[0], 3, "X")
+        )
+
+    def rotate(self, other):
+        """Rotate by Euler or Matrix"""
+        if isinstance(other, Euler):
+            other = other.to_matrix()
+        self._values = list(
+            (other.to_3x3() * self.to_matrix()).to_euler()._values)
+
+    def __repr__(self):
+        return "Euler(({}), '{}')".format(
+            ", ".join("{:.4f}".format(value) for value in self._values),
+            self.order)
+
+
+# Data-blocks
+
+
+class _DataCollection(object):
+    """A collection of data-blocks in bpy.data (e.g. bpy.data.objects)
+
+    As in Blender, names are made unique by adding a numbered suffix and the
+    collection is kept sorted by name ignoring case, which determines what
+    is found at a given index (e.g. bpy.data.lamps[-1]).
+    """
+
+    def __init__(self, key, id_class):
+        self._key = key
+        self._id_class = id_class
+        self._items = []
+        self._sort_keys = []
+        self._by_name = {}
+        self._free_numbers = {}
+        """Maps base names to the lowest number which may be free"""
+
+    @staticmethod
+    def _sort_key(name):
+        return (name.lower(), name)
+
+    @staticmethod
+    def _split_name(name):
+        """Return base name and number of name numbered as by Blender"""
+        base_name, _, suffix = name.rpartition(".")
+        if base_name and suffix.isdigit() and len(suffix) == 3:
+            return base_name, int(suffix)
+        return name, 0
+
+    def _unique_name(self, name):
+        if name not in self._by_name:
+            return name
+        base_name = self._split_name(name)[0]
+        number = self._free_numbers.get(base_name, 1)
+        while "{}.{:03d}".format(base_name, number) in self._by_name:
+            number += 1
+        self._free_numbers[base_name] = number + 1
+        return "{}.{:03d}".format(base_name, number)
+
+    def _add(self, item, name):
+        item._name = self._unique_name(name)
+        item.id_data_collection = self
+        sort_key = self._sort_key(item._name)
+        index = bisect_left(self._sort_keys, sort_key)
+        self._sort_keys.insert(index, sort_key)
+        self._items.insert(index, item)
+        self._by_name[item._name] = item
+        return item
+
+    def _unlink(self, item):
+        index = bisect_left(self._sort_keys, self._sort_key(item._name))
+        del self._sort_keys[index]
+        del self._items[index]
+        del self._by_name[item._name]
+        base_name, number = self._split_name(item._name)
+        if number and number < self._free_numbers.get(base_name, 1):
+            self._free_numbers[base_name] = number
+        item.id_data_collection = None
+
+    def _rename(self, item, name):
+        if name == item._name:
+            return
+        self._unlink(item)
+        self._add(item, name)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self._by_name[key]
+        return self._items[key]
+
+    def __contains__(self, name):
+        return name in self._by_name
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, name, default=None):
+        return self._by_name.get(name, default)
+
+    def keys(self):
+        return [item.name for item in self._items]
+
+    def _new(self, name, *args, **kwargs):
+        return self._add(self._id_class(*args, **kwargs), name)
+
+    def new(self, name, *args, **kwargs):
+        """Create new data-block with given name"""
+        return RECORDER.call(
+            "data.{}.new".format(self._key), COST_DATA, self._new, name,
+            *args, **kwargs)
+
+    def _load(self, filepath):
+        filepath = str(filepath)
+        if not os.path.exists(filepath):
+            raise RuntimeError("Error: Cannot read file '{}'".format(
+                os.path.abspath(filepath)))
+        new_item = self._new(os.path.basename(filepath))
+        new_item.filepath = filepath
+        return new_item
+
+    def load(self, filepath):
+        """Load data-block from file"""
+        return RECORDER.call(
+            "data.{}.load".format(self._key), COST_IO, self._load, filepath)
+
+    def _remove(self, item):
+        self._unlink(item)
+
+    def remove(self, item):
+        """Remove data-block"""
+        return RECORDER.call(
+            "data.{}.remove".format(self._key), COST_DATA, self._remove,
+            item)
+
+
+class ID(object):
+    """Base of all data-blocks
+
+    Properties of data-blocks and other structures are ordinary attributes.
+    Any attribute may be set, but reading one which has neither been set
+    nor given a default raises AttributeError, as for an unknown property
+    in Blender.
+    """
+
+    def __init__(self):
+        self._name = ""
+        self.id_data_collection = None
+        self.use_fake_user = False
+        self.packed_file = None
+        self._users = 0
+
+    @property
+    def users(self):
+        """Number of objects using this data-block, plus its fake user"""
+        return self._users + int(self.use_fake_user)
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, name):
+        if self.id_data_collection is None:
+            self._name = name
+        else:
+            self.id_data_collection._rename(self, name)
+
+    def _copy(self):
+        """Return unlinked shallow copy of this data-block"""
+        new_id = object.__new__(type(self))
+        new_id.__dict__.update(self.__dict__)
+        new_id.id_data_collection = None
+        new_id._users = 0
+        return new_id
+
+    def _copy_linked(self):
+        new_id = self._copy()
+        if self.id_data_collection is not None:
+            self.id_data_collection._add(new_id, self._name)
+        return new_id
+
+    @_recorded(COST_DATA)
+    def copy(self):
+        return self._copy_linked()
+
+    def __repr__(self):
+        return "<{} {!r}>".format(type(self).__name__, self._name)
+
+
+class MeshVertex(object):
+    __slots__ = ("co",)
+
+    def __init__(self, co):
+        self.co = Vector(co)
+
+
+class UVLayer(object):
+    def __init__(self, polygon_count):
+        self.name = "UVMap"
+        self.data = [
+            types.SimpleNamespace(image=None)
+            for _ in range(max(polygon_count, 1))
+        ]
+
+
+class UVTextures(list):
+    """Mesh.uv_textures"""
+
+    def __init__(self, mesh):
+        super(UVTextures, self).__init__()
+        self._mesh = mesh
+
+    @_recorded(COST_RNA)
+    def new(self, name="UVMap"):
+        layer = UVLayer(self._mesh.polygon_count)
+        layer.name = name
+        self.append(layer)
+        return layer
+
+
+class IDMaterials(list):
+    """Materials of an object's data (Mesh.materials, Curve.materials)"""
+
+    @_recorded(COST_RNA)
+    def append(self, material):
+        super(IDMaterials, self).append(material)
+
+
+def _transform_vertices(vertices, matrix):
+    matrix = matrix.to_4x4()
+    for vertex in vertices:
+        vertex.co = matrix * vertex.co
+
+
+class Mesh(ID):
+    def __init__(self, vertices=(), polygon_count=0):
+        super(Mesh, self).__init__()
+        self.vertices = [MeshVertex(co) for co in vertices]
+        self.polygon_count = polygon_count
+        self.uv_textures = UVTextures(self)
+        self.materials = IDMaterials()
+
+    def _copy(self):
+        new_mesh = super(Mesh, self)._copy()
+        new_mesh.vertices = [MeshVertex(vertex.co) for vertex in self.vertices]
+        new_mesh.uv_textures = UVTextures(new_mesh)
+        new_mesh.uv_textures.extend(self.uv_textures)
+        new_mesh.materials = IDMaterials(self.materials)
+        return new_mesh
+
+    @_recorded(COST_RNA)
+    def transform(self, matrix):
+        _transform_vertices(self.vertices, matrix)
+
+    def _bounds(self):
+        if not self.vertices:
+            return Vector((0, 0, 0))
+        return Vector(
+            max(vertex.co[axis] for vertex in self.vertices) -
+            min(vertex.co[axis] for vertex in self.vertices)
+            for axis in range(3)
+        )
+
+
+TEXT_VERTICES_PER_CHARACTER = 24
+"""Approximate number of vertices in the mesh of one filled character"""
+
+
+class Curve(ID):
+    def __init__(self, type="CURVE"):
+        super(Curve, self).__init__()
+        self.type = type
+        self.materials = IDMaterials()
+        self.dimensions_scale = 1.0
+        self.resolution_u = 12
+        self.resolution_v = 12
+        self.extrude = 0.0
+        self.fill_mode = "FULL"
+        if type == "FONT":
+            self.body = ""
+            self.space_line = 1.0
+            self.font = None
+            self.align = "LEFT"
+            self.offset_y = 0.0
+            self.size = 1.0
+
+    @_recorded(COST_RNA)
+    def transform(self, matrix):
+        pass
+
+    def _lines(self):
+        return self.body.split("\n") if self.type == "FONT" else []
+
+    def _bounds(self):
+        lines = self._lines()
+        if not lines:
+            return Vector((0, 0, 0))
+        return Vector((
+            0.5 * self.size * max(len(line) for line in lines),
+            self.size * (0.7 + self.space_line * (len(lines) - 1)),
+            2 * self.extrude
+        ))
+
+    def _vertex_count(self):
+        characters = sum(
+            1 for character in self.body if not character.isspace())
+        count = TEXT_VERTICES_PER_CHARACTER * characters
+        if self.extrude:
+            count *= 2
+        return count
+
+
+class Lamp(ID):
+    def __init__(self, type="POINT"):
+        super(Lamp, self).__init__()
+        self.type = type
+        self.color = [1.0, 1.0, 1.0]
+        self.energy = 1.0
+        self.distance = 25.0
+        self.falloff_type = "INVERSE_SQUARE"
+        self.linear_attenuation = 0.0
+        self.quadratic_attenuation = 1.0
+        self.use_diffuse = True
+        self.use_specular = True
+        self.spot_size = math.radians(45)
+
+
+class Camera(ID):
+    def __init__(self):
+        super(Camera, self).__init__()
+        self.clip_start = 0.1
+        self.clip_end = 100.0
+        self.lens = 35.0
+
+
+class TextureSlot(object):
+    def __init__(self):
+        self.texture = None
+        self.texture_coords = "ORCO"
+        self.use_map_alpha = False
+
+
+class TextureSlots(object):
+    """Material.texture_slots"""
+
+    SLOT_COUNT = 18
+
+    def __init__(self, slots=()):
+        slots = list(slots)
+        self._slots = slots + [None] * (self.SLOT_COUNT - len(slots))
+
+    @_recorded(COST_RNA)
+    def add(self):
+        index = self._slots.index(None)
+        self._slots[index] = TextureSlot()
+        return self._slots[index]
+
+    def __getitem__(self, index):
+        return self._slots[index]
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __iter__(self):
+        return iter(self._slots)
+
+
+class Material(ID):
+    def __init__(self):
+        super(Material, self).__init__()
+        self.texture_slots = TextureSlots()
+        self.game_settings = types.SimpleNamespace(
+            use_backface_culling=True, alpha_blend="OPAQUE")
+        self.diffuse_color = [0.8, 0.8, 0.8]
+        self.alpha = 1.0
+        self.use_nodes = False
+        self.use_shadeless = False
+        self.use_transparency = False
+        self.transparency_method = "MASK"
+        self.use_object_color = False
+
+    def _copy(self):
+        new_material = super(Material, self)._copy()
+        new_material.texture_slots = TextureSlots(
+            types.SimpleNamespace(**vars(slot)) if slot is not None else None
+            for slot in self.texture_slots)
+        new_material.game_settings = types.SimpleNamespace(
+            **vars(self.game_settings))
+        return new_material
+
+
+class Texture(ID):
+    def __init__(self, type="IMAGE"):
+        super(Texture, self).__init__()
+        self.type = type
+        self.image = None
+
+
+class Image(ID):
+    def __init__(self):
+        super(Image, self).__init__()
+        self.filepath = ""
+        self.use_alpha = True
+
+
+class VectorFont(ID):
+    def __init__(self):
+        super(VectorFont, self).__init__()
+        self.filepath = "<builtin>"
+
+
+class Sound(ID):
+    def __init__(self):
+        super(Sound, self).__init__()
+        self.filepath = ""
+
+
+class Text(ID):
+    """Text data-block (a script)"""
+
+    def __init__(self):
+        super(Text, self).__init__()
+        self._chunks = []
+
+    @_recorded(COST_RNA)
+    def write(self, text):
+        self._chunks.append(text)
+
+    @_recorded(COST_RNA)
+    def clear(self):
+        self._chunks = []
+
+    @_recorded(COST_RNA)
+    def as_string(self):
+        return "".join(self._chunks)
+
+
+class World(ID):
+    def __init__(self):
+        super(World, self).__init__()
+        self.horizon_color = [0.05, 0.05, 0.05]
+        self.ambient_color = [0.0, 0.0, 0.0]
+
+
+class Screen(ID):
+    def __init__(self):
+        super(Screen, self).__init__()
+        self.areas = []
+
+
+# Game logic
+
+SENSOR_DEFAULTS = {
+    "PROPERTY": {
+        "property": "", "value": "", "evaluation_type": "PROPEQUAL"},
+    "KEYBOARD": {"key": "NONE"},
+    "MOUSE": {"mouse_event": "LEFTCLICK"},
+}
+CONTROLLER_DEFAULTS = {
+    "PYTHON": {"mode": "SCRIPT", "module": "", "text": None},
+}
+ACTUATOR_DEFAULTS = {
+    "MOTION": {
+        "mode": "OBJECT_NORMAL", "use_local_location": False,
+        "use_local_rotation": True},
+    "SOUND": {
+        "sound": None, "mode": "PLAYSTOP", "volume": 1.0, "pitch": 0.0,
+        "use_sound_3d": False},
+    "PROPERTY": {
+        "mode": "ASSIGN", "property": "", "object": None,
+        "object_property": "", "value": ""},
+}
+
+
+class LogicBrick(object):
+    """A sensor, controller or actuator"""
+
+    defaults = {}
+
+    def __init__(self, type, name):
+        self.type = type
+        self.name = name
+        self.active = True
+        for property_name, value in self.defaults.get(type, {}).items():
+            setattr(self, property_name, value)
+
+    def __repr__(self):
+        return "<{} {!r} ({})>".format(
+            type(self).__name__, self.name, self.type)
+
+
+class Sensor(LogicBrick):
+    defaults = SENSOR_DEFAULTS
+
+    def __init__(self, type, name):
+        super(Sensor, self).__init__(type, name)
+        self.controllers = []
+        self.use_pulse_true_level = False
+        self.use_pulse_false_level = False
+        self.tick_skip = 0
+        self.invert = False
+
+    @_recorded(COST_RNA)
+    def link(self, controller):
+        _link(self, controller)
+
+
+class Controller(LogicBrick):
+    defaults = CONTROLLER_DEFAULTS
+
+    def __init__(self, type, name):
+        super(Controller, self).__init__(type, name)
+        self.actuators = []
+
+    @_recorded(COST_RNA)
+    def link(self, sensor=None, actuator=None):
+        if sensor is not None:
+            _link(sensor, self)
+        if actuator is not None and actuator not in self.actuators:
+            self.actuators.append(actuator)
+
+
+class Actuator(LogicBrick):
+    defaults = ACTUATOR_DEFAULTS
+
+    def __init__(self, type, name):
+        super(Actuator, self).__init__(type, name)
+        if type == "MOTION":
+            self.offset_location = Vector((0, 0, 0))
+            self.offset_rotation = Vector((0, 0, 0))
+
+    @_recorded(COST_RNA)
+    def link(self, controller):
+        if self not in controller.actuators:
+            controller.actuators.append(self)
+
+
+def _link(sensor, controller):
+    if controller not in sensor.controllers:
+        sensor.controllers.append(controller)
+
+
+class _NamedList(list):
+    """List which may also be indexed by name (e.g. Object.game.sensors)"""
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            for item in self:
+                if item.name == key:
+                    return item
+            raise KeyError("key \"{}\" not found".format(key))
+        return super(_NamedList, self).__getitem__(key)
+
+    def __contains__(self, name):
+        return any(item.name == name for item in self)
+
+    def unique_name(self, name):
+        if name not in self:
+            return name
+        number = 1
+        while "{}.{:03d}".format(name, number) in self:
+            number += 1
+        return "{}.{:03d}".format(name, number)
+
+
+class GameProperty(object):
+    DEFAULT_VALUES = {
+        "BOOL": False, "INT": 0, "FLOAT": 0.0, "STRING": "", "TIMER": 0.0}
+
+    def __init__(self, type, name):
+        self.type = type
+        self.name = name
+        self.value = self.DEFAULT_VALUES[type]
+        self.show_debug = False
+
+
+class GameObjectSettings(object):
+    """Object.game"""
+
+    def __init__(self):
+        self.sensors = _NamedList()
+        self.controllers = _NamedList()
+        self.actuators = _NamedList()
+        self.properties = _NamedList()
+        self.physics_type = "STATIC"
+        self.use_ghost = False
+
+    def copy(self):
+        new_settings = GameObjectSettings()
+        new_settings.physics_type = self.physics_type
+        new_settings.use_ghost = self.use_ghost
+        copies = {}
+        for bricks_name in ("properties", "sensors", "controllers",
+                            "actuators"):
+            for brick in getattr(self, bricks_name):
+                copies[id(brick)] = object.__new__(type(brick))
+                copies[id(brick)].__dict__.update(brick.__dict__)
+                getattr(new_settings, bricks_name).append(copies[id(brick)])
+        for sensor in new_settings.sensors:
+            sensor.controllers = [
+                copies[id(controller)] for controller in sensor.controllers]
+        for controller in new_settings.controllers:
+            controller.actuators = [
+                copies[id(actuator)] for actuator in controller.actuators]
+        return new_settings
+
+
+# Objects and scenes
+
+
+class MaterialSlot(object):
+    """Material slot of an object, holding a material of its data (link
+    'DATA') or of the object itself (link 'OBJECT')"""
+
+    def __init__(self, blender_object, index):
+        self._object = blender_object
+        self._index = index
+        blender_object._object_slots(index + 1)
+
+    @property
+    def link(self):
+        return self._object._material_links[self._index]
+
+    @link.setter
+    def link(self, link):
+        self._object._material_links[self._index] = link
+
+    @property
+    def material(self):
+        if self.link == 'OBJECT':
+            return self._object._materials[self._index]
+        return self._object.data.materials[self._index]
+
+    @material.setter
+    def material(self, material):
+        if self.link == 'OBJECT':
+            self._object._materials[self._index] = material
+        else:
+            self._object.data.materials[self._index] = material
+
+
+class Object(ID):
+    def __init__(self, object_data=None):
+        super(Object, self).__init__()
+        self._data = None
+        self.data = object_data
+        self._materials = []
+        self._material_links = []
+        self.location = Vector((0, 0, 0))
+        self.rotation_euler = Euler((0, 0, 0))
+        self.scale = Vector((1, 1, 1))
+        self.color = [1.0, 1.0, 1.0, 1.0]
+        self._scenes = []
+        self.layers = [layer == 0 for layer in range(LAYER_COUNT)]
+        self.select = False
+        self.hide = False
+        self.hide_render = False
+        self.hide_select = False
+        self.parent = None
+        self.game = GameObjectSettings()
+
+    def _converted(name, convert):
+        """Property converting values assigned to it, as for arrays"""
+        attribute = "_" + name
+
+        def get_value(self):
+            return getattr(self, attribute)
+
+        def set_value(self, value):
+            setattr(self, attribute, convert(value))
+        return property(get_value, set_value)
+
+    location = _converted("location", Vector)
+    rotation_euler = _converted("rotation_euler", Euler)
+    scale = _converted("scale", Vector)
+    color = _converted("color", list)
+    del _converted
+
+    @property
+    def layers(self):
+        return self._layers
+
+    @layers.setter
+    def layers(self, layers):
+        previous_layers = getattr(self, "_layers", None)
+        self._layers = list(layers)
+        for scene in self._scenes:
+            scene._update_visible(self, previous_layers)
+
+    @property
+    def data(self):
+        return self._data
+
+    @data.setter
+    def data(self, object_data):
+        if self._data is not None:
+            self._data._users -= 1
+        if object_data is not None:
+            object_data._users += 1
+        self._data = object_data
+
+    @property
+    def type(self):
+        if self.data is None:
+            return "EMPTY"
+        if isinstance(self.data, Curve):
+            return self.data.type
+        return type(self.data).__name__.upper()
+
+    def _object_slots(self, count):
+        """Extend the object's own materials to cover count slots"""
+        while len(self._materials) < count:
+            self._materials.append(None)
+            self._material_links.append('DATA')
+
+    @property
+    def material_slots(self):
+        materials = getattr(self.data, "materials", ())
+        return [
+            MaterialSlot(self, index)
+            for index in range(len(materials))]
+
+    @property
+    def active_material(self):
+        materials = getattr(self.data, "materials", ())
+        if len(materials):
+            return MaterialSlot(self, 0).material
+        return None
+
+    @active_material.setter
+    def active_material(self, material):
+        materials = getattr(self.data, "materials", None)
+        if materials is None:
+            return
+        if len(materials):
+            MaterialSlot(self, 0).material = material
+        else:
+            list.append(materials, material)
+
+    @property
+    def dimensions(self):
+        if self.data is None or not hasattr(self.data, "_bounds"):
+            return Vector((0, 0, 0))
+        return Vector(
+            extent * scale for extent, scale in
+            zip(self.data._bounds(), self.scale))
+
+    @property
+    def matrix_world(self):
+        scale = Matrix.Identity(4)
+        for axis in range(3):
+            scale[axis][axis] = self.scale[axis]
+        return (
+            Matrix.Translation(self.location) *
+            self.rotation_euler.to_matrix().to_4x4() * scale)
+
+    def _copy(self):
+        new_object = super(Object, self)._copy()
+        new_object._scenes = []
+        new_object._data = None
+        new_object.data = self.data
+        new_object._materials = list(self._materials)
+        new_object._material_links = list(self._material_links)
+        for name in ("location", "rotation_euler", "scale", "color",
+                     "layers"):
+            setattr(new_object, name, getattr(self, name))
+        new_object.game = self.game.copy()
+        new_object.select = False
+        return new_object
+
+    @_recorded(COST_RNA)
+    def animation_data_clear(self):
+        pass
+
+    @_recorded(COST_UPDATE)
+    def to_mesh(self, scene, apply_modifiers, settings):
+        if isinstance(self.data, Mesh):
+            return self.data._copy_linked()
+        return _BLENDER.data.meshes._new(
+            self.data.name, _sphere_vertices(self.data._vertex_count(), 1.0),
+            len(self.data._lines()))
+
+
+class SceneObjects(object):
+    """Scene.objects"""
+
+    def __init__(self, scene):
+        self._scene = scene
+        self._objects = []
+        self._ids = set()
+        self._active = None
+
+    @property
+    def active(self):
+        return self._active
+
+    @active.setter
+    def active(self, blender_object):
+        RECORDER.call(
+            "SceneObjects.active", COST_RNA, setattr, self, "_active",
+            blender_object)
+
+    def _link(self, blender_object):
+        if id(blender_object) in self._ids:
+            raise RuntimeError(
+                "Object '{}' already in scene".format(blender_object.name))
+        self._objects.append(blender_object)
+        self._ids.add(id(blender_object))
+        blender_object._scenes.append(self._scene)
+        self._scene._add_visible(blender_object)
+
+    def _unlink(self, blender_object):
+        self._objects.remove(blender_object)
+        self._ids.remove(id(blender_object))
+        blender_object._scenes.remove(self._scene)
+        _BLENDER.visibility_changes += 1
+        if self._active is blender_object:
+            self._active = None
+
+    @_recorded(COST_RNA)
+    def link(self, blender_object):
+        self._link(blender_object)
+
+    @_recorded(COST_RNA)
+    def unlink(self, blender_object):
+        self._unlink(blender_object)
+
+    def __contains__(self, blender_object):
+        return id(blender_object) in self._ids
+
+    def __iter__(self):
+        return iter(self._objects)
+
+    def __len__(self):
+        return len(self._objects)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            for blender_object in self._objects:
+                if blender_object.name == key:
+                    return blender_object
+            raise KeyError("key \"{}\" not found".format(key))
+        return self._objects[key]
+
+
+class Scene(ID):
+    def __init__(self):
+        super(Scene, self).__init__()
+        self.objects = SceneObjects(self)
+        self.layers = [layer == 0 for layer in range(LAYER_COUNT)]
+        self._visible = (None, [])
+        self.camera = None
+        self.world = None
+        self.game_settings = types.SimpleNamespace(
+            physics_gravity=9.8, material_mode="MULTITEXTURE",
+            resolution_x=640, resolution_y=480, frame_type="LETTERBOX")
+
+    @_recorded(COST_UPDATE)
+    def update(self):
+        pass
+
+    @property
+    def layers(self):
+        return self._layers
+
+    @layers.setter
+    def layers(self, layers):
+        self._layers = list(layers)
+        _BLENDER.visibility_changes += 1
+
+    def _is_visible(self, blender_object):
+        return any(compress(blender_object._layers, self._layers))
+
+    def _update_visible(self, blender_object, previous_layers):
+        """Keep list of visible objects current as an object's layers
+        change"""
+        changes, visible = self._visible
+        was_visible = any(compress(previous_layers, self._layers))
+        if changes != _BLENDER.visibility_changes or \
+                was_visible == self._is_visible(blender_object):
+            return
+        if was_visible:
+            # Recently added objects are the most likely to be moved
+            for index in range(len(visible) - 1, -1, -1):
+                if visible[index] is blender_object:
+                    del visible[index]
+                    break
+        else:
+            visible.append(blender_object)
+
+    def _add_visible(self, blender_object):
+        """Keep list of visible objects current as an object is linked"""
+        changes, visible = self._visible
+        if changes == _BLENDER.visibility_changes and \
+                self._is_visible(blender_object):
+            visible.append(blender_object)
+
+    def _visible_objects(self):
+        """Return list of objects on any visible layer, which is kept until
+        objects are unlinked or layers change and must not be modified"""
+        changes, visible = self._visible
+        if changes != _BLENDER.visibility_changes:
+            visible = list(filter(self._is_visible, self.objects))
+            self._visible = (_BLENDER.visibility_changes, visible)
+        return visible
+
+
+class BlendData(object):
+    """bpy.data, containing Blender's default scene"""
+
+    COLLECTIONS = (
+        ("objects", Object), ("meshes", Mesh), ("curves", Curve),
+        ("lamps", Lamp), ("cameras", Camera), ("materials", Material),
+        ("textures", Texture), ("images", Image), ("fonts", VectorFont),
+        ("sounds", Sound), ("texts", Text), ("scenes", Scene),
+        ("worlds", World), ("screens", Screen),
+    )
+    DEFAULT_SCREENS = (
+        "3D View Full", "Animation", "Compositing", "Default", "Game Logic",
+        "Motion Tracking", "Scripting", "UV Editing", "Video Editing"
+    )
+
+    def __init__(self):
+        for key, id_class in self.COLLECTIONS:
+            setattr(self, key, _DataCollection(key, id_class))
+        for name in self.DEFAULT_SCREENS:
+            self.screens._new(name)
+        self.fonts._new("Bfont")
+        scene = self.scenes._new("Scene")
+        scene.world = self.worlds._new("World")
+
+        cube_mesh = self.meshes._new(
+            "Cube", _cube_vertices(1.0), polygon_count=6)
+        list.append(cube_mesh.materials, self.materials._new("Material"))
+        for name, object_data, location in (
+                ("Cube", cube_mesh, (0, 0, 0)),
+                ("Lamp", self.lamps._new("Lamp"), (4.08, 1.01, 5.90)),
+                ("Camera", self.cameras._new("Camera"), (7.48, -6.51, 5.34))
+        ):
+            new_object = self.objects._new(name, object_data)
+            new_object.location = location
+            scene.objects._link(new_object)
+        scene.camera = self.objects["Camera"]
+        scene.objects._active = self.objects["Cube"]
+        self.objects["Cube"].select = True
+
+
+class Context(object):
+    """bpy.context"""
+
+    def __init__(self, data):
+        self.scene = data.scenes["Scene"]
+        self.window = types.SimpleNamespace(screen=data.screens["Default"])
+
+    @property
+    def object(self):
+        return self.scene.objects.active
+
+    @property
+    def active_object(self):
+        return self.scene.objects.active
+
+    def _selectable_objects(self):
+        return list(filterfalse(
+            attrgetter("hide_select"), self.scene._visible_objects()))
+
+    def _selected_objects(self):
+        return list(filter(
+            attrgetter("select"), self.scene._visible_objects()))
+
+    @property
+    def selectable_objects(self):
+        return RECORDER.time_call(self._selectable_objects)
+
+    @property
+    def selected_objects(self):
+        return RECORDER.time_call(self._selected_objects)
+
+
+# Geometry of primitives
+
+
+def _cube_vertices(radius):
+    return [
+        (x * radius, y * radius, z * radius)
+        for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)
+    ]
+
+
+def _sphere_vertices(count, radius):
+    """Return count points spread over sphere of given radius"""
+    vertices = []
+    for index in range(count):
+        z = 1 - 2 * (index + 0.5) / count
+        ring = math.sqrt(1 - z * z)
+        angle = index * math.pi * (3 - math.sqrt(5))
+        vertices.append((
+            radius * ring * math.cos(angle), radius * ring * math.sin(angle),
+            radius * z))
+    return vertices
+
+
+PRIMITIVES = {
+    "plane": (
+        "Plane", 1,
+        lambda radius: [(x * radius, y * radius, 0) for x in (-1, 1)
+                        for y in (-1, 1)]),
+    "cube": ("Cube", 6, _cube_vertices),
+    "uv_sphere": (
+        "Sphere", 512, lambda radius: _sphere_vertices(482, radius)),
+    "cone": ("Cone", 33, lambda radius: _sphere_vertices(33, radius)),
+    "cylinder": (
+        "Cylinder", 34, lambda radius: _sphere_vertices(64, radius)),
+    "monkey": ("Suzanne", 500, lambda radius: _sphere_vertices(507, radius)),
+}
+"""Maps name of mesh.primitive_*_add operator to object name, number of
+polygons and function returning vertices for given radius"""
+
+LAMP_NAMES = {
+    "POINT": "Point", "SUN": "Sun", "SPOT": "Spot", "HEMI": "Hemi",
+    "AREA": "Area"
+}
+
+
+# Operators
+
+
+class _OperatorRegistry(object):
+    """Implementations of the operators used by pyw3d"""
+
+    IO_OPERATORS = (
+        "import_scene.obj", "sound.open", "file.pack_all",
+        "wm.save_as_mainfile"
+    )
+
+    def __init__(self):
+        self._override = {}
+
+    def call(self, name, arguments, context=None):
+        """Run operator, taking its object from the context override if it
+        is not named in the arguments"""
+        try:
+            category, operator = name.split(".")
+            implementation = getattr(
+                self, "{}_{}".format(category, operator))
+        except (ValueError, AttributeError):
+            raise AttributeError(
+                "Operator \"{}\" is not implemented by the stand-in".format(
+                    name))
+        cost = COST_IO if name in self.IO_OPERATORS else COST_OPERATOR
+        self._override = context or {}
+        try:
+            return RECORDER.call(
+                "ops.{}".format(name), cost, self._run, implementation,
+                arguments=arguments)
+        finally:
+            self._override = {}
+
+    @staticmethod
+    def _run(implementation, arguments):
+        implementation(**arguments)
+        return {"FINISHED"}
+
+    @property
+    def data(self):
+        return _BLENDER.data
+
+    @property
+    def scene(self):
+        return _BLENDER.context.scene
+
+    def _select_only(self, selected):
+        for blender_object in list(
+                filter(attrgetter("select"), self.scene.objects)):
+            blender_object.select = False
+        for blender_object in selected:
+            blender_object.select = True
+
+    def _add_object(
+            self, name, object_data, location=(0, 0, 0),
+            rotation=(0, 0, 0), layers=None, **_):
+        new_object = self.data.objects._new(name, object_data)
+        new_object.location = location
+        new_object.rotation_euler = rotation
+        if layers is None:
+            layers = [
+                layer == self.scene.layers.index(True)
+                for layer in range(LAYER_COUNT)]
+        new_object.layers = layers
+        self.scene.objects._link(new_object)
+        self._select_only([new_object])
+        self.scene.objects.active = new_object
+        return new_object
+
+    def _target_object(self, object=""):
+        if object:
+            try:
+                return self.data.objects[object]
+            except KeyError:
+                raise RuntimeError(
+                    "Error: Object '{}' not found".format(object))
+        for key in ("object", "active_object"):
+            if self._override.get(key) is not None:
+                return self._override[key]
+        if self.scene.objects.active is None:
+            raise RuntimeError("Error: No active object")
+        return self.scene.objects.active
+
+    def object_add(self, type="EMPTY", **kwargs):
+        if type != "EMPTY":
+            raise NotImplementedError(
+                "object.add is only implemented for empties")
+        self._add_object("Empty", None, **kwargs)
+
+    def object_camera_add(self, **kwargs):
+        self._add_object("Camera", self.data.cameras._new("Camera"), **kwargs)
+
+    def object_lamp_add(self, type="POINT", **kwargs):
+        name = LAMP_NAMES[type]
+        self._add_object(name, self.data.lamps._new(name, type), **kwargs)
+
+    def _primitive_add(self, primitive, radius=1.0, **kwargs):
+        name, polygon_count, vertices = PRIMITIVES[primitive]
+        mesh = self.data.meshes._new(
+            name, vertices(radius), polygon_count=polygon_count)
+        self._add_object(name, mesh, **kwargs)
+
+    def mesh_primitive_plane_add(self, radius=1.0, **kwargs):
+        self._primitive_add("plane", radius, **kwargs)
+
+    def mesh_primitive_cube_add(self, radius=1.0, **kwargs):
+        self._primitive_add("cube", radius, **kwargs)
+
+    def mesh_primitive_uv_sphere_add(self, size=1.0, **kwargs):
+        self._primitive_add("uv_sphere", size, **kwargs)
+
+    def mesh_primitive_cone_add(self, radius1=1.0, depth=2.0, **kwargs):
+        self._primitive_add("cone", max(radius1, depth / 2), **kwargs)
+
+    def mesh_primitive_cylinder_add(self, radius=1.0, depth=2.0, **kwargs):
+        self._primitive_add("cylinder", max(radius, depth / 2), **kwargs)
+
+    def mesh_primitive_monkey_add(self, radius=1.0, **kwargs):
+        self._primitive_add("monkey", radius, **kwargs)
+
+    def object_delete(self, use_global=False):
+        for blender_object in list(self.scene.objects):
+            if blender_object.select:
+                self.scene.objects._unlink(blender_object)
+                self.data.objects._unlink(blender_object)
+                blender_object.data = None
+
+    def object_convert(self, target="MESH", keep_original=False):
+        active = self._target_object()
+        if target != "MESH":
+            raise NotImplementedError(
+                "object.convert is only implemented for meshes")
+        if isinstance(active.data, Curve):
+            active.data = active.to_mesh(self.scene, True, "PREVIEW")
+
+    def object_join(self):
+        active = self._target_object()
+        for blender_object in list(self.scene.objects):
+            if blender_object.select and blender_object is not active:
+                if isinstance(blender_object.data, Mesh) and \
+                        isinstance(active.data, Mesh):
+                    active.data.vertices.extend(blender_object.data.vertices)
+                    active.data.polygon_count += \
+                        blender_object.data.polygon_count
+                self.scene.objects._unlink(blender_object)
+                self.data.objects._unlink(blender_object)
+                blender_object.data = None
+
+    def object_game_property_new(self, type="FLOAT", name="prop"):
+        properties = self._target_object().game.properties
+        properties.append(GameProperty(type, properties.unique_name(name)))
+
+    def _brick_add(self, bricks_name, brick_class, type, name, object):
+        bricks = getattr(self._target_object(object).game, bricks_name)
+        if not name:
+            name = type.replace("_", " ").title()
+        bricks.append(brick_class(type, bricks.unique_name(name)))
+
+    def logic_sensor_add(self, type="ALWAYS", name="", object=""):
+        self._brick_add("sensors", Sensor, type, name, object)
+
+    def logic_controller_add(self, type="LOGIC_AND", name="", object=""):
+        self._brick_add("controllers", Controller, type, name, object)
+
+    def logic_actuator_add(self, type="MOTION", name="", object=""):
+        self._brick_add("actuators", Actuator, type, name, object)
+
+    def import_scene_obj(self, filepath="", **_):
+        """Create one mesh object for each object (or the whole file if it
+        names none) in an OBJ file, counting its vertices and faces"""
+        if not os.path.exists(filepath):
+            raise RuntimeError(
+                "Error: Cannot read file '{}'".format(filepath))
+        pieces = OrderedDict()
+        name = os.path.splitext(os.path.basename(filepath))[0]
+        with open(filepath) as obj_file:
+            for line in obj_file:
+                if line.startswith("o "):
+                    name = line[2:].strip()
+                vertices, polygon_count = pieces.setdefault(name, ([], 0))
+                if line.startswith("v "):
+                    vertices.append(
+                        [float(value) for value in line.split()[1:4]])
+                elif line.startswith("f "):
+                    pieces[name] = (vertices, polygon_count + 1)
+        new_objects = []
+        for name, (vertices, polygon_count) in pieces.items():
+            mesh = self.data.meshes._new(
+                name, vertices, polygon_count=polygon_count)
+            new_object = self.data.objects._new(name, mesh)
+            self.scene.objects._link(new_object)
+            new_objects.append(new_object)
+        self._select_only(new_objects)
+
+    def sound_open(self, filepath="", **_):
+        self.data.sounds._load(filepath)
+
+    def file_pack_all(self):
+        for key in ("images", "fonts", "sounds"):
+            for packable in getattr(self.data, key):
+                if packable.filepath != "<builtin>":
+                    packable.packed_file = packable.filepath
+
+    def wm_save_as_mainfile(self, filepath="", **_):
+        _BLENDER.filepath = filepath
+
+
+class _OperatorCategory(object):
+    """bpy.ops.<category>"""
+
+    def __init__(self, registry, category):
+        self._registry = registry
+        self._category = category
+
+    def __getattr__(self, operator):
+        name = "{}.{}".format(self._category, operator)
+
+        def call_operator(*args, **kwargs):
+            return self._registry.call(name, kwargs)
+        call_operator.__name__ = operator
+        return call_operator
+
+
+class _Operators(object):
+    """bpy.ops"""
+
+    def __init__(self, registry):
+        self._registry = registry
+
+    def __getattr__(self, category):
+        if category.startswith("_"):
+            raise AttributeError(category)
+        return _OperatorCategory(self._registry, category)
+
+
+class _BpyOps(object):
+    """_bpy.ops, whose call function is used by pyw3d as BPY_OPS_CALL"""
+
+    def __init__(self, registry):
+        self._registry = registry
+
+    def call(self, name, context, arguments):
+        return self._registry.call(name, dict(arguments), context)
+
+
+def display_name_from_filepath(filepath):
+    """As bpy.path.display_name_from_filepath"""
+    name = os.path.splitext(os.path.basename(filepath))[0].replace("_", " ")
+    if name.islower():
+        name = name.title()
+    return name
+
+
+class _Blender(object):
+    """State shared by the stand-in modules"""
+
+    def __init__(self):
+        self.data = None
+        self.context = None
+        self.filepath = ""
+        self.registry = _OperatorRegistry()
+        self.visibility_changes = 0
+        """Incremented whenever objects are linked to or unlinked from a
+        scene or the layers of an object or scene change"""
+
+
+_BLENDER = _Blender()
+
+bpy = types.ModuleType("bpy", "Stand-in for Blender's bpy module")
+bpy.ops = _Operators(_BLENDER.registry)
+bpy.path = types.ModuleType("bpy.path")
+bpy.path.display_name_from_filepath = display_name_from_filepath
+bpy.path.abspath = os.path.abspath
+
+_bpy = types.ModuleType("_bpy", "Stand-in for Blender's _bpy module")
+_bpy.ops = _BpyOps(_BLENDER.registry)
+
+mathutils = types.ModuleType(
+    "mathutils", "Stand-in for Blender's mathutils module")
+mathutils.Vector = Vector
+mathutils.Matrix = Matrix
+mathutils.Euler = Euler
+
+
+def reset():
+    """Replace all Blender data with a new default scene and clear
+    :py:data:`RECORDER`"""
+    _BLENDER.data = BlendData()
+    _BLENDER.context = Context(_BLENDER.data)
+    _BLENDER.filepath = ""
+    bpy.data = _BLENDER.data
+    bpy.context = _BLENDER.context
+    RECORDER.clear()
+    return RECORDER
+
+
+def install():
+    """Install the stand-in in place of bpy, _bpy and mathutils
+
+    This must be done before pyw3d is imported. Since pyw3d caches some
+    Blender data between builds (models, materials, sounds and the
+    relative_to objects of placements), each build should be run in a new
+    interpreter.
+
+    :returns: :py:data:`RECORDER`
+    """
+    sys.modules["bpy"] = bpy
+    sys.modules["bpy.path"] = bpy.path
+    sys.modules["_bpy"] = _bpy
+    sys.modules["mathutils"] = mathutils
+    return reset()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# Copyright (C) 2016 William Hicks
+#
+# This file is part of Writing3D.
+#
+# Writing3D is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+"""Measure feature construction throughput and the cost of single checks
+
+Objects are created as in feature_memory.py and the number created per second
+is reported. Each argument value of those objects is then checked repeatedly
+both by calling its validator and by calling the compiled version of that
+validator.
+
+To run this benchmark, use the following command::
+
+    python3 benchmarks/feature_construction.py -n 20000
+"""
+
+import argparse
+import time
+import synthetic  # noqa: F401 (makes pyw3d importable)
+from feature_memory import create_objects
+from pyw3d.validator_compiler import compiled_validators
+
+
+def timed_checks(checks, values, repeat):
+    """Call each check with corresponding value repeat times and return wall
+    time in s"""
+    pairs = list(zip(checks, values))
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        for check, value in pairs:
+            check(value)
+    return time.perf_counter() - start_time
+
+
+def feature_values(feature):
+    """Yield (feature, key, value) for all values set in feature and any
+    features nested within it"""
+    for key, value in feature.items():
+        yield feature, key, value
+        if hasattr(value, "argument_validators"):
+            yield from feature_values(value)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-n", "--objects", type=int, default=20000,
+        help="number of objects to create")
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=20000,
+        help="number of times to check values of a single object")
+    args = parser.parse_args()
+
+    start_time = time.perf_counter()
+    created = create_objects(args.objects)
+    wall_time = time.perf_counter() - start_time
+    print("{:>16}: {:8.3f} s ({:.0f} objects/s)".format(
+        "construction", wall_time, args.objects / wall_time))
+
+    validators = []
+    compiled = []
+    values = []
+    for feature, key, value in feature_values(created[0]):
+        validators.append(feature.argument_validators[key])
+        compiled.append(compiled_validators(type(feature))[key])
+        values.append(value)
+    for label, checks in (("validators", validators), ("compiled", compiled)):
+        check_time = timed_checks(checks, values, args.repeat)
+        print("{:>16}: {:8.3f} s ({:.2f} us per check)".format(
+            label, check_time, 1e6 * check_time / (args.repeat * len(values))
+        ))
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# Copyright (C) 2016 William Hicks
+#
+# This file is part of Writing3D.
+#
+# Writing3D is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+"""Compare memory used by features with dictionary and compact storage, and
+by features derived from a template
+
+Objects are created in the same way as in samples/performance.py: each has a
+placement with a LookAt rotation and text content. Memory is measured once
+all objects have been created and is shown per object (including its nested
+features). For derived objects, each object and its placement are derived
+from a single template object, and only the name, color and position are
+stored for each.
+
+To run this benchmark, use the following command::
+
+    python3 benchmarks/feature_memory.py -n 100000
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from math import pi, sin, cos
+import synthetic  # noqa: F401 (makes pyw3d importable)
+from pyw3d import objects, placement
+from pyw3d.features import W3DFeature
+
+
+def create_objects(count):
+    """Return list of count W3DObjects"""
+    created = []
+    for index in range(count):
+        theta = pi * index / count
+        created.append(objects.W3DObject(
+            name="elem{}".format(index),
+            color=(index % 256, 0, 255),
+            placement=placement.W3DPlacement(
+                position=(10 * sin(theta), 10 * cos(theta), 0),
+                rotation=placement.W3DRotation(
+                    rotation_mode="LookAt",
+                    rotation_vector=(0, 0, 0)
+                )
+            ),
+            content=objects.W3DText(text="W3D")
+        ))
+    return created
+
+
+def create_derived_objects(count):
+    """Return list of count W3DObjects derived from a single template"""
+    template = objects.W3DObject(
+        name="template",
+        placement=placement.W3DPlacement(
+            rotation=placement.W3DRotation(
+                rotation_mode="LookAt",
+                rotation_vector=(0, 0, 0)
+            )
+        ),
+        content=objects.W3DText(text="W3D")
+    )
+    template_placement = template["placement"]
+    created = []
+    for index in range(count):
+        theta = pi * index / count
+        created.append(template.derive(
+            name="elem{}".format(index),
+            color=(index % 256, 0, 255),
+            placement=template_placement.derive(
+                position=(10 * sin(theta), 10 * cos(theta), 0)
+            )
+        ))
+    return created
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-n", "--objects", type=int, default=20000,
+        help="number of objects to create")
+    args = parser.parse_args()
+
+    print("{:>10} {:>12} {:>12} {:>10}".format(
+        "storage", "total (MB)", "per object", "time (s)"))
+    for label, compact, create in (
+            ("dict", False, create_objects),
+            ("compact", True, create_objects),
+            ("derived", False, create_derived_objects)):
+        W3DFeature.compact_storage = compact
+        gc.collect()
+        tracemalloc.start()
+        start_time = time.perf_counter()
+        created = create(args.objects)
+        wall_time = time.perf_counter() - start_time
+        used = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print("{:>10} {:12.1f} {:10.0f} B {:10.2f}".format(
+            label, used / 2**20, used / args.objects, wall_time))
+        del created
+    W3DFeature.compact_storage = False
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# Copyright (C) 2016 William Hicks
+#
+# This file is part of Writing3D.
+#
+# Writing3D is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+"""Measure validation of the filenames referenced by a project
+
+A project is built in memory with the requested number of image objects,
+which share a smaller number of image files. The filename of every object is
+then checked with and without the shared stat cache, and the cache is also
+filled in advance with a thread pool. Stat calls on a local disk are cheap,
+so the difference is far larger on network file systems.
+
+To run this benchmark, use the following command::
+
+    python3 benchmarks/file_validation.py -n 5000 -f 500
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import synthetic  # noqa: F401 (makes pyw3d importable)
+from pyw3d.project import W3DProject
+from pyw3d.objects import W3DObject, W3DImage
+from pyw3d.file_stats import STAT_CACHE
+
+
+def timed_checks(target_project):
+    """Check filename of each object in project and return wall time in s"""
+    start_time = time.perf_counter()
+    for obj in target_project["objects"]:
+        content = obj["content"]
+        if not content.argument_validators["filename"](content["filename"]):
+            raise RuntimeError("Missing file {}".format(content["filename"]))
+    return time.perf_counter() - start_time
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-n", "--objects", type=int, default=5000,
+        help="number of image objects in project")
+    parser.add_argument(
+        "-f", "--files", type=int, default=500,
+        help="number of distinct image files")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as image_dir:
+        filenames = []
+        for index in range(args.files):
+            filenames.append(
+                os.path.join(image_dir, "image{}.png".format(index)))
+            open(filenames[-1], "w").close()
+        target_project = W3DProject()
+        target_project["objects"].extend(
+            W3DObject(
+                name="elem{}".format(index),
+                content=W3DImage(filename=filenames[index % args.files])
+            ) for index in range(args.objects)
+        )
+
+        STAT_CACHE.max_age = 0
+        print("{:>16}: {:8.3f} s".format(
+            "uncached", timed_checks(target_project)))
+        STAT_CACHE.max_age = 2.0
+        STAT_CACHE.invalidate()
+        print("{:>16}: {:8.3f} s".format(
+            "cold cache", timed_checks(target_project)))
+        STAT_CACHE.invalidate()
+        start_time = time.perf_counter()
+        target_project.prefetch_files()
+        print("{:>16}: {:8.3f} s".format(
+            "prefetch", time.perf_counter() - start_time))
+        print("{:>16}: {:8.3f} s".format(
+            "warm cache", timed_checks(target_project)))
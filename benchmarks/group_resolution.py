@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# Copyright (C) 2016 William Hicks
+#
+# This file is part of Writing3D.
+#
+# Writing3D is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+"""Measure ordering of groups and resolution of their members
+
+Two hierarchies are generated with the requested number of groups, each
+given in reverse order so that every group comes before the groups it
+contains:
+
+deep
+    A single chain in which each group contains one object and the next
+    group
+wide
+    A tree in which each group contains a number of objects and up to
+    --branching other groups
+
+For each, the time to build a GroupGraph (which sorts the groups and
+flattens their members) is shown along with the time taken by the previous
+pairwise insertion sort. The ordering and flattened members are checked
+against the hierarchy.
+
+To run this benchmark, use the following command::
+
+    python3 benchmarks/group_resolution.py -n 2000
+"""
+
+import argparse
+import time
+import synthetic  # noqa: F401 (makes pyw3d importable)
+from pyw3d.groups import W3DGroup
+from pyw3d.group_graph import GroupGraph
+
+
+def deep_groups(count):
+    """Return list of count groups forming a single chain"""
+    return [
+        W3DGroup(
+            name="group{}".format(index),
+            objects=["elem{}".format(index)],
+            groups=["group{}".format(index + 1)] if index + 1 < count else []
+        ) for index in range(count)
+    ]
+
+
+def wide_groups(count, branching, objects_per_group=10):
+    """Return list of count groups forming a tree with given branching"""
+    return [
+        W3DGroup(
+            name="group{}".format(index),
+            objects=[
+                "elem{}".format(index * objects_per_group + offset)
+                for offset in range(objects_per_group)
+            ],
+            groups=[
+                "group{}".format(child) for child in range(
+                    index * branching + 1,
+                    min(count, (index + 1) * branching + 1))
+            ]
+        ) for index in range(count)
+    ]
+
+
+def legacy_sort(groups):
+    """Order groups with the pairwise insertion previously used by
+    W3DProject.sort_groups"""
+    groups = list(groups)
+    new_groups = []
+    while len(groups):
+        group = groups.pop()
+        cur_len = len(new_groups)
+        for i in range(cur_len):
+            if group["name"] in new_groups[i]["groups"]:
+                new_groups.insert(i, group)
+                break
+        if cur_len == len(new_groups):
+            new_groups.append(group)
+    return new_groups
+
+
+def check(graph):
+    """Raise AssertionError unless graph is ordered and flattened
+    correctly"""
+    position = {name: index for index, name in enumerate(graph.order)}
+    for name, group in graph.groups.items():
+        expected = list(group["objects"])
+        for child in group["groups"]:
+            assert position[child] < position[name]
+            expected.extend(
+                member for member in graph.members(child)
+                if member not in expected)
+        assert list(graph.members(name)) == expected
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-n", "--groups", type=int, default=2000,
+        help="number of groups in each hierarchy")
+    parser.add_argument(
+        "-b", "--branching", type=int, default=8,
+        help="number of groups in each group of the wide hierarchy")
+    args = parser.parse_args()
+
+    for label, groups in (
+            ("deep", deep_groups(args.groups)),
+            ("wide", wide_groups(args.groups, args.branching))):
+        start_time = time.perf_counter()
+        graph = GroupGraph(groups)
+        graph_time = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        legacy_sort(groups)
+        legacy_time = time.perf_counter() - start_time
+        check(graph)
+        member_count = sum(len(graph.members(name)) for name in graph.order)
+        print(
+            "{:>5}: graph {:8.3f} s, previous sort {:8.3f} s, {} flattened"
+            " members".format(label, graph_time, legacy_time, member_count))
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+# Copyright (C) 2016 William Hicks
+#
+# This file is part of Writing3D.
+#
+# Writing3D is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+"""Measure building of projects in Blender without Blender
+
+Projects with the same content as samples/performance.py (text with links,
+shapes, images, models and lights with sounds, along with timelines, a group,
+particle systems and head-position triggers) are built with
+W3DProject.blend against the recording stand-in for Blender in
+fake_blender.py. The sample has 19 rows of 10 of each kind of object; each
+requested scale multiplies the number of rows.
+
+Each build runs in a new interpreter, since pyw3d caches Blender data
+between builds. For each phase of the build recorded in its BuildTrace, the
+wall time, the time spent within pyw3d itself (excluding the stand-in), the
+number of calls made to Blender and the number of objects created are shown,
+followed by the types of feature taking the most time and the number of
+calls of each operator and of each cost class (see
+fake_blender.COST_CLASSES).
+
+To run this benchmark, use the following command::
+
+    python3 benchmarks/headless_build.py -s 1 2 4
+"""
+
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from math import pi, sin, cos
+import synthetic  # noqa: F401 (makes pyw3d importable)
+import fake_blender
+
+OBJ_CUBE = "".join(
+    ["o model\n"] +
+    ["v {} {} {}\n".format(x, y, z)
+     for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)] +
+    ["f 1 2 4 3\n", "f 5 6 8 7\n", "f 1 2 6 5\n", "f 3 4 8 7\n",
+     "f 1 3 7 5\n", "f 2 4 8 6\n"]
+)
+
+
+def recorded_trace(recorder):
+    """Return BuildTrace which also attributes calls recorded by the
+    stand-in to each phase"""
+    from pyw3d.build_trace import BuildTrace
+
+    class RecordedTrace(BuildTrace):
+        @contextmanager
+        def phase(self, name):
+            with recorder.phase(name), super().phase(name) as span:
+                yield span
+
+    return RecordedTrace(story="performance")
+
+
+def write_assets(directory):
+    """Write the (empty) sound and image files and a model used by the
+    project"""
+    os.makedirs(os.path.join(directory, "sound"))
+    os.makedirs(os.path.join(directory, "models"))
+    for filename in ("sound/play.wav", "obama.jpg"):
+        open(os.path.join(directory, filename), "w").close()
+    with open(os.path.join(directory, "models", "bathroom2.obj"), "w") as \
+            model_file:
+        model_file.write(OBJ_CUBE)
+
+
+def performance_project(directory, theta_div=20, phi_div=10):
+    """Return project with the content of samples/performance.py"""
+    from pyw3d import project, objects, placement, sounds, psys, groups, \
+        timeline, actions, triggers
+
+    def look_at_center(position):
+        return placement.W3DPlacement(
+            position=position,
+            rotation=placement.W3DRotation(
+                rotation_mode="LookAt", rotation_vector=(0, 0, 0))
+        )
+
+    def on_sphere(radius, theta, phi):
+        return (
+            radius * sin(theta) * cos(phi),
+            radius * sin(theta) * sin(phi),
+            radius * cos(theta)
+        )
+
+    my_project = project.W3DProject(
+        call_directory=directory, allow_movement=True)
+    shapes = objects.W3DShape.argument_validators[
+        'shape_type'].valid_options
+    lights = objects.W3DLight.argument_validators[
+        'light_type'].valid_options
+    radius = 10
+    for i in range(1, theta_div):
+        for j in range(phi_div):
+            theta = pi / theta_div * i
+            phi = 2 * pi / phi_div * j
+            suffix = "{}x{}".format(i, j)
+            my_project["sounds"].append(sounds.W3DSound(
+                name="basic" + suffix, filename="sound/play.wav"))
+            my_project["objects"].extend([
+                objects.W3DObject(
+                    name="elem" + suffix,
+                    color=((i * 13) % 256, (j * 29) % 256, 128),
+                    placement=look_at_center(on_sphere(radius, theta, phi)),
+                    content=objects.W3DText(text="W3D"),
+                    link=objects.W3DLink(actions={-1: [
+                        actions.ObjectAction(
+                            object_name="elem" + suffix, duration=1,
+                            move_relative=True,
+                            placement=placement.W3DPlacement(
+                                position=(0, 0.5, 0))
+                        )
+                    ]})
+                ),
+                objects.W3DObject(
+                    name="shape" + suffix,
+                    content=objects.W3DShape(
+                        shape_type=shapes[(i + j) % len(shapes)]),
+                    placement=look_at_center(
+                        on_sphere(radius - 2, theta, phi)),
+                ),
+                objects.W3DObject(
+                    name="image" + suffix,
+                    content=objects.W3DImage(filename="obama.jpg"),
+                    placement=look_at_center(
+                        on_sphere(radius - 3, theta, phi)),
+                ),
+                objects.W3DObject(
+                    name="room" + suffix,
+                    content=objects.W3DModel(
+                        filename="models/bathroom2.obj"),
+                    placement=look_at_center(
+                        on_sphere(radius + 5, theta, phi)),
+                ),
+                objects.W3DObject(
+                    name="light" + suffix,
+                    content=objects.W3DLight(
+                        light_type=lights[(i + j) % len(lights)]),
+                    placement=look_at_center(
+                        on_sphere(radius - 2, theta, phi)),
+                    sound="basic" + suffix
+                ),
+            ])
+            my_project["timelines"].append(timeline.W3DTimeline(
+                name="timeline" + suffix,
+                start_immediately=False,
+                actions=[(0, actions.ObjectAction(
+                    object_name="elem" + suffix, visible=True))]
+            ))
+
+    my_project["groups"].append(groups.W3DGroup(
+        name="particles",
+        objects=[
+            "elem{}x{}".format(i, j)
+            for i in range(1, theta_div) for j in range(phi_div)
+        ]
+    ))
+    my_project["particle_actions"].append(psys.W3DPAction(
+        name="my_actions",
+        source_domain=psys.W3DPDomain(type="Line", p1=(-1, -1, 0),
+                                      p2=(1, -1, 0)),
+        velocity_domain=psys.W3DPDomain(type="Point", point=(0, 0, -1))
+    ))
+
+    for i in range(1, theta_div // 2):
+        for j in range(phi_div):
+            theta = pi / theta_div * 2 * i
+            phi = 2 * pi / phi_div * j
+            suffix = "{}x{}".format(i, j)
+            my_project["objects"].append(objects.W3DObject(
+                name="system" + suffix,
+                placement=look_at_center(
+                    on_sphere(radius + 8, theta, phi)),
+                content=objects.W3DPSys(
+                    particle_group="particles", max_particles=100,
+                    max_age=3, speed=1, particle_actions="my_actions"),
+            ))
+            my_project["trigger_events"].append(triggers.HeadPositionTrigger(
+                name="trigger" + suffix,
+                box=triggers.EventBox(
+                    direction="Inside", corner1=(i, j, i + j),
+                    corner2=(j, i + 5, i + j)),
+                actions=[actions.ObjectAction(
+                    object_name="system" + suffix, visible=False)]
+            ))
+    return my_project
+
+
+def build(scale):
+    """Build performance project at given scale against the stand-in and
+    return summary of recorded calls and times"""
+    recorder = fake_blender.install()
+    trace = recorded_trace(recorder)
+    working_directory = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        write_assets(directory)
+        try:
+            target_project = performance_project(
+                directory, theta_div=20 * scale)
+            start_time = time.perf_counter()
+            target_project.blend(trace=trace)
+            wall_time = time.perf_counter() - start_time
+        finally:
+            os.chdir(working_directory)
+    return {
+        "scale": scale,
+        "objects": len(target_project["objects"]),
+        "wall_time": wall_time,
+        "fake_time": sum(recorder.fake_times.values()),
+        "phases": [
+            (
+                span.name, span.duration,
+                span.duration - recorder.fake_times[span.name],
+                sum(recorder.counts(phase=span.name).values()),
+                span.objects_created
+            ) for span in trace.phases
+        ],
+        "feature_types": trace.feature_types()[:5],
+        "operators": recorder.counts(cost=fake_blender.COST_OPERATOR) +
+        recorder.counts(cost=fake_blender.COST_IO),
+        "costs": recorder.counts("cost"),
+    }
+
+
+def report(summary):
+    """Print summary returned by build"""
+    print("scale {scale}: {objects} objects built in {wall_time:.3f} s "
+          "({fake_time:.3f} s in stand-in)".format(**summary))
+    print("    {:<18} {:>9} {:>9} {:>9} {:>9}".format(
+        "phase", "wall s", "pyw3d s", "calls", "objects"))
+    for phase in summary["phases"]:
+        print("    {:<18} {:9.3f} {:9.3f} {:9d} {:9d}".format(*phase))
+    print("    slowest types of feature:")
+    for total in summary["feature_types"]:
+        print("        {:<32} {:9.3f} s for {:d}".format(
+            "{phase}: {category}".format(**total), total["duration"],
+            total["count"]))
+    print("    operators:")
+    for name, count in summary["operators"].most_common():
+        print("        {:<32} {:9d}".format(name, count))
+    print("    calls by cost class:")
+    for cost in fake_blender.COST_CLASSES:
+        print("        {:<32} {:9d}".format(cost, summary["costs"][cost]))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-s", "--scales", type=int, nargs="+", default=[1, 2, 4],
+        help="multiples of the number of rows in samples/performance.py")
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    for scale in args.scales:
+        with context.Pool(1) as pool:
+            report(pool.apply(build, (scale,)))
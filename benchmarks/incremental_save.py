@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# Copyright (C) 2016 William Hicks
+#
+# This file is part of Writing3D.
+#
+# Writing3D is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+"""Compare time to save a project after editing a single object, with and
+without cached XML for unchanged features
+
+To run this benchmark, use the following command::
+
+    python3 benchmarks/incremental_save.py -n 20000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from synthetic import write_story
+from pyw3d import project
+from pyw3d.xml_tools import write_pretty_xml
+
+
+def full_save(input_project, filename):
+    """Save project without making use of cached XML"""
+    with open(filename, "w") as file_:
+        write_pretty_xml(input_project.toXML(), file_)
+
+
+def timed(function, *args):
+    """Call function and return wall time in s"""
+    start_time = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start_time
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-n", "--objects", type=int, default=20000,
+        help="number of objects in synthetic story")
+    parser.add_argument(
+        "-e", "--edits", type=int, default=5,
+        help="number of edit-and-save cycles to time")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as story_dir:
+        filename = write_story(
+            os.path.join(story_dir, "story.xml"), args.objects)
+        loaded = project.W3DProject.fromXML_file(filename)
+        print("first save: {:8.3f} s".format(
+            timed(loaded.save_XML, filename)))
+
+        full_times = []
+        incremental_times = []
+        for edit in range(args.edits):
+            edited = loaded["objects"][edit * len(loaded["objects"]) //
+                                       args.edits]
+            edited["placement"]["position"][1] += 1
+            incremental_times.append(timed(loaded.save_XML, filename))
+            full_times.append(timed(full_save, loaded, filename))
+        print("full save:  {:8.3f} s per edit".format(
+            sum(full_times) / args.edits))
+        print("incremental:{:8.3f} s per edit".format(
+            sum(incremental_times) / args.edits))
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# Copyright (C) 2016 William Hicks
+#
+# This file is part of Writing3D.
+#
+# Writing3D is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+"""Compare adding logic bricks in builder mode with the operator path
+
+The project of headless_build.py is built at each requested scale against
+the recording stand-in for Blender, once with pyw3d.logic_builder.BUILDER_MODE
+off and once with it on. For each, the time spent within pyw3d itself
+(excluding the stand-in) while creating objects and activators, the number
+of operator calls, the number of those given an object by name (which
+Blender resolves by searching every object) and the number of changes of
+active object are shown. The game properties and logic bricks of every
+object are checked to be the same either way, apart from the duplicate
+properties which the operator path adds to objects copied from others.
+
+To run this benchmark, use the following command::
+
+    python3 benchmarks/logic_builder.py -s 1 2 4
+"""
+
+import argparse
+import multiprocessing
+import os
+import re
+import tempfile
+import fake_blender
+import headless_build
+
+LOGIC_PHASES = ("objects", "activators", "logic", "linking")
+"""Phases of the build in which properties and logic bricks are added"""
+DUPLICATE_NAME = re.compile(r".*\.\d{3}$")
+
+
+def brick_signature(brick):
+    """Return hashable description of the settings of a property or brick,
+    naming any bricks or objects it refers to"""
+    settings = []
+    for name, value in sorted(vars(brick).items()):
+        if isinstance(value, list):
+            value = tuple(item.name for item in value)
+        elif hasattr(value, "name"):
+            value = value.name
+        settings.append((name, value))
+    return tuple(settings)
+
+
+def logic_signature(data):
+    """Return dictionary mapping names of objects to descriptions of their
+    game properties and logic bricks, leaving out the unused duplicates of
+    properties which the operator path adds to copied objects"""
+    return {
+        blender_object.name: tuple(
+            tuple(
+                brick_signature(brick)
+                for brick in getattr(blender_object.game, kind)
+                if kind != "properties" or
+                not DUPLICATE_NAME.match(brick.name))
+            for kind in ("properties", "sensors", "controllers", "actuators")
+        ) for blender_object in data.objects
+    }
+
+
+def build(scale, builder_mode):
+    """Build project of headless_build.py at given scale and return summary
+    of the calls made and logic created"""
+    recorder = fake_blender.install()
+    from pyw3d import logic_builder
+    logic_builder.BUILDER_MODE = builder_mode
+    trace = headless_build.recorded_trace(recorder)
+    working_directory = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        headless_build.write_assets(directory)
+        try:
+            target_project = headless_build.performance_project(
+                directory, theta_div=20 * scale)
+            target_project.blend(trace=trace)
+        finally:
+            os.chdir(working_directory)
+    operator_calls = [
+        call for call in recorder.calls
+        if call.cost == fake_blender.COST_OPERATOR]
+    return {
+        "pyw3d_time": sum(
+            span.duration - recorder.fake_times[span.name]
+            for span in trace.phases if span.name in LOGIC_PHASES),
+        "stand_in_time": sum(
+            recorder.fake_times[span.name]
+            for span in trace.phases if span.name in LOGIC_PHASES),
+        "operators": len(operator_calls),
+        "by_name": sum(
+            1 for call in operator_calls if call.arguments.get("object")),
+        "activations": recorder.counts()["SceneObjects.active"],
+        "logic": logic_signature(fake_blender.bpy.data),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-s", "--scales", type=int, nargs="+", default=[1, 2, 4],
+        help="multiples of the number of rows in samples/performance.py")
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    print("{:>5} {:>9} {:>9} {:>9} {:>9} {:>9} {:>11}".format(
+        "scale", "mode", "pyw3d s", "stand-in", "operators", "by name",
+        "activations"))
+    for scale in args.scales:
+        summaries = {}
+        for builder_mode in (False, True):
+            with context.Pool(1) as pool:
+                summary = pool.apply(build, (scale, builder_mode))
+            summaries[builder_mode] = summary
+            print("{:5d} {:>9} {:9.3f} {:9.3f} {:9d} {:9d} {:11d}".format(
+                scale, "builder" if builder_mode else "operator",
+                summary["pyw3d_time"], summary["stand_in_time"],
+                summary["operators"], summary["by_name"],
+                summary["activations"]))
+        assert summaries[False]["logic"] == summaries[True]["logic"], \
+            "Builder mode created different logic"
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# Copyright (C) 2016 William Hicks
+#
+# This file is part of Writing3D.
+#
+# Writing3D is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+"""Measure how XML loading time scales with the number of worker processes
+
+The sequential loader is timed first, followed by
+:py:meth:`pyw3d.project.W3DProject.fromXML_parallel` with 1 to N workers. The
+time the parent process spends decoding the features returned by workers is
+also reported, since it is not parallelized and so bounds the speedup that
+any number of workers can give.
+
+To run this benchmark, use the following command::
+
+    python3 benchmarks/parallel_loading.py -n 50000 -w 8
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from synthetic import write_story
+from pyw3d import project, snapshot
+
+
+def timed_load(filename, workers):
+    """Load project and return (project, wall time in s)"""
+    start_time = time.perf_counter()
+    loaded = project.W3DProject.fromXML_file(filename, workers=workers)
+    return loaded, time.perf_counter() - start_time
+
+
+def decode_time(loaded):
+    """Return time in s taken to decode snapshot of all objects in loaded"""
+    encoded = snapshot.dumps_values({"features": loaded["objects"]})
+    start_time = time.perf_counter()
+    snapshot.loads_section(encoded, "features")
+    return time.perf_counter() - start_time
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-n", "--objects", type=int, default=50000,
+        help="number of objects in synthetic story")
+    parser.add_argument(
+        "-w", "--workers", type=int, default=os.cpu_count(),
+        help="maximum number of worker processes")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as story_dir:
+        story_file = write_story(
+            os.path.join(story_dir, "story.xml"), args.objects)
+        loaded, sequential_time = timed_load(story_file, None)
+        print("{:>10}: {:8.2f} s".format("sequential", sequential_time))
+        print("{:>10}: {:8.2f} s (serial part of parallel loading)".format(
+            "decoding", decode_time(loaded)))
+        del loaded
+        for workers in range(1, args.workers + 1):
+            loaded, wall_time = timed_load(story_file, workers)
+            print("{:>10}: {:8.2f} s ({:.2f}x, {} objects)".format(
+                "{} worker{}".format(workers, "s" if workers > 1 else ""),
+                wall_time, sequential_time / wall_time,
+                len(loaded["objects"])
+            ))
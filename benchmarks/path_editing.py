@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# Copyright (C) 2016 William Hicks
+#
+# This file is part of Writing3D.
+#
+# Writing3D is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+"""Measure editing of a large list of objects through ProjectPaths
+
+A project is built in memory with the requested number of objects, and a
+child path is created for each of them as the editor does for its list
+widgets. Objects are then inserted at and removed from random positions
+through paths to the list (alternately the one the child paths were created
+from and one built independently, which must share its handles), resolving
+the paths of a few remaining objects after each edit. The same edits are
+repeated with the previous approach, in which every later sibling was
+re-resolved from the project root and renumbered after each edit. Every
+path is checked against its object at the end.
+
+To run this benchmark, use the following command::
+
+    python3 benchmarks/path_editing.py -n 5000 -e 500
+"""
+
+import argparse
+import os
+import random
+import time
+import synthetic  # noqa: F401 (makes pyw3d importable)
+from pyw3d.project import W3DProject
+from pyw3d.objects import W3DObject
+from pyw3d.path import ProjectPath
+
+
+def build_project(object_count):
+    """Return project with given number of objects"""
+    target_project = W3DProject(call_directory=os.getcwd())
+    target_project["objects"].extend(
+        W3DObject(name="elem{}".format(index))
+        for index in range(object_count)
+    )
+    return target_project
+
+
+def edits(object_count, edit_count):
+    """Return list of (insert, position) pairs, alternating insertions and
+    removals"""
+    return [
+        (edit % 2 == 0, random.randrange(object_count - 1))
+        for edit in range(edit_count)
+    ]
+
+
+def legacy_child_path(list_path, index):
+    """Return path to element at given index ending in a bare index"""
+    return ProjectPath(list_path.get_project(), list_path.path + [index])
+
+
+def legacy_remove(list_path, child_paths, index):
+    """Remove element as previously done, renumbering every sibling"""
+    del list_path.get_element()[index]
+    del child_paths[index]
+    for i in range(len(list_path.get_element())):
+        list_path.get_element()[i]
+        child_paths[i].set_specifier(i)
+
+
+def legacy_insert(list_path, child_paths, index, value):
+    """Insert element as previously done, renumbering every later sibling"""
+    list_path.get_element().insert(index, value)
+    child_paths.insert(index, legacy_child_path(list_path, index))
+    for i in range(index + 1, len(list_path.get_element())):
+        list_path.get_element()[i]
+        child_paths[i].set_specifier(i)
+
+
+def run(object_count, edit_list, legacy=False):
+    """Apply edits to a new project and return wall time in s"""
+    target_project = build_project(object_count)
+    list_path = ProjectPath(target_project, ["objects"])
+
+    def edit_path(edit_index):
+        if edit_index % 4 < 2:
+            return list_path
+        return ProjectPath(target_project, ["objects"])
+
+    if legacy:
+        child_path = legacy_child_path
+    else:
+        child_path = ProjectPath.create_child_path
+    child_paths = [
+        child_path(list_path, index) for index in range(object_count)
+    ]
+    objects = list(target_project["objects"])
+
+    start_time = time.perf_counter()
+    for edit_index, (insert, position) in enumerate(edit_list):
+        if insert:
+            new_object = W3DObject(name="new{}".format(edit_index))
+            objects.insert(position, new_object)
+            if legacy:
+                legacy_insert(list_path, child_paths, position, new_object)
+            else:
+                edit_path(edit_index).insert_index_element(
+                    position, new_object)
+                child_paths.insert(
+                    position, list_path.create_child_path(position))
+        else:
+            del objects[position]
+            if legacy:
+                legacy_remove(list_path, child_paths, position)
+            else:
+                edit_path(edit_index).remove_index_element(position)
+                del child_paths[position]
+        for probe in (0, position, -1):
+            child_paths[probe].get_element()
+    elapsed = time.perf_counter() - start_time
+
+    for path, expected in zip(child_paths, objects):
+        assert path.get_element() is expected
+    return elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-n", "--objects", type=int, default=5000,
+        help="number of objects in project")
+    parser.add_argument(
+        "-e", "--edits", type=int, default=500,
+        help="number of insertions and removals")
+    args = parser.parse_args()
+
+    random.seed(0)
+    edit_list = edits(args.objects, args.edits)
+    print("{:>16}: {:8.3f} s".format(
+        "handles", run(args.objects, edit_list)))
+    print("{:>16}: {:8.3f} s".format(
+        "renumbering", run(args.objects, edit_list, legacy=True)))
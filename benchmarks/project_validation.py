@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# Copyright (C) 2016 William Hicks
+#
+# This file is part of Writing3D.
+#
+# Writing3D is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+"""Measure whole-project validation in this process and in worker processes
+
+A synthetic story is loaded and a few of its objects are given invalid values
+so that the report has problems to collect. The project is then validated in
+this process and with each requested number of worker processes, each time
+from a freshly loaded copy so that no validation is remembered between runs.
+
+To run this benchmark, use the following command::
+
+    python3 benchmarks/project_validation.py -n 10000 -w 1 2 4
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from synthetic import write_story
+from pyw3d import project
+
+
+def broken_project(story_file, broken_count):
+    """Load project and set invalid scale for broken_count of its objects"""
+    loaded = project.W3DProject.fromXML_file(story_file)
+    step = max(1, len(loaded["objects"]) // max(1, broken_count))
+    for obj in loaded["objects"][::step][:broken_count]:
+        dict.__setitem__(obj, "scale", -1)
+        obj.mark_changed()
+    return loaded
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-n", "--objects", type=int, default=10000,
+        help="number of objects in synthetic story")
+    parser.add_argument(
+        "-t", "--timelines", type=int, default=0,
+        help="number of timelines in synthetic story")
+    parser.add_argument(
+        "-b", "--broken", type=int, default=10,
+        help="number of objects given invalid values")
+    parser.add_argument(
+        "-w", "--workers", type=int, nargs="+", default=[1, 2],
+        help="numbers of worker processes to try (1 for none)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as story_dir:
+        story_file = write_story(
+            os.path.join(story_dir, "story.xml"), args.objects,
+            timeline_count=args.timelines, group_size=0)
+        for workers in args.workers:
+            loaded = broken_project(story_file, args.broken)
+            start_time = time.perf_counter()
+            report = loaded.validation_report(workers=workers)
+            wall_time = time.perf_counter() - start_time
+            print("\nworkers={}: {:.3f} s".format(workers, wall_time))
+            print(report.summary())
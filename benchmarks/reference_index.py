@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# Copyright (C) 2016 William Hicks
+#
+# This file is part of Writing3D.
+#
+# Writing3D is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+"""Measure checks of references to the objects of a project
+
+A project with the requested number of objects is built in memory, and the
+name of every object is checked against the project, both unchanged and with
+one object renamed between every check.
+
+To run this benchmark, use the following command::
+
+    python3 benchmarks/reference_index.py -n 5000
+"""
+
+import argparse
+import time
+import synthetic  # noqa: F401 (makes pyw3d importable)
+from pyw3d.project import W3DProject
+from pyw3d.objects import W3DObject
+from pyw3d.validators import ReferenceValidator, ValidPyString
+
+
+def timed_checks(validator, names, rename=None):
+    """Check each name with validator and return mean time per check in us
+
+    :param W3DObject rename: If given, rename this object before each check
+    """
+    start_time = time.perf_counter()
+    for index, name in enumerate(names):
+        if rename is not None:
+            rename["name"] = "renamed{}".format(index)
+        validator(name)
+    return (time.perf_counter() - start_time) / len(names) * 1e6
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-n", "--objects", type=int, default=5000,
+        help="number of objects in project")
+    args = parser.parse_args()
+
+    project = W3DProject()
+    project["objects"].extend(
+        W3DObject(name="elem{}".format(index))
+        for index in range(args.objects)
+    )
+    names = [obj["name"] for obj in project["objects"]]
+    validator = ReferenceValidator(
+        ValidPyString(), ["objects"], project=project)
+
+    print("{:>16}: {:8.2f} us".format(
+        "unchanged", timed_checks(validator, names)))
+    print("{:>16}: {:8.2f} us".format(
+        "renamed", timed_checks(
+            validator, names[1:], rename=project["objects"][0])))
+    start_time = time.perf_counter()
+    validator.valid_menu_items
+    print("{:>16}: {:8.2f} ms".format(
+        "menu items", (time.perf_counter() - start_time) * 1e3))
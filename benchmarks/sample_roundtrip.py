@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# Copyright (C) 2016 William Hicks
+#
+# This file is part of Writing3D.
+#
+# Writing3D is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+"""Check that every shipped sample survives saving and reloading
+
+Each sample script in samples/ is run in a copy of the samples directory,
+with pyw3d.export_to_blender replaced so that, instead of exporting, the
+project is saved as XML and loaded again with the schema check enabled. Each
+XML story in samples/xml_samples is loaded, saved and loaded again in the
+same way. Since only the XML is checked, assets which the samples use but
+which are not shipped with them are replaced by empty files. A sample
+fails if saving it or loading the saved XML raises an error.
+
+To run this check, use the following command::
+
+    python3 benchmarks/sample_roundtrip.py
+"""
+
+import argparse
+import glob
+import os
+import runpy
+import shutil
+import sys
+import tempfile
+import traceback
+import synthetic  # noqa: F401 (makes pyw3d importable)
+import pyw3d
+from pyw3d import project
+
+SAMPLES_DIRECTORY = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), os.pardir, "samples"))
+SKIPPED_SAMPLES = ("cwapp.py",)
+"""Scripts in samples/ which load a story given on the command line rather
+than creating one"""
+SAMPLE_ASSETS = (
+    "LinBiolinum_K.otf", "models/bathroom2.obj", "obama.jpg",
+    "sound/long.wav")
+"""Files used by samples but not shipped with them, for which empty
+placeholders are created in the copy of the samples directory"""
+
+
+def roundtrip(original, filename):
+    """Save project to filename and return the project loaded from it with the
+    schema check enabled"""
+    original.save_XML(filename)
+    return project.W3DProject.fromXML_file(filename, validate_schema=True)
+
+
+def check_script(script, directory):
+    """Run sample script in directory, round-tripping every project it
+    exports"""
+    exported = []
+
+    def save_and_reload(input_project, filename="run.blend", **_):
+        exported.append(roundtrip(
+            input_project, os.path.join(
+                directory, os.path.splitext(
+                    os.path.basename(filename))[0] + "_roundtrip.xml")))
+
+    pyw3d.export_to_blender = save_and_reload
+    sys.argv = [script]
+    runpy.run_path(script, run_name="__main__")
+    if not exported:
+        raise AssertionError("No project was exported")
+
+
+def check_story(filename, directory):
+    """Load XML story, then save and reload it"""
+    original = project.W3DProject.fromXML_file(filename)
+    roundtrip(original, os.path.join(
+        directory, "{}_roundtrip.xml".format(
+            os.path.splitext(os.path.basename(filename))[0])))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-v", "--verbose", action="store_true",
+        help="show traceback of each failure")
+    args = parser.parse_args()
+
+    export_to_blender = pyw3d.export_to_blender
+    working_directory = os.getcwd()
+    failures = 0
+    with tempfile.TemporaryDirectory() as temp_directory:
+        directory = os.path.join(temp_directory, "samples")
+        shutil.copytree(SAMPLES_DIRECTORY, directory)
+        for asset in SAMPLE_ASSETS:
+            filename = os.path.join(directory, asset)
+            if not os.path.exists(filename):
+                os.makedirs(os.path.dirname(filename), exist_ok=True)
+                open(filename, "w").close()
+        checks = [
+            (check_script, script) for script in
+            sorted(glob.glob(os.path.join(directory, "*.py")))
+            if os.path.basename(script) not in SKIPPED_SAMPLES
+        ] + [
+            (check_story, story) for story in
+            sorted(glob.glob(os.path.join(directory, "xml_samples", "*.xml")))
+        ]
+        for check, filename in checks:
+            name = os.path.relpath(filename, directory)
+            try:
+                check(filename, os.path.dirname(filename))
+            except Exception as error:
+                failures += 1
+                print("{:<36} FAILED: {}".format(
+                    name, str(error).splitlines()[0] if str(error) else
+                    type(error).__name__))
+                if args.verbose:
+                    traceback.print_exc()
+            else:
+                print("{:<36} ok".format(name))
+            finally:
+                pyw3d.export_to_blender = export_to_blender
+                os.chdir(working_directory)
+    sys.exit(1 if failures else 0)
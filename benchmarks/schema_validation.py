@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# Copyright (C) 2016 William Hicks
+#
+# This file is part of Writing3D.
+#
+# Writing3D is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+"""Measure the cost of checking W3D XML against caveschema.xsd
+
+The schema check is timed on its own and as part of a full load, and compared
+with a load that skips it. Loads are repeated and the fastest of each kind is
+reported. The time taken to reject a document with an error in its last
+object is also shown.
+
+To run this benchmark, use the following command::
+
+    python3 benchmarks/schema_validation.py -n 20000
+"""
+
+import argparse
+import gc
+import os
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from synthetic import write_story
+from pyw3d import project, schema
+from pyw3d.errors import BadW3DXML
+
+
+def timed(function, *args, **kwargs):
+    """Call function and return (result, wall time in s)"""
+    gc.collect()
+    start_time = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start_time
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-n", "--objects", type=int, default=20000,
+        help="number of objects in synthetic story")
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=3,
+        help="number of loads of each kind (the fastest is reported)")
+    args = parser.parse_args()
+
+    _, compile_time = timed(schema.default_schema)
+    print("{:>24}: {:8.3f} s".format("compile schema", compile_time))
+
+    with tempfile.TemporaryDirectory() as story_dir:
+        story_file = write_story(
+            os.path.join(story_dir, "story.xml"), args.objects)
+        story_root = ET.parse(story_file).getroot()
+        violations, check_time = timed(schema.check_story, story_root)
+        print("{:>24}: {:8.3f} s ({} violations)".format(
+            "check only", check_time, len(violations)))
+
+        load_times = {False: float("inf"), True: float("inf")}
+        for _ in range(args.repeat):
+            for validate_schema in (False, True):
+                loaded, load_time = timed(
+                    project.W3DProject.fromXML, story_root,
+                    call_directory=story_dir, validate_schema=validate_schema
+                )
+                del loaded
+                load_times[validate_schema] = min(
+                    load_times[validate_schema], load_time)
+        for validate_schema in (False, True):
+            print("{:>24}: {:8.3f} s".format(
+                "load (validate={})".format(validate_schema),
+                load_times[validate_schema]))
+        print("{:>24}: {:8.1f} %".format(
+            "overhead",
+            100 * (load_times[True] - load_times[False]) / load_times[False]))
+
+        story_root.find("ObjectRoot")[-1].find("Visible").text = "maybe"
+        start_time = time.perf_counter()
+        try:
+            project.W3DProject.fromXML(story_root, call_directory=story_dir)
+        except BadW3DXML:
+            pass
+        print("{:>24}: {:8.3f} s".format(
+            "reject bad document", time.perf_counter() - start_time))
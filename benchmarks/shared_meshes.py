@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# Copyright (C) 2016 William Hicks
+#
+# This file is part of Writing3D.
+#
+# Writing3D is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+"""Compare building shapes, images and text with and without shared meshes
+
+The project of headless_build.py is built at each requested scale against
+the recording stand-in for Blender, once with pyw3d.objects.SHARED_MESHES
+off and once with it on. For each, the time taken by the objects phase
+(within pyw3d itself and within the stand-in), the number of operator calls
+adding mesh primitives, the number of meshes created, the number of those
+that would be saved (i.e. that have users) and the number of mesh vertices
+(which determine most of the size of the .blend) are shown.
+The placement, color, visibility and materials of every object in the scene
+are checked to be the same either way.
+
+With --around-own-axis, every shape, image and text object is recentered on
+its own axis, and so ends up with a mesh of its own in either mode.
+
+To run this benchmark, use the following command::
+
+    python3 benchmarks/shared_meshes.py -s 1 2 4
+"""
+
+import argparse
+import multiprocessing
+import os
+import tempfile
+import fake_blender
+import headless_build
+
+MATERIAL_SETTINGS = (
+    "use_shadeless", "use_object_color", "use_transparency", "use_nodes")
+
+
+def material_signature(material):
+    """Return hashable description of the settings of a material"""
+    if material is None:
+        return None
+    return tuple(
+        getattr(material, name, None) for name in MATERIAL_SETTINGS) + (
+        material.game_settings.use_backface_culling,
+        material.game_settings.alpha_blend,
+    )
+
+
+def appearance(scene):
+    """Return dictionary mapping names of objects in scene to descriptions
+    of their placement, color, visibility and materials"""
+    return {
+        blender_object.name: (
+            tuple(blender_object.location), tuple(blender_object.scale),
+            tuple(blender_object.rotation_euler), tuple(blender_object.color),
+            tuple(blender_object.layers), blender_object.hide_render,
+            tuple(
+                material_signature(slot.material)
+                for slot in blender_object.material_slots)
+        ) for blender_object in scene.objects
+    }
+
+
+def build(scale, shared_meshes, around_own_axis=False):
+    """Build project of headless_build.py at given scale and return summary
+    of the calls made and meshes created"""
+    recorder = fake_blender.install()
+    from pyw3d import objects
+    objects.SHARED_MESHES = shared_meshes
+    trace = headless_build.recorded_trace(recorder)
+    working_directory = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        headless_build.write_assets(directory)
+        try:
+            target_project = headless_build.performance_project(
+                directory, theta_div=20 * scale)
+            if around_own_axis:
+                for target_object in target_project["objects"]:
+                    if isinstance(target_object["content"], (
+                            objects.W3DShape, objects.W3DImage,
+                            objects.W3DText)):
+                        target_object["around_own_axis"] = True
+            target_project.blend(trace=trace)
+        finally:
+            os.chdir(working_directory)
+    objects_phase = next(
+        span for span in trace.phases if span.name == "objects")
+    data = fake_blender.bpy.data
+    return {
+        "pyw3d_time":
+        objects_phase.duration - recorder.fake_times["objects"],
+        "stand_in_time": recorder.fake_times["objects"],
+        "primitives": sum(
+            count for name, count in recorder.counts(
+                cost=fake_blender.COST_OPERATOR).items()
+            if name.startswith("ops.mesh.primitive_")),
+        "meshes": len(data.meshes),
+        "saved_meshes": sum(mesh.users > 0 for mesh in data.meshes),
+        "vertices": sum(len(mesh.vertices) for mesh in data.meshes),
+        "appearance": appearance(fake_blender.bpy.context.scene),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-s", "--scales", type=int, nargs="+", default=[1, 2, 4],
+        help="multiples of the number of rows in samples/performance.py")
+    parser.add_argument(
+        "-a", "--around-own-axis", action="store_true",
+        help="recenter shape, image and text objects on their own axis")
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    print("{:>5} {:>9} {:>9} {:>9} {:>10} {:>9} {:>9} {:>9}".format(
+        "scale", "mode", "pyw3d s", "stand-in", "primitives", "meshes",
+        "saved", "vertices"))
+    for scale in args.scales:
+        summaries = {}
+        for shared_meshes in (False, True):
+            with context.Pool(1) as pool:
+                summary = pool.apply(
+                    build, (scale, shared_meshes, args.around_own_axis))
+            summaries[shared_meshes] = summary
+            print(
+                "{:5d} {:>9} {:9.3f} {:9.3f} {:10d} {:9d} {:9d} {:9d}".format(
+                    scale, "shared" if shared_meshes else "separate",
+                    summary["pyw3d_time"], summary["stand_in_time"],
+                    summary["primitives"], summary["meshes"],
+                    summary["saved_meshes"], summary["vertices"]))
+        assert summaries[False]["appearance"] == \
+            summaries[True]["appearance"], \
+            "Shared meshes changed the appearance of objects"
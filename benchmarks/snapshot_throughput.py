@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# Copyright (C) 2016 William Hicks
+#
+# This file is part of Writing3D.
+#
+# Writing3D is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+"""Compare save and load throughput of snapshot, pickle and XML files
+
+These are the formats which may be used to hand a project to the Blender
+export process. Memory is not traced here, since tracing dominates the cost of
+the faster loaders.
+
+To run this benchmark, use the following command::
+
+    python3 benchmarks/snapshot_throughput.py -n 20000
+"""
+
+import argparse
+import gc
+import os
+import tempfile
+import time
+from synthetic import write_story
+from pyw3d import project, snapshot, w3d_export_tools
+
+
+def timed(function, *args):
+    """Call function and return (result, wall time in s)"""
+    gc.collect()
+    start_time = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start_time
+
+
+FORMATS = (
+    ("XML", "story.xml", project.W3DProject.save_XML,
+     project.W3DProject.fromXML_file),
+    ("pickle", "run.p", w3d_export_tools.pickle_w3dproject,
+     w3d_export_tools.unpickle_w3dproject),
+    ("snapshot", "run.w3ds", snapshot.save_snapshot,
+     snapshot.load_snapshot)
+)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-n", "--objects", type=int, default=20000,
+        help="number of objects in synthetic story")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as story_dir:
+        source_project = project.W3DProject.fromXML_file(write_story(
+            os.path.join(story_dir, "source.xml"), args.objects))
+        print("{:>10} {:>10} {:>10} {:>10} {:>12}".format(
+            "format", "size (MB)", "save (s)", "load (s)", "load (MB/s)"))
+        for label, filename, save, load in FORMATS:
+            filename = os.path.join(story_dir, filename)
+            _, save_time = timed(save, source_project, filename)
+            size = os.path.getsize(filename) / 2**20
+            loaded, load_time = timed(load, filename)
+            print("{:>10} {:10.2f} {:10.2f} {:10.2f} {:12.2f}".format(
+                label, size, save_time, load_time, size / load_time))
+            del loaded
@@ -0,0 +1,163 @@
+# Copyright (C) 2016 William Hicks
+#
+# This file is part of Writing3D.
+#
+# Writing3D is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+"""Generators for large synthetic W3D stories used by the benchmarks
+
+Stories are written directly as XML text so that generating a very large
+story does not itself depend on the pyw3d code being measured.
+"""
+import os
+import sys
+import time
+import tracemalloc
+from math import pi, sin, cos
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+)
+
+OBJECT_TEMPLATE = """\t\t<Object name="elem{index}">
+\t\t\t<Visible>true</Visible>
+\t\t\t<Color>{red},{green},{blue}</Color>
+\t\t\t<Lighting>false</Lighting>
+\t\t\t<ClickThrough>false</ClickThrough>
+\t\t\t<AroundSelfAxis>false</AroundSelfAxis>
+\t\t\t<Scale>5.0</Scale>
+\t\t\t<Placement>
+\t\t\t\t<RelativeTo>Center</RelativeTo>
+\t\t\t\t<Position>({x}, {y}, {z})</Position>
+\t\t\t\t<LookAt angle="0" target="(0.0, 0.0, 0.0)"/>
+\t\t\t</Placement>
+\t\t\t<Content>
+\t\t\t\t<{content}
+\t\t\t</Content>
+\t\t</Object>
+"""
+
+CONTENT_TEMPLATES = (
+    'Text depth="0.0" horiz-align="center" vert-align="center">\n'
+    '\t\t\t\t\t<text>W3D</text>\n\t\t\t\t</Text>',
+    'Light>\n\t\t\t\t\t<Point/>\n\t\t\t\t</Light>',
+    'Text depth="0.0" horiz-align="left" vert-align="top">\n'
+    '\t\t\t\t\t<text>Next</text>\n\t\t\t\t</Text>',
+)
+
+TIMELINE_TEMPLATE = """\t\t<Timeline name="timeline{index}" start-immediately="false">
+\t\t\t<TimedActions seconds-time="{time}">
+\t\t\t\t<ObjectChange name="elem{index}">
+\t\t\t\t\t<Transition duration="1.0">
+\t\t\t\t\t\t<Visible>true</Visible>
+\t\t\t\t\t</Transition>
+\t\t\t\t</ObjectChange>
+\t\t\t</TimedActions>
+\t\t</Timeline>
+"""
+
+GROUP_TEMPLATE = """\t\t<Group name="group{index}">
+{members}
+\t\t</Group>
+"""
+
+STORY_FOOTER = """\t<Global>
+\t\t<CameraPos far-clip="100">
+\t\t\t<Placement>
+\t\t\t\t<RelativeTo>Center</RelativeTo>
+\t\t\t\t<Position>(0.0, 0.0, 6.0)</Position>
+\t\t\t</Placement>
+\t\t</CameraPos>
+\t\t<CaveCameraPos far-clip="100">
+\t\t\t<Placement>
+\t\t\t\t<RelativeTo>Center</RelativeTo>
+\t\t\t</Placement>
+\t\t</CaveCameraPos>
+\t\t<Background color="0, 0, 0"/>
+\t\t<WandNavigation allow-movement="true" allow-rotation="true"/>
+\t</Global>
+\t<PlacementRoot>
+\t\t<Placement name="Center">
+\t\t\t<RelativeTo>Center</RelativeTo>
+\t\t\t<Position>(0.0, 0.0, 0.0)</Position>
+\t\t</Placement>
+\t</PlacementRoot>
+</Story>
+"""
+
+
+def write_story(
+        filename, object_count, timeline_count=None, group_size=100):
+    """Write a synthetic story to filename
+
+    Objects are laid out on a sphere and cycle through several content
+    types. One timeline is written for every tenth object unless
+    timeline_count is given, and objects are gathered into groups of
+    group_size (no groups are written if group_size is 0).
+
+    :param str filename: Name of XML file to write
+    :param int object_count: Number of objects in story
+    :param int timeline_count: Number of timelines in story
+    :param int group_size: Number of objects in each group
+    """
+    if timeline_count is None:
+        timeline_count = object_count // 10
+    with open(filename, "w") as story_file:
+        story_file.write('<?xml version="1.0" ?>\n<Story version="8">\n')
+        story_file.write("\t<ObjectRoot>\n")
+        for index in range(object_count):
+            theta = pi * (index % 97) / 97
+            phi = 2 * pi * (index % 89) / 89
+            story_file.write(OBJECT_TEMPLATE.format(
+                index=index,
+                red=index % 256, green=(3 * index) % 256,
+                blue=(7 * index) % 256,
+                x=10 * sin(theta) * cos(phi),
+                y=10 * sin(theta) * sin(phi),
+                z=10 * cos(theta),
+                content=CONTENT_TEMPLATES[index % len(CONTENT_TEMPLATES)]
+            ))
+        story_file.write("\t</ObjectRoot>\n\t<GroupRoot>\n")
+        group_starts = range(0, object_count, group_size) if group_size \
+            else ()
+        for index in group_starts:
+            story_file.write(GROUP_TEMPLATE.format(
+                index=index // group_size,
+                members="\n".join(
+                    '\t\t\t<Objects name="elem{}"/>'.format(member)
+                    for member in range(
+                        index, min(index + group_size, object_count))
+                )
+            ))
+        story_file.write("\t</GroupRoot>\n\t<TimelineRoot>\n")
+        for index in range(timeline_count):
+            story_file.write(TIMELINE_TEMPLATE.format(
+                index=index, time=float(index % 60)))
+        story_file.write(
+            "\t</TimelineRoot>\n\t<SoundRoot/>\n\t<ParticleActionRoot/>\n"
+            "\t<EventRoot/>\n"
+        )
+        story_file.write(STORY_FOOTER)
+    return filename
+
+
+def measure(function, *args, **kwargs):
+    """Call function and return (result, wall time in s, peak memory in MB)
+    """
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    result = function(*args, **kwargs)
+    wall_time = time.perf_counter() - start_time
+    peak_memory = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return result, wall_time, peak_memory
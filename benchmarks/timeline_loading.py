@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# Copyright (C) 2016 William Hicks
+#
+# This file is part of Writing3D.
+#
+# Writing3D is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+"""Measure loading of a timeline with many TimedActions
+
+A single Timeline node is generated with the requested number of
+TimedActions in random order of time, and loaded with W3DTimeline.fromXML.
+The same actions are then added to an empty SortedList one at a time for
+comparison with the bulk insertion used by the loader.
+
+To run this benchmark, use the following command::
+
+    python3 benchmarks/timeline_loading.py -n 10000
+"""
+
+import argparse
+import random
+import time
+import xml.etree.ElementTree as ET
+import synthetic  # noqa: F401 (makes pyw3d importable)
+from pyw3d.timeline import W3DTimeline
+from pyw3d.structs import SortedList
+
+TIMED_ACTION_TEMPLATE = """<TimedActions seconds-time="{time}">
+<ObjectChange name="elem{index}">
+<Transition duration="1.0"><Visible>true</Visible></Transition>
+</ObjectChange>
+</TimedActions>"""
+
+
+def timeline_xml(action_count, start_times):
+    """Return Timeline node with action_count TimedActions spread over the
+    given number of distinct start times"""
+    times = [index % start_times for index in range(action_count)]
+    random.shuffle(times)
+    return ET.fromstring(
+        '<Timeline name="timeline" start-immediately="false">{}</Timeline>'
+        .format("".join(
+            TIMED_ACTION_TEMPLATE.format(time=time_, index=index)
+            for index, time_ in enumerate(times)
+        ))
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-n", "--actions", type=int, default=10000,
+        help="number of TimedActions in timeline")
+    parser.add_argument(
+        "-s", "--start-times", type=int, default=1000,
+        help="number of distinct start times")
+    args = parser.parse_args()
+
+    random.seed(0)
+    timeline_root = timeline_xml(args.actions, args.start_times)
+
+    start_time = time.perf_counter()
+    timeline = W3DTimeline.fromXML(timeline_root)
+    print("{:>16}: {:8.3f} s".format(
+        "fromXML", time.perf_counter() - start_time))
+
+    actions = list(timeline["actions"])
+    random.shuffle(actions)
+    start_time = time.perf_counter()
+    one_at_a_time = SortedList()
+    for action in actions:
+        one_at_a_time.add(action)
+    print("{:>16}: {:8.3f} s".format(
+        "add each", time.perf_counter() - start_time))
+
+    start_time = time.perf_counter()
+    bulk = SortedList()
+    bulk.extend(actions)
+    print("{:>16}: {:8.3f} s".format(
+        "extend", time.perf_counter() - start_time))
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# Copyright (C) 2016 William Hicks
+#
+# This file is part of Writing3D.
+#
+# Writing3D is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+"""Measure sorting of timelines in which many actions start simultaneously
+
+Actions which start at the same time are ordered by comparing the actions
+themselves. Each action moves an object to a new placement, so that every
+comparison involves a nested feature.
+
+To run this benchmark, use the following command::
+
+    python3 benchmarks/timeline_sorting.py -n 5000 -s 10
+"""
+
+import argparse
+import random
+import time
+import synthetic  # noqa: F401 (makes pyw3d importable)
+from pyw3d.timeline import W3DTimeline
+from pyw3d.actions import ObjectAction
+from pyw3d.placement import W3DPlacement
+
+
+def simultaneous_actions(action_count, start_times):
+    """Return list of (time, ObjectAction) in random order, spread evenly
+    over the given number of distinct start times"""
+    actions = [
+        (
+            float(index % start_times),
+            ObjectAction(
+                object_name="elem{}".format(index),
+                duration=2,
+                placement=W3DPlacement(position=(index, 0, -index))
+            )
+        ) for index in range(action_count)
+    ]
+    random.shuffle(actions)
+    return actions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-n", "--actions", type=int, default=5000,
+        help="number of actions in timeline")
+    parser.add_argument(
+        "-s", "--start-times", type=int, default=10,
+        help="number of distinct start times")
+    args = parser.parse_args()
+
+    random.seed(0)
+    actions = simultaneous_actions(args.actions, args.start_times)
+
+    start_time = time.perf_counter()
+    timeline = W3DTimeline(name="timeline", actions=actions)
+    print("{:>16}: {:8.3f} s".format(
+        "construct", time.perf_counter() - start_time))
+
+    start_time = time.perf_counter()
+    timeline["actions"].sort()
+    print("{:>16}: {:8.3f} s".format(
+        "re-sort", time.perf_counter() - start_time))
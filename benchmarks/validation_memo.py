@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# Copyright (C) 2016 William Hicks
+#
+# This file is part of Writing3D.
+#
+# Writing3D is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+"""Measure memoized validation of an entire project
+
+The project is validated once from scratch, again without changes, and again
+after a single object has been modified. Finally, another object is modified
+and only the changed parts are validated with validate_incremental. By
+default, the synthetic story has no groups or timelines.
+
+To run this benchmark, use the following command::
+
+    python3 benchmarks/validation_memo.py -n 10000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from synthetic import write_story
+from pyw3d import project
+
+
+def timed_validation(target_project, incremental=False):
+    """Validate project and return wall time in s"""
+    start_time = time.perf_counter()
+    if incremental:
+        target_project.validate_incremental(project=target_project)
+    else:
+        target_project.validate(project=target_project)
+    return time.perf_counter() - start_time
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-n", "--objects", type=int, default=10000,
+        help="number of objects in synthetic story")
+    parser.add_argument(
+        "-t", "--timelines", type=int, default=0,
+        help="number of timelines in synthetic story")
+    parser.add_argument(
+        "-g", "--group-size", type=int, default=0,
+        help="number of objects in each group (0 for no groups)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as story_dir:
+        loaded = project.W3DProject.fromXML_file(write_story(
+            os.path.join(story_dir, "story.xml"), args.objects,
+            timeline_count=args.timelines, group_size=args.group_size
+        ))
+        print("{:>16}: {:8.3f} s".format("first", timed_validation(loaded)))
+        print("{:>16}: {:8.3f} s".format(
+            "unchanged", timed_validation(loaded)))
+        loaded["objects"][0]["placement"]["position"] = (1, 2, 3)
+        print("{:>16}: {:8.3f} s".format(
+            "one object edited", timed_validation(loaded)))
+        loaded["objects"][1]["placement"]["position"] = (1, 2, 3)
+        print("{:>16}: {:8.3f} s".format(
+            "incremental", timed_validation(loaded, incremental=True)))
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# Copyright (C) 2016 William Hicks
+#
+# This file is part of Writing3D.
+#
+# Writing3D is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+"""Compare time and peak memory of full-document, streaming and lazy XML
+loading
+
+The lazy loader is also timed when only the timelines of the story are used,
+as is the case for read-only tools such as validators.
+
+To run this benchmark, use the following command::
+
+    python3 benchmarks/xml_loading.py -n 50000
+"""
+
+import argparse
+import gc
+import os
+import tempfile
+from synthetic import write_story, measure
+from pyw3d import project
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-n", "--objects", type=int, default=50000,
+        help="number of objects in synthetic story")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as story_dir:
+        story_file = write_story(
+            os.path.join(story_dir, "story.xml"), args.objects)
+        print("Story size: {:.1f} MB".format(
+            os.path.getsize(story_file) / 2**20))
+        for label, streaming in (("ET.parse", False), ("iterparse", True)):
+            gc.collect()
+            loaded, wall_time, peak_memory = measure(
+                project.W3DProject.fromXML_file, story_file,
+                streaming=streaming
+            )
+            print("{:>10}: {:8.2f} s {:10.1f} MB peak ({} objects)".format(
+                label, wall_time, peak_memory, len(loaded["objects"])))
+            del loaded
+
+        gc.collect()
+        loaded, wall_time, peak_memory = measure(
+            project.W3DProject.fromXML_file, story_file, lazy=True)
+        print("{:>10}: {:8.2f} s {:10.1f} MB peak (sections deferred)".format(
+            "lazy", wall_time, peak_memory))
+        timelines, access_time, _ = measure(
+            loaded.__getitem__, "timelines")
+        print("{:>10}: {:8.2f} s {:>18} ({} timelines)".format(
+            "+timelines", wall_time + access_time, "", len(timelines)))
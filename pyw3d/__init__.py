@@ -98,6 +98,11 @@ if BLENDER_EXEC != executable_from_app(BLENDER_EXEC):
     with open(W3D_CONFIG_FILENAME, 'w') as w3d_config_file:
         json.dump(W3D_CONFIG, w3d_config_file)
 BLENDER_PLAY = W3D_CONFIG["Blender player executable"]
+BUILD_CACHE_DIR = W3D_CONFIG.get(
+    "Build cache directory",
+    os.path.join(os.path.expanduser("~"), ".w3d_cache")
+)
+BUILD_CACHE_SIZE = W3D_CONFIG.get("Build cache size (MB)", 1024) * 2**20
 
 if (
         BLENDER_EXEC != executable_from_app(BLENDER_EXEC) or
@@ -117,13 +122,20 @@ from . import timeline
 from . import placement
 from . import errors
 from . import validators
+from . import file_stats
+from . import validator_compiler
+from . import project_validation
 from . import xml_tools
+from . import schema
 from . import structs
 from . import path
 from . import activators
 from . import triggers
 from . import actions
 from . import groups
+from . import group_graph
+from . import snapshot
+from . import build_cache
 from . import w3d_export_tools
 
 from .features import W3DFeature
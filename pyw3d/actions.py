@@ -336,7 +336,8 @@ class ObjectAction(W3DAction):
                 new_action["scale"] = 1
         node = trans_root.find("Sound")
         if node is not None:
-            raw_sound_change = node.text.strip()
+            raw_sound_change = node.attrib.get(
+                "action", node.text or "").strip()
             for key, value in new_action.sound_xml_tags.items():
                 if raw_sound_change == value:
                     new_action["sound_change"] = key
@@ -453,7 +454,7 @@ class GroupAction(W3DAction):
             node.text = str(self["scale"])
         if "sound_change" in self:
             node = ET.SubElement(
-                trans_root, "Sound", attrib={"action", self["sound_change"]})
+                trans_root, "Sound", attrib={"action": self["sound_change"]})
         if "link_change" in self:
             node = ET.SubElement(trans_root, "LinkChange")
             if self["link_change"] == "Enable":
@@ -514,7 +515,8 @@ class GroupAction(W3DAction):
                 new_action["scale"] = 1
         node = trans_root.find("Sound")
         if node is not None:
-            new_action["sound_change"] = node.text.strip()
+            new_action["sound_change"] = node.attrib.get(
+                "action", node.text or "").strip()
         node = trans_root.find("LinkChange")
         if node is not None:
             for key, value in new_action.link_xml_tags.items():
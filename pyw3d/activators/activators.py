@@ -19,11 +19,10 @@
 """
 import logging
 from pyw3d.errors import EBKAC
+from pyw3d.logic_builder import LogicBuilder
 LOGGER = logging.getLogger("pyw3d")
 try:
     import bpy
-    from _bpy import ops as ops_module
-    BPY_OPS_CALL = ops_module.call
 except ImportError:
     LOGGER.debug(
         "Module bpy not found. Loading pyw3d.timeline as standalone")
@@ -112,6 +111,16 @@ def activate(cont):
         bpy.context.scene.objects.active = self.base_object
         return self.base_object
 
+    @property
+    def logic(self):
+        """The :py:class:`pyw3d.logic_builder.LogicBuilder` used to add
+        properties and logic bricks to base_object"""
+        try:
+            return self._logic
+        except AttributeError:
+            self._logic = LogicBuilder(self.base_object)
+            return self._logic
+
     def create_status_property(self, initial_value="Stop"):
         """Creates a property called "status" which defines whether the
         activator is in a "Start", "Stop", or "Continue" state
@@ -120,13 +129,8 @@ def activate(cont):
         an activator, if possible. Continue means that the actions are ongoing,
         and Start is used to initially start the actions associated with this
         activator"""
-        self.select_base_object()
-        BPY_OPS_CALL(
-            "object.game_property_new", None,
-            {'type': 'STRING', 'name': 'status'}
-        )
-        self.base_object.game.properties["status"].value = initial_value
-        return self.base_object.game.properties["status"]
+        self.logic.activate()
+        return self.logic.game_property("status", "STRING", initial_value)
 
     def create_enabled_property(self, initial_value=True):
         """Creates a property called "enabled" which defines whether or not
@@ -136,13 +140,8 @@ def activate(cont):
         start an activator. It is NOT checked by the activator itself. This is
         to allow the activator to be immediately disabled after activation but
         still process the remainder of its actions"""
-        self.select_base_object()
-        BPY_OPS_CALL(
-            "object.game_property_new", None,
-            {'type': 'BOOL', 'name': 'enabled'}
-        )
-        self.base_object.game.properties["enabled"].value = initial_value
-        return self.base_object.game.properties["enabled"]
+        self.logic.activate()
+        return self.logic.game_property("enabled", "BOOL", initial_value)
 
     def create_status_sensors(self):
         """Creates sensors to detect change in "status" of activator
@@ -155,44 +154,20 @@ def activate(cont):
         LOGGER.debug(
             "Creating status sensors for {}".format(self.name_string)
         )
-        self.select_base_object()
         # Create property sensor to initiate actions
-        BPY_OPS_CALL(
-            "logic.sensor_add", None,
-            {
-                'type': 'PROPERTY', 'object': self.name,
-                'name': 'start_sensor'
-            }
-        )
-        self.base_object.game.sensors[-1].name = "start_sensor"
-        start_sensor = self.base_object.game.sensors["start_sensor"]
+        self.logic.activate()
+        start_sensor = self.logic.sensor("PROPERTY", "start_sensor")
         start_sensor.property = "status"
         start_sensor.value = "Start"
 
         # Create property sensor to activate actions
-        BPY_OPS_CALL(
-            "logic.sensor_add", None,
-            {
-                'type': 'PROPERTY', 'object': self.name,
-                'name': 'active_sensor'
-            }
-        )
-        self.base_object.game.sensors[-1].name = "active_sensor"
-        active_sensor = self.base_object.game.sensors["active_sensor"]
+        active_sensor = self.logic.sensor("PROPERTY", "active_sensor")
         active_sensor.use_pulse_true_level = True
         active_sensor.property = "status"
         active_sensor.value = "Continue"
 
         # Create property sensor to pause actions
-        BPY_OPS_CALL(
-            "logic.sensor_add", None,
-            {
-                'type': 'PROPERTY', 'object': self.name,
-                'name': 'stop_sensor'
-            }
-        )
-        self.base_object.game.sensors[-1].name = "stop_sensor"
-        stop_sensor = self.base_object.game.sensors["stop_sensor"]
+        stop_sensor = self.logic.sensor("PROPERTY", "stop_sensor")
         stop_sensor.property = "status"
         stop_sensor.value = "Stop"
 
@@ -207,15 +182,8 @@ def activate(cont):
         LOGGER.debug(
             "Creating controller for {}".format(self.name_string)
         )
-        self.select_base_object()
-        BPY_OPS_CALL(
-            "logic.controller_add", None,
-            {
-                'type': 'PYTHON', 'object': self.name,
-                'name': 'activate'
-            }
-        )
-        controller = self.base_object.game.controllers["activate"]
+        self.logic.activate()
+        controller = self.logic.controller("PYTHON", "activate")
         controller.mode = "MODULE"
         controller.module = "{}.activate".format(self.name)
         self.controller = controller
@@ -24,8 +24,6 @@ from pyw3d.blender_scripts import DISABLE_LINK_SCRIPT, UNSELECT_LINK_SCRIPT,\
 LOGGER = logging.getLogger("pyw3d")
 try:
     import bpy
-    from _bpy import ops as ops_module
-    BPY_OPS_CALL = ops_module.call
 except ImportError:
     LOGGER.debug(
         "Module bpy not found. Loading pyw3d.timeline as standalone")
@@ -40,66 +38,29 @@ class BlenderClickTrigger(BlenderTrigger):
     def create_click_status_property(self):
         """Add property to track if link is disabled, unselected, selected, or
         activated"""
-        click_object = self.select_base_object()
-        BPY_OPS_CALL(
-            "object.game_property_new", None,
-            {'type': 'STRING', 'name': 'click_status'}
-        )
-        click_object.game.properties["click_status"].value = "False"
-        return click_object.game.properties["click_status"]
+        self.logic.activate()
+        return self.logic.game_property("click_status", "STRING", "False")
 
     def create_click_status_sensors(self):
         """Add property sensors for click status"""
-        self.select_base_object()
-        BPY_OPS_CALL(
-            "logic.sensor_add", None,
-            {
-                'type': 'PROPERTY', 'object': self.name,
-                'name': 'disabled_sensor'
-            }
-        )
-        self.base_object.game.sensors[-1].name = "disabled_sensor"
-        click_sensor = self.base_object.game.sensors["disabled_sensor"]
+        self.logic.activate()
+        click_sensor = self.logic.sensor("PROPERTY", "disabled_sensor")
         click_sensor.property = "click_status"
         click_sensor.value = "disabled"
         self.disabled_sensor = click_sensor
 
-        self.select_base_object()
-        BPY_OPS_CALL(
-            "logic.sensor_add", None,
-            {
-                'type': 'PROPERTY', 'object': self.name,
-                'name': 'unselected_sensor'
-            }
-        )
-        self.base_object.game.sensors[-1].name = "unselected_sensor"
-        click_sensor = self.base_object.game.sensors["unselected_sensor"]
+        self.logic.activate()
+        click_sensor = self.logic.sensor("PROPERTY", "unselected_sensor")
         click_sensor.property = "click_status"
         click_sensor.value = "unselected"
         self.unselected_sensor = click_sensor
 
-        BPY_OPS_CALL(
-            "logic.sensor_add", None,
-            {
-                'type': 'PROPERTY', 'object': self.name,
-                'name': 'selected_sensor'
-            }
-        )
-        self.base_object.game.sensors[-1].name = "selected_sensor"
-        click_sensor = self.base_object.game.sensors["selected_sensor"]
+        click_sensor = self.logic.sensor("PROPERTY", "selected_sensor")
         click_sensor.property = "click_status"
         click_sensor.value = "selected"
         self.selected_sensor = click_sensor
 
-        BPY_OPS_CALL(
-            "logic.sensor_add", None,
-            {
-                'type': 'PROPERTY', 'object': self.name,
-                'name': 'activated_sensor'
-            }
-        )
-        self.base_object.game.sensors[-1].name = "activated_sensor"
-        click_sensor = self.base_object.game.sensors["activated_sensor"]
+        click_sensor = self.logic.sensor("PROPERTY", "activated_sensor")
         click_sensor.property = "click_status"
         click_sensor.value = "activated"
         self.activated_sensor = click_sensor
@@ -110,54 +71,26 @@ class BlenderClickTrigger(BlenderTrigger):
     def create_click_status_controllers(self):
         """Add controllers to handle when click status changes
         """
-        click_object = self.select_base_object()
-        BPY_OPS_CALL(
-            "logic.controller_add", None,
-            {
-                'type': 'PYTHON', 'object': self.name,
-                'name': 'disabled_controller'
-            }
-        )
-        controller = click_object.game.controllers["disabled_controller"]
+        self.logic.activate()
+        controller = self.logic.controller("PYTHON", "disabled_controller")
         controller.mode = "MODULE"
         controller.module = "{}.disable_link".format(self.name)
         controller.link(sensor=self.disabled_sensor)
         self.disabled_controller = controller
 
-        BPY_OPS_CALL(
-            "logic.controller_add", None,
-            {
-                'type': 'PYTHON', 'object': self.name,
-                'name': 'unselected_controller'
-            }
-        )
-        controller = click_object.game.controllers["unselected_controller"]
+        controller = self.logic.controller("PYTHON", "unselected_controller")
         controller.mode = "MODULE"
         controller.module = "{}.unselect_link".format(self.name)
         controller.link(sensor=self.unselected_sensor)
         self.unselected_controller = controller
 
-        BPY_OPS_CALL(
-            "logic.controller_add", None,
-            {
-                'type': 'PYTHON', 'object': self.name,
-                'name': 'selected_controller'
-            }
-        )
-        controller = click_object.game.controllers["selected_controller"]
+        controller = self.logic.controller("PYTHON", "selected_controller")
         controller.mode = "MODULE"
         controller.module = "{}.select_link".format(self.name)
         controller.link(sensor=self.selected_sensor)
         self.selected_controller = controller
 
-        BPY_OPS_CALL(
-            "logic.controller_add", None,
-            {
-                'type': 'PYTHON', 'object': self.name,
-                'name': 'activated_controller'
-            }
-        )
-        controller = click_object.game.controllers["activated_controller"]
+        controller = self.logic.controller("PYTHON", "activated_controller")
         controller.mode = "MODULE"
         controller.module = "{}.activate_link".format(self.name)
         controller.link(sensor=self.activated_sensor)
@@ -171,29 +104,19 @@ class BlenderClickTrigger(BlenderTrigger):
     def create_click_count_property(self):
         """Add property to keep track of how many times link has been
         clicked"""
-        self.select_base_object()
-        BPY_OPS_CALL(
-            "object.game_property_new", None,
-            {'type': 'INT', 'name': 'clicks'}
-        )
-        self.base_object.game.properties["clicks"].value = 0
-        return self.base_object.game.properties["clicks"]
+        self.logic.activate()
+        return self.logic.game_property("clicks", "INT", 0)
 
     def create_clickable_property(self):
         """Add property to track if object is clickable
 
         Note: In order to make an object unclickable, this property should be
         *deleted*, not merely set to False"""
-        click_object = self.select_base_object()
+        click_object = self.logic.activate()
         if (
                 (not click_object.hide_render) and
-                self.base_object.game.properties['enabled']):
-            BPY_OPS_CALL(
-                "object.game_property_new", None,
-                {'type': 'BOOL', 'name': 'clickable'}
-            )
-            click_object.game.properties["clickable"].value = True
-            return click_object.game.properties["clickable"]
+                click_object.game.properties['enabled']):
+            return self.logic.game_property("clickable", "BOOL", True)
         return None
 
     def create_blender_objects(self):
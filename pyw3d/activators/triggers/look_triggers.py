@@ -22,11 +22,10 @@ import logging
 from pyw3d.names import generate_blender_object_name
 from pyw3d.errors import EBKAC
 from .triggers import BlenderTrigger
+from pyw3d.logic_builder import LogicBuilder
 LOGGER = logging.getLogger("pyw3d")
 try:
     import bpy
-    from _bpy import ops as ops_module
-    BPY_OPS_CALL = ops_module.call
 except ImportError:
     LOGGER.debug(
         "Module bpy not found. Loading "
@@ -43,6 +42,16 @@ class BlenderLookAtTrigger(BlenderTrigger):
         bpy.context.scene.objects.active = camera_object
         return camera_object
 
+    @property
+    def camera_logic(self):
+        """The :py:class:`pyw3d.logic_builder.LogicBuilder` used to add
+        properties and logic bricks to the main camera"""
+        try:
+            return self._camera_logic
+        except AttributeError:
+            self._camera_logic = LogicBuilder(bpy.data.objects["CAMERA"])
+            return self._camera_logic
+
     def create_enabled_copier(self):
         """Create system to copy enabled value to camera property
 
@@ -52,42 +61,19 @@ class BlenderLookAtTrigger(BlenderTrigger):
         trigger.This allows camera to only go through costly detection actions
         when the trigger is enabled.
         """
-        self.select_base_object()
-        BPY_OPS_CALL(
-            "logic.sensor_add", None,
-            {
-                'type': 'PROPERTY', 'object': self.name,
-                'name': 'enabled_sensor'
-            }
-        )
-        self.base_object.game.sensors[-1].name = "enabled_sensor"
-        enabled_sensor = self.base_object.game.sensors["enabled_sensor"]
+        self.logic.activate()
+        enabled_sensor = self.logic.sensor("PROPERTY", "enabled_sensor")
         enabled_sensor.property = "enabled"
         enabled_sensor.evaluation_type = "PROPCHANGED"
 
-        self.select_base_object()
-        BPY_OPS_CALL(
-            "logic.controller_add", None,
-            {
-                'type': 'LOGIC_AND', 'object': self.name,
-                'name': 'enable'
-            }
-        )
-        controller = self.base_object.game.controllers["enable"]
+        self.logic.activate()
+        controller = self.logic.controller("LOGIC_AND", "enable")
 
-        camera_object = self.select_camera()
-        BPY_OPS_CALL(
-            "logic.actuator_add", None,
-            {
-                'type': 'PROPERTY', 'object': 'CAMERA',
-                'name': self.name
-            }
-        )
-        camera_object.game.actuators[-1].name = self.name
-        property_copier = camera_object.game.actuators[self.name]
+        self.camera_logic.activate()
+        property_copier = self.camera_logic.actuator("PROPERTY", self.name)
         property_copier.mode = "COPY"
         property_copier.property = self.name
-        property_copier.object = self.base_object
+        property_copier.object = self.logic.blender_object
         property_copier.object_property = "enabled"
 
         return (enabled_sensor, controller, property_copier)
@@ -100,24 +86,13 @@ class BlenderLookAtTrigger(BlenderTrigger):
         trigger is enabled, we can have it only perform (expensive) checks
         related to the trigger when it is in fact enabled.
         """
-        camera_object = self.select_camera()
+        camera_logic = self.camera_logic
+        camera_logic.activate()
         # Property on camera to keep track of when trigger is enabled
-        BPY_OPS_CALL(
-            "object.game_property_new", None,
-            {'type': 'BOOL', 'name': self.name}
-        )
-        camera_object.game.properties[
-            self.name].value = self.enable_immediately
+        camera_logic.game_property(
+            self.name, "BOOL", self.enable_immediately)
         # Sensor to fire continuously while trigger is enabled
-        BPY_OPS_CALL(
-            "logic.sensor_add", None,
-            {
-                'type': 'PROPERTY', 'object': 'CAMERA',
-                'name': self.name
-            }
-        )
-        camera_object.game.sensors[-1].name = self.name
-        camera_enable_sensor = camera_object.game.sensors[self.name]
+        camera_enable_sensor = camera_logic.sensor("PROPERTY", self.name)
         camera_enable_sensor.use_pulse_true_level = True
         camera_enable_sensor.tick_skip = 0
         camera_enable_sensor.property = self.name
@@ -125,20 +100,12 @@ class BlenderLookAtTrigger(BlenderTrigger):
         self.camera_enable_sensor = camera_enable_sensor
 
         # Create controller to detect trigger events
-        camera_object = self.select_camera()
-        BPY_OPS_CALL(
-            "logic.controller_add", None,
-            {
-                'type': 'PYTHON', 'object': 'CAMERA',
-                'name': self.name
-            }
-        )
-        camera_object.game.controllers[-1].name = self.name
-        controller = camera_object.game.controllers[self.name]
+        camera_logic.activate()
+        controller = camera_logic.controller("PYTHON", self.name)
         controller.mode = "MODULE"
         controller.module = "{}.detect_event".format(self.name)
 
-        return camera_object
+        return camera_logic.blender_object
 
     def link_camera_bricks(self):
         """Link BGE logic bricks for camera"""
@@ -22,14 +22,6 @@ import logging
 LOGGER = logging.getLogger("pyw3d")
 from pyw3d.errors import EBKAC
 from .triggers import BlenderTrigger
-try:
-    import bpy
-    from _bpy import ops as ops_module
-    BPY_OPS_CALL = ops_module.call
-except ImportError:
-    LOGGER.debug(
-        "Module bpy not found. Loading "
-        "pyw3d.activators.triggers.object_triggers as standalone")
 
 
 class BlenderObjectPositionTrigger(BlenderTrigger):
@@ -45,16 +37,8 @@ class BlenderObjectPositionTrigger(BlenderTrigger):
 
     def create_enabled_sensor(self):
         """Add a sensor to fire continuously while trigger is enabled"""
-        self.select_base_object()
-        BPY_OPS_CALL(
-            "logic.sensor_add", None,
-            {
-                'type': 'PROPERTY', 'object': self.name,
-                'name': 'enabled_sensor'
-            }
-        )
-        self.base_object.game.sensors[-1].name = "enabled_sensor"
-        enable_sensor = self.base_object.game.sensors["enabled_sensor"]
+        self.logic.activate()
+        enable_sensor = self.logic.sensor("PROPERTY", "enabled_sensor")
         enable_sensor.use_pulse_true_level = True
         enable_sensor.tick_skip = 0
         enable_sensor.property = "enabled"
@@ -65,15 +49,7 @@ class BlenderObjectPositionTrigger(BlenderTrigger):
 
     def create_detection_controller(self):
         """Add a controller for detecting specified event"""
-
-        BPY_OPS_CALL(
-            "logic.controller_add", None,
-            {
-                'type': 'PYTHON', 'object': self.name,
-                'name': 'detect'
-            }
-        )
-        controller = self.base_object.game.controllers["detect"]
+        controller = self.logic.controller("PYTHON", "detect")
         controller.mode = "MODULE"
         controller.module = "{}.detect_event".format(self.name)
         self.detect_controller = controller
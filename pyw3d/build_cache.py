@@ -0,0 +1,245 @@
+# Copyright (C) 2016 William Hicks
+#
+# This file is part of Writing3D.
+#
+# Writing3D is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+"""Cache of exported .blend files
+
+Exported files are stored under a key computed from the W3D XML of the
+project, the contents of every file it references (images, models with their
+materials and textures, fonts and sounds), the Blender executable used for
+export and the source of pyw3d itself. If none of these have changed, a
+previous export can be reused without starting Blender.
+"""
+import glob
+import hashlib
+import logging
+import os
+import re
+import shutil
+import tempfile
+from . import BUILD_CACHE_DIR, BUILD_CACHE_SIZE, BLENDER_EXEC
+from .features import W3DFeature
+from .structs import SortedList
+from .validators import ValidFile, ValidFontFile
+from .file_stats import STAT_CACHE
+LOGGER = logging.getLogger("pyw3d")
+
+BUILD_CACHE_VERSION = "1"
+_BLOCK_SIZE = 2**20
+_SOURCE_HASH = None
+_MATERIAL_LIBRARY = re.compile(rb"^[ \t]*mtllib[ \t]+(.*?)\s*$", re.MULTILINE)
+_TEXTURE_MAP = re.compile(
+    rb"^[ \t]*(?:map_\w+|bump|disp|decal|refl)[ \t]+(.*?)\s*$",
+    re.MULTILINE)
+
+
+def _hash_file(filename, digest):
+    """Update digest with contents of file"""
+    with open(filename, "rb") as file_:
+        block = file_.read(_BLOCK_SIZE)
+        while block:
+            digest.update(block)
+            block = file_.read(_BLOCK_SIZE)
+
+
+def _source_hash():
+    """Return hash of pyw3d source, so that cached exports are discarded
+    when the exporter changes"""
+    global _SOURCE_HASH
+    if _SOURCE_HASH is None:
+        digest = hashlib.sha256()
+        package_dir = os.path.dirname(os.path.abspath(__file__))
+        source_files = []
+        for directory, _, filenames in os.walk(package_dir):
+            source_files.extend(
+                os.path.join(directory, filename) for filename in filenames
+                if filename.endswith(".py")
+            )
+        for source_file in sorted(source_files):
+            digest.update(
+                os.path.relpath(source_file, package_dir).encode("utf-8"))
+            _hash_file(source_file, digest)
+        _SOURCE_HASH = digest.hexdigest()
+    return _SOURCE_HASH
+
+
+def _sidecar_names(filename, pattern, last_only):
+    """Return filenames given on lines of file which match pattern, relative
+    to the directory containing the file"""
+    try:
+        with open(filename, "rb") as file_:
+            content = file_.read()
+    except OSError:
+        return []
+    directory = os.path.dirname(filename)
+    names = []
+    for match in pattern.finditer(content):
+        # Texture maps may be preceded by options, while material libraries
+        # may list several files
+        words = match.group(1).replace(b"\\", b"/").split()
+        for word in words[-1:] if last_only else words:
+            names.append(os.path.join(directory, os.fsdecode(word)))
+    return names
+
+
+def model_sidecar_files(filename):
+    """Generate filenames of the files which Blender reads along with a
+    model, i.e. the material libraries of an OBJ file and the textures they
+    use
+
+    Material libraries which do not exist are still generated, so that
+    adding them later changes the cache key."""
+    if not filename.lower().endswith(".obj"):
+        return
+    for library in _sidecar_names(filename, _MATERIAL_LIBRARY, False):
+        yield library
+        yield from _sidecar_names(library, _TEXTURE_MAP, True)
+
+
+def referenced_files(value, candidates=False):
+    """Generate filenames of all files referenced by given project, feature
+    or container of features
+
+    Files are found via the :py:class:`validators.ValidFile` validators of
+    each feature, and are resolved relative to the current working directory
+    in the same way as those validators do. Unless candidates is True, the
+    files read along with each model are also generated (see
+    :py:func:`model_sidecar_files`).
+
+    :param bool candidates: If True, generate every filename which a
+    validator may check (e.g. both "font.ttf" and "fonts/font.ttf" for
+    fonts) without checking which of them exist"""
+    if isinstance(value, W3DFeature):
+        for key, item in value.items():
+            validator = value.argument_validators.get(key)
+            if isinstance(validator, ValidFile):
+                if not isinstance(validator, ValidFontFile):
+                    yield item
+                    if not candidates:
+                        yield from model_sidecar_files(item)
+                elif candidates:
+                    yield item
+                    yield os.path.join("fonts", item)
+                elif not STAT_CACHE.isfile(item):
+                    yield os.path.join("fonts", item)
+                else:
+                    yield item
+            else:
+                yield from referenced_files(item, candidates=candidates)
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from referenced_files(item, candidates=candidates)
+    elif isinstance(value, (list, tuple, SortedList)):
+        for item in value:
+            yield from referenced_files(item, candidates=candidates)
+
+
+class BuildCache(object):
+    """A size-bounded cache of exported .blend files
+
+    When the total size of cached files exceeds max_size, the least recently
+    used files are removed.
+
+    :param str directory: Directory in which to store cached files (defaults
+    to "Build cache directory" from the W3D configuration file)
+    :param int max_size: Maximum total size of cached files in bytes (defaults
+    to "Build cache size (MB)" from the W3D configuration file)
+    :param str blender_exec: Blender executable used for export
+    """
+
+    def __init__(
+            self, directory=BUILD_CACHE_DIR, max_size=BUILD_CACHE_SIZE,
+            blender_exec=BLENDER_EXEC):
+        self.directory = directory
+        self.max_size = max_size
+        self.blender_exec = blender_exec
+
+    def key(self, project):
+        """Return cache key for given W3DProject"""
+        digest = hashlib.sha256()
+        for part in (
+                BUILD_CACHE_VERSION, _source_hash(), self.blender_exec,
+                project.toprettyxml()):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        for filename in sorted(set(referenced_files(project))):
+            digest.update(filename.encode("utf-8"))
+            digest.update(b"\0")
+            try:
+                _hash_file(filename, digest)
+            except OSError:
+                digest.update(b"missing")
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def path(self, key):
+        """Return filename of cached file for given key"""
+        return os.path.join(self.directory, "{}.blend".format(key))
+
+    def fetch(self, key, filename):
+        """Copy cached file for key to filename if it exists
+
+        :return: True if cached file was found, False otherwise"""
+        cached = self.path(key)
+        try:
+            shutil.copyfile(cached, filename)
+        except FileNotFoundError:
+            LOGGER.debug("No cached export for {}".format(key))
+            return False
+        os.utime(cached)  # Mark as recently used
+        LOGGER.info("Reusing cached export {}".format(cached))
+        return True
+
+    def store(self, key, filename):
+        """Add copy of filename to cache under given key"""
+        os.makedirs(self.directory, exist_ok=True)
+        handle, temp_filename = tempfile.mkstemp(
+            dir=self.directory, suffix=".tmp")
+        os.close(handle)
+        try:
+            shutil.copyfile(filename, temp_filename)
+            os.replace(temp_filename, self.path(key))
+        except:
+            os.remove(temp_filename)
+            raise
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used files until cache is within max_size
+        """
+        entries = []
+        for cached in glob.glob(os.path.join(self.directory, "*.blend")):
+            try:
+                status = os.stat(cached)
+            except FileNotFoundError:
+                continue
+            entries.append((status.st_mtime, status.st_size, cached))
+        entries.sort()
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, cached in entries:
+            if total_size <= self.max_size:
+                break
+            LOGGER.debug("Evicting cached export {}".format(cached))
+            try:
+                os.remove(cached)
+            except FileNotFoundError:
+                pass
+            total_size -= size
+
+    def clear(self):
+        """Remove all cached files"""
+        for cached in glob.glob(os.path.join(self.directory, "*.blend")):
+            os.remove(cached)
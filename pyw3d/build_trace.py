@@ -0,0 +1,250 @@
+# Copyright (C) 2016 William Hicks
+#
+# This file is part of Writing3D.
+#
+# Writing3D is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+"""Record where the time goes when a project is built in Blender
+
+A :py:class:`BuildTrace` is filled in by :py:meth:`W3DProject.blend
+<pyw3d.project.W3DProject.blend>`. For each phase of the build (sounds,
+objects, logic, etc.) and for each feature blended within it, the trace
+records the wall time taken, the number of Blender operators invoked (every
+module calls operators through a ``BPY_OPS_CALL`` wrapper, so that all of
+them are counted) and the number of Blender objects created. The trace can be
+summarized by phase or by type of feature and written out as JSON or in the
+Chrome trace event format (viewable in chrome://tracing or Perfetto).
+"""
+import json
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from .errors import EBKAC
+try:
+    import bpy
+except ImportError:
+    pass
+
+
+class CountedCall(object):
+    """Wrapper of Blender's operator call which counts its invocations
+
+    Every module which calls operators directly wraps ``_bpy.ops.call`` in
+    one of these. All wrappers share a single count, from which
+    :py:class:`BuildTrace` takes the number of calls made within each span.
+
+    :param call: The function to wrap
+    """
+    __slots__ = ("call",)
+    count = 0
+
+    def __init__(self, call):
+        self.call = call
+
+    def __call__(self, *args, **kwargs):
+        CountedCall.count += 1
+        return self.call(*args, **kwargs)
+
+
+def object_count():
+    """Return number of objects in current Blender file (0 outside of
+    Blender)"""
+    try:
+        return len(bpy.data.objects)
+    except NameError:
+        return 0
+
+
+class TraceSpan(object):
+    """A single phase of a build or a feature blended within it
+
+    :param str name: Name of phase or feature
+    :param str category: "phase" or the type of the feature
+    :param str phase: Name of the phase containing this span
+    :param float start: Seconds from start of build to start of span
+    """
+    __slots__ = (
+        "name", "category", "phase", "start", "duration", "ops_calls",
+        "objects_created")
+
+    def __init__(self, name, category, phase, start):
+        self.name = name
+        self.category = category
+        self.phase = phase
+        self.start = start
+        self.duration = 0.0
+        self.ops_calls = 0
+        self.objects_created = 0
+
+    def to_dict(self):
+        """Return dictionary of the recorded values"""
+        return OrderedDict(
+            (name, getattr(self, name)) for name in self.__slots__)
+
+
+class BuildTrace(object):
+    """Time, operator calls and objects created by each phase of a build
+    and by each feature within it
+
+    :param str story: Name of the story being built, recorded with the
+    trace
+    """
+
+    def __init__(self, story=None):
+        self.story = story
+        self.phases = []
+        """List of :py:class:`TraceSpan` for each phase in order"""
+        self.features = []
+        """List of :py:class:`TraceSpan` for each feature in order"""
+        self._origin = time.perf_counter()
+        self._current_phase = None
+
+    @contextmanager
+    def _span(self, span, spans):
+        """Fill in span from the time, operator calls and objects created
+        within the context and append it to spans"""
+        ops_calls = CountedCall.count
+        objects = object_count()
+        start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            span.duration = time.perf_counter() - start
+            span.ops_calls = CountedCall.count - ops_calls
+            span.objects_created = object_count() - objects
+            spans.append(span)
+
+    @contextmanager
+    def phase(self, name):
+        """Record the build phase carried out within this context"""
+        span = TraceSpan(
+            name, "phase", name, time.perf_counter() - self._origin)
+        self._current_phase = name
+        try:
+            with self._span(span, self.phases):
+                yield span
+        finally:
+            self._current_phase = None
+
+    @contextmanager
+    def feature(self, feature, name=None):
+        """Record the blending of a feature within this context
+
+        :param W3DFeature feature: The feature being blended
+        :param str name: Name to record for the feature, if it is not
+        named itself (e.g. the name of the object owning a W3DLink)
+        """
+        if name is None:
+            name = feature["name"]
+        span = TraceSpan(
+            name, type(feature).__name__, self._current_phase,
+            time.perf_counter() - self._origin)
+        with self._span(span, self.features):
+            yield span
+
+    @property
+    def duration(self):
+        """Total time of all recorded phases"""
+        return sum(span.duration for span in self.phases)
+
+    def feature_types(self):
+        """Return list of dictionaries summarizing, for each phase and type
+        of feature, the number of features, time, operator calls and objects
+        created, in order of decreasing time"""
+        totals = OrderedDict()
+        for span in self.features:
+            key = (span.phase, span.category)
+            try:
+                total = totals[key]
+            except KeyError:
+                total = totals[key] = OrderedDict((
+                    ("phase", span.phase), ("category", span.category),
+                    ("count", 0), ("duration", 0.0), ("ops_calls", 0),
+                    ("objects_created", 0)))
+            total["count"] += 1
+            total["duration"] += span.duration
+            total["ops_calls"] += span.ops_calls
+            total["objects_created"] += span.objects_created
+        return sorted(
+            totals.values(), key=lambda total: total["duration"],
+            reverse=True)
+
+    def slowest_features(self, count=10):
+        """Return the count spans of features which took the most time"""
+        return sorted(
+            self.features, key=lambda span: span.duration,
+            reverse=True)[:count]
+
+    def to_dict(self):
+        """Return dictionary of phases, summary by type of feature and
+        individual features, suitable for writing as JSON"""
+        return OrderedDict((
+            ("story", self.story),
+            ("duration", self.duration),
+            ("phases", [span.to_dict() for span in self.phases]),
+            ("feature_types", self.feature_types()),
+            ("features", [span.to_dict() for span in self.features]),
+        ))
+
+    def to_chrome_trace(self):
+        """Return dictionary of events in the Chrome trace event format"""
+        events = []
+        for span in self.phases + self.features:
+            events.append(OrderedDict((
+                ("name", span.name),
+                ("cat", span.category),
+                ("ph", "X"),
+                ("ts", span.start * 1e6),
+                ("dur", span.duration * 1e6),
+                ("pid", 1),
+                ("tid", 1),
+                ("args", OrderedDict((
+                    ("phase", span.phase),
+                    ("ops_calls", span.ops_calls),
+                    ("objects_created", span.objects_created)))),
+            )))
+        events.sort(key=lambda event: event["ts"])
+        return OrderedDict((
+            ("traceEvents", events),
+            ("displayTimeUnit", "ms"),
+            ("otherData", {"story": self.story}),
+        ))
+
+    def write(self, filename, trace_format="json"):
+        """Write trace to file
+
+        :param str filename: Name of file to write
+        :param str trace_format: "json" for :py:meth:`to_dict` or "chrome"
+        for :py:meth:`to_chrome_trace`
+        """
+        if trace_format == "chrome":
+            trace = self.to_chrome_trace()
+        elif trace_format == "json":
+            trace = self.to_dict()
+        else:
+            raise EBKAC(
+                "Unknown trace format {}".format(trace_format))
+        with open(filename, "w") as trace_file:
+            json.dump(trace, trace_file, indent=1)
+
+    def report(self):
+        """Return a plain text table of the time, operator calls and objects
+        created by each phase"""
+        lines = ["{:<20} {:>10} {:>10} {:>10}".format(
+            "phase", "seconds", "operators", "objects")]
+        for span in self.phases:
+            lines.append("{:<20} {:10.3f} {:10d} {:10d}".format(
+                span.name, span.duration, span.ops_calls,
+                span.objects_created))
+        return "\n".join(lines)
@@ -24,6 +24,12 @@ class BadW3DXML(Exception):
         super(BadW3DXML, self).__init__(message)
 
 
+class BadW3DSnapshot(Exception):
+    """Exception thrown when a W3D snapshot file cannot be written or read"""
+    def __init__(self, message):
+        super(BadW3DSnapshot, self).__init__(message)
+
+
 class InvalidArgument(Exception):
     """Exception thrown for invalid argument to a W3D feature
 
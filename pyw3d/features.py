@@ -23,7 +23,29 @@ may appear in such a project. This may be as sophisticated as a "Timeline" or
 as simple as a "Placement" for an object (since Placement features define
 position, and potentially multiple kinds of rotation).
 """
+import weakref
+from collections import defaultdict
+from collections.abc import KeysView, ValuesView, ItemsView
 from .errors import InvalidArgument, ConsistencyError, ValidationError
+from .structs import track, SortedList
+from .validators import start_dependency_log, finish_dependency_log, \
+    current_dependency_log, log_dependencies, dependencies_unchanged
+from .validator_compiler import compiled_validators
+
+_UNSET = object()
+_COMPACT_CLASSES = {}
+_DERIVED_CLASSES = {}
+
+
+class _SortedArguments(object):
+    """Default ui_order for features: names of all arguments in alphabetical
+    order
+
+    This is computed for each class when requested rather than being stored
+    on every instance."""
+
+    def __get__(self, instance, owner):
+        return sorted(owner.argument_validators.keys())
 
 
 class W3DFeature(dict):
@@ -41,48 +63,258 @@ class W3DFeature(dict):
 
     :cvar blender_scaling: Scaling factor used to convert back and forth
         between Blender and legacy units
+
+    :cvar transient_attributes: Names of instance attributes which only hold
+        bookkeeping for the current session and are not saved with the feature
+
+    :cvar ui_order: Order in which arguments are presented in editors
+        (defaults to alphabetical order)
+
+    :cvar compact_storage: If True, new instances of this class are created
+        as instances of :py:meth:`compact_class`, which store values in slots
+        rather than in a hash table. This may be set on W3DFeature itself to
+        apply to all features. Classes which override the mapping methods
+        (such as W3DProject) set this to False.
     """
 
     argument_validators = {}
     default_arguments = {}
     blender_scaling = 1
+    transient_attributes = (
+        "_owners", "_xml_fragment", "_content_hash", "_validation_hashes",
+        "_canonical_key", "_structural_hash", "_validated",
+        "_dirty_children", "_derived_features")
+    ui_order = _SortedArguments()
+    compact_storage = False
+    _owners = ()
+    _xml_fragment = None
+    _content_hash = None
+    _canonical_key = None
+    _structural_hash = None
+    _validated = False
+    _dirty_children = None
+    _derived_features = None
+    _validation_hashes = None
+    _store = dict.__setitem__  # Store value without validation
+
+    def __new__(feature_class, *args, **kwargs):
+        if feature_class.compact_storage:
+            feature_class = feature_class.compact_class()
+            return feature_class.__new__(feature_class)
+        return super(W3DFeature, feature_class).__new__(feature_class)
+
+    @classmethod
+    def compact_class(feature_class):
+        """Return subclass of this class which stores values in a fixed
+        layout of slots derived from argument_validators
+
+        Instances of the compact class behave exactly like instances of this
+        class (including __missing__ defaults), but use considerably less
+        memory."""
+        try:
+            return _COMPACT_CLASSES[feature_class]
+        except KeyError:
+            pass
+        if issubclass(feature_class, CompactStorage):
+            return feature_class
+        names = tuple(feature_class.argument_validators.keys())
+        slots = tuple("_v{}".format(index) for index in range(len(names)))
+        compact = type(feature_class)(
+            feature_class.__name__, (CompactStorage, feature_class), {
+                "__slots__": slots,
+                "__module__": feature_class.__module__,
+                "__qualname__": feature_class.__qualname__,
+                "__doc__": feature_class.__doc__,
+                "full_class": feature_class,
+                "compact_storage": False,
+                "_value_slots": dict(zip(names, slots))
+            }
+        )
+        _COMPACT_CLASSES[feature_class] = compact
+        return compact
+
+    @classmethod
+    def derived_class(feature_class):
+        """Return subclass of this class used for features created by
+        :py:meth:`derive`"""
+        feature_class = getattr(feature_class, "full_class", feature_class)
+        try:
+            return _DERIVED_CLASSES[feature_class]
+        except KeyError:
+            pass
+        transient_attributes = feature_class.transient_attributes + (
+            "_template",)
+        derived = type(feature_class)(
+            feature_class.__name__, (DerivedStorage, feature_class), {
+                "__slots__": transient_attributes,
+                "__module__": feature_class.__module__,
+                "__qualname__": feature_class.__qualname__,
+                "__doc__": feature_class.__doc__,
+                "full_class": feature_class,
+                "compact_storage": False,
+                "transient_attributes": transient_attributes
+            }
+        )
+        _DERIVED_CLASSES[feature_class] = derived
+        return derived
+
+    def derive(self, **overrides):
+        """Return a new feature of the same class which takes every value
+        not given in overrides from this one
+
+        Only the overrides are stored and validated by the new feature.
+        Values which could be modified in place (nested features, lists and
+        dictionaries) are copied into the new feature when first accessed
+        through it, and nested features are derived rather than copied, so
+        changing part of a derived feature never changes this one. Changes
+        made to this feature are seen by every feature derived from it.
+
+        :param overrides: Values which differ from those of this feature
+        """
+        derived_class = self.derived_class()
+        derived = derived_class.__new__(derived_class)
+        derived._template = self
+        if self._derived_features is None:
+            self._derived_features = weakref.WeakValueDictionary()
+        self._derived_features[id(derived)] = derived
+        derived.__init__(**overrides)
+        return derived
 
     def __repr__(self):
         return "< {}: {} >".format(type(self).__name__, super().__repr__())
 
     def __lt__(self, other):
-        """Order based on __repr__ of self and other
+        """Order based on canonical keys of self and other
 
         Defined to allow unambiguous ordering of features"""
 
-        return repr(self) < repr(other)
+        return self.canonical_key() < canonical_key(other)
 
     def __init__(self, *args, **kwargs):
         super(W3DFeature, self).__init__()
         self.update(args)
         self.update(kwargs.items())
-        self._validation_hashes = {}
-        try:
-            self.ui_order
-        except AttributeError:
-            self.ui_order = sorted(self.argument_validators.keys())
 
     def __setitem__(self, key, value):
-        if key not in self.argument_validators:
+        validators = compiled_validators(type(self))
+        if key not in validators:
             raise InvalidArgument(
                 "{} not a valid option for this W3D feature".format(key))
-        if not self.argument_validators[key](value):
+        check = validators[key]
+        if not check(value):
             try:
                 value = self.argument_validators[key].coerce(value)
             except:
                 raise InvalidArgument(
                     "{} is not a valid value for option {}".format(value, key))
-        if not self.argument_validators[key](value):
-            raise InvalidArgument(
-                "{} is not a valid value for option {}\nAdditional Info: "
-                "{}".format(
-                    value, key, self.argument_validators[key].help_string))
-        super(W3DFeature, self).__setitem__(key, value)
+            if not check(value):
+                raise InvalidArgument(
+                    "{} is not a valid value for option {}\nAdditional Info: "
+                    "{}".format(
+                        value, key, self.argument_validators[key].help_string))
+        self._store(key, track(value, self))
+        if key == "name":
+            for owner in self._owners:
+                owner.name_changed(self)
+        self.mark_changed()
+
+    def __delitem__(self, key):
+        super(W3DFeature, self).__delitem__(key)
+        self.mark_changed()
+
+    def pop(self, *args):
+        value = super(W3DFeature, self).pop(*args)
+        self.mark_changed()
+        return value
+
+    def popitem(self):
+        item = super(W3DFeature, self).popitem()
+        self.mark_changed()
+        return item
+
+    def clear(self):
+        super(W3DFeature, self).clear()
+        self.mark_changed()
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for name in self.transient_attributes:
+            state.pop(name, None)
+        return state
+
+    def add_owner(self, owner):
+        """Report future changes to this feature to owner as well
+
+        Owners are the features (or projects) that contain this one as a
+        value, directly or within a list, tuple or dictionary."""
+        if not any(current is owner for current in self._owners):
+            self._owners += (owner,)
+
+    def name_changed(self, feature):
+        """Called when the name of a feature owned by this one is set
+
+        By default, this does nothing; projects use it to keep their index of
+        names up to date."""
+
+    def mark_changed(self, child=None):
+        """Discard cached XML and content hash for this feature and notify all
+        owners that it has been modified
+
+        :param child: If given, the feature within this one that was
+        modified; otherwise, the values of this feature itself have changed
+        """
+        if self._xml_fragment is not None:
+            self._xml_fragment = None
+        if self._content_hash is not None:
+            self._content_hash = None
+        if self._canonical_key is not None:
+            self._canonical_key = None
+            self._structural_hash = None
+        self._flag_dirty(child)
+        for owner in self._owners:
+            owner.mark_changed(self)
+        if self._derived_features:
+            for derived in list(self._derived_features.values()):
+                derived.mark_changed(self)
+
+    def mark_dirty(self, child=None):
+        """Mark this feature for validation by :py:meth:`validate_incremental`
+        without discarding any cached data
+
+        This is used when something outside of the feature on which its
+        validity depends (such as the name of a referenced object) changes.
+
+        :param child: As for :py:meth:`mark_changed`
+        """
+        self._flag_dirty(child)
+        for owner in self._owners:
+            owner.mark_dirty(self)
+        if self._derived_features:
+            for derived in list(self._derived_features.values()):
+                derived.mark_dirty(self)
+
+    def _flag_dirty(self, child):
+        if child is None:
+            if self._validated:
+                self._validated = False
+        else:
+            if self._dirty_children is None:
+                self._dirty_children = {}
+            self._dirty_children[id(child)] = child
+
+    def track_values(self):
+        """Ensure that changes to all current values are reported to this
+        feature
+
+        This is only needed for features whose values were set without going
+        through __setitem__."""
+        for key, value in self.items():
+            self._store(key, track(value, self))
 
     def __missing__(self, key):
         try:
@@ -90,7 +322,7 @@ class W3DFeature(dict):
         except:
             name = type(self).__name__
             try:
-                name = " ".join((name, super().get("name")))
+                name = " ".join((name, self.get("name")))
             except:
                 pass
             raise ConsistencyError(
@@ -100,62 +332,201 @@ class W3DFeature(dict):
             )
 
     def __eq__(self, other):
-        # TODO: Not sure if this is best OOP
-        if type(self) != type(other):
+        """Features are equal if they are of the same class and all of their
+        values (including defaults) are equal"""
+        if self is other:
+            return True
+        if _full_class(self) is not _full_class(other):
             return False
-        all_keys = set(self.keys())
-        all_keys.update(other.keys())
-        for key in all_keys:
-            try:
-                if self[key] != other[key]:
-                    return False
-            except (KeyError, ConsistencyError):
-                return False
-        return True
+        if self.structural_hash() != other.structural_hash():
+            return False
+        return self.canonical_key() == other.canonical_key()
+
+    def __ne__(self, other):
+        return not self == other
 
     def update(self, other):
         for key, value in other:
             self.__setitem__(key, value)
 
+    def _read_only_items(self):
+        """Return iterable of (key, value) pairs for reading only
+
+        Unlike items(), values returned by this method may be shared with
+        other features and must not be modified."""
+        return self.items()
+
+    def content_hash(self):
+        """Return hash of the contents of this feature
+
+        The hash is cached until the feature (or any value within it) is
+        modified."""
+        if self._content_hash is None:
+            self._content_hash = hash((_full_class(self), frozenset(
+                (key, content_hash(value))
+                for key, value in self._read_only_items()
+            )))
+        return self._content_hash
+
+    def canonical_key(self):
+        """Return a tuple which identifies the contents of this feature and
+        determines its ordering relative to other features
+
+        Unset values with defaults are included, so a feature with a value
+        explicitly set to its default has the same key as one without it. The
+        key is cached until the feature (or any value within it) is
+        modified."""
+        if self._canonical_key is None:
+            values = dict(self.default_arguments)
+            values.update(self._read_only_items())
+            full_class = _full_class(self)
+            self._canonical_key = (
+                _FEATURE_ORDER,
+                "{}.{}".format(full_class.__module__, full_class.__qualname__),
+                tuple(sorted(
+                    (key, canonical_key(value))
+                    for key, value in values.items()
+                ))
+            )
+        return self._canonical_key
+
+    def structural_hash(self):
+        """Return hash of :py:meth:`canonical_key`
+
+        Features which compare equal have the same structural hash. The hash
+        is cached along with the key."""
+        if self._structural_hash is None:
+            self._structural_hash = hash(self.canonical_key())
+        return self._structural_hash
+
     def validate(self, project=None):
-        """Validate all values for this feature, coercing if necessary"""
+        """Validate all values for this feature, coercing if necessary
+
+        Successful validation of each value is remembered in
+        _validation_hashes along with the content hash of the value and any
+        external state it was checked against (such as the names of objects
+        in the project or the existence of files). Values for which none of
+        these have changed are not checked again."""
+        identifier = self._identifier()
+        for key, validator in self.argument_validators.items():
+            self._validate_key(key, validator, identifier, project)
+        self._validated = True
+        self._dirty_children = None
+        return True
+
+    def validate_incremental(self, project=None):
+        """Validate only those parts of this feature which may have become
+        invalid since it was last validated
+
+        Modifying a feature marks it and every feature containing it as dirty
+        (see :py:meth:`mark_changed`). If the values of this feature itself
+        have changed, it is validated as in :py:meth:`validate`; otherwise,
+        only its dirty children are visited. Features whose references have
+        been renamed or removed from the project are also marked dirty (see
+        :py:meth:`pyw3d.project.W3DProject.register_dependent`). Changes to
+        files on disk are not tracked, so :py:meth:`validate` should still be
+        used before export."""
+        if not self._validated:
+            return self.validate(project=project)
+        dirty_children = self._dirty_children
+        if dirty_children:
+            for child_id, child in list(dirty_children.items()):
+                child.validate_incremental(project=project)
+                dirty_children.pop(child_id, None)
+        self._dirty_children = None
+        return True
+
+    def validation_errors(self, project=None, keys=None):
+        """Validate values for this feature as in :py:meth:`validate`, but
+        continue past invalid values and return the errors found
+
+        :param project: Project against which references are checked
+        :param keys: Optionally, the keys to validate (defaults to all keys)
+        :return: List of (key, exception) for each invalid value
+        """
+        identifier = self._identifier()
+        if keys is None:
+            keys = self.argument_validators.keys()
+        errors = []
+        for key in keys:
+            try:
+                self._validate_key(
+                    key, self.argument_validators[key], identifier, project)
+            except (ValidationError, ConsistencyError,
+                    InvalidArgument) as error:
+                errors.append((key, error))
+        return errors
+
+    def _identifier(self):
+        """Return description of this feature for use in error messages"""
         identifier = [type(self).__name__]
         if "name" in self:
             identifier.append(self["name"])
-        identifier = " ".join(identifier)
+        return " ".join(identifier)
 
-        for key, validator in self.argument_validators.items():
-            if project is not None:
-                validator.set_project(project)
-            if self.is_default(key):
-                continue
-            try:
-                if not validator(self[key], fallback=False):
-                    try:
-                        self[key] = validator.coerce(self[key])
-                    except Exception as initial_error:
-                        raise ValidationError(
-                            "\n\n{}\n\nValue {} is not valid for attribute {}"
-                            " of {}".format(
-                                "\n".join(
-                                    str(arg) for arg in initial_error.args
-                                ),
-                                self[key], key, identifier,
-                            )
+    def _validate_key(self, key, validator, identifier, project):
+        """Validate value for given key unless it is unchanged since it was
+        last validated"""
+        if project is not None:
+            validator.set_project(project)
+        if self.is_default(key):
+            return
+        if self._validation_hashes is None:
+            self._validation_hashes = {}
+        try:
+            value_hash, dependencies = self._validation_hashes[key]
+        except KeyError:
+            pass
+        else:
+            if (
+                    value_hash == content_hash(self[key]) and
+                    dependencies_unchanged(dependencies)):
+                log_dependencies(dependencies)
+                return
+        start_dependency_log()
+        try:
+            self._validate_value(key, validator, identifier)
+        finally:
+            direct_dependencies = current_dependency_log(direct=True)
+            dependencies = finish_dependency_log()
+        self._validation_hashes[key] = (
+            content_hash(self[key]), dependencies)
+        try:
+            register_dependent = project.register_dependent
+        except AttributeError:
+            pass
+        else:
+            register_dependent(self, direct_dependencies)
+
+    def _validate_value(self, key, validator, identifier):
+        """Validate value for given key, coercing if necessary"""
+        check = compiled_validators(type(self))[key]
+        try:
+            if not check(self[key], fallback=False):
+                try:
+                    self[key] = validator.coerce(self[key])
+                except Exception as initial_error:
+                    raise ValidationError(
+                        "\n\n{}\n\nValue {} is not valid for attribute {}"
+                        " of {}".format(
+                            "\n".join(
+                                str(arg) for arg in initial_error.args
+                            ),
+                            self[key], key, identifier,
                         )
-                    if not validator(self[key], fallback=False):
-                        raise ValidationError(
-                            "\n\nValue {} for attribute {} of {} is not"
-                            " consistent with rest of project".format(
-                                self[key], key, identifier
-                            )
+                    )
+                if not check(self[key], fallback=False):
+                    raise ValidationError(
+                        "\n\nValue {} for attribute {} of {} is not"
+                        " consistent with rest of project".format(
+                            self[key], key, identifier
                         )
-            except ConsistencyError:
-                raise ValidationError(
-                    "\n\nAttribute {} must be set for {}".format(
-                        key, identifier)
-                )
-        return True
+                    )
+        except ConsistencyError:
+            raise ValidationError(
+                "\n\nAttribute {} must be set for {}".format(
+                    key, identifier)
+            )
 
     def toXML(self, parent_root):
         """Store data in W3D XML format within parent_root
@@ -183,3 +554,378 @@ class W3DFeature(dict):
     def is_default(self, key):
         """Return true if value has not been set for key"""
         return key not in self
+
+
+def content_hash(value):
+    """Return hash of value based on its contents
+
+    Unlike the builtin hash, this is defined for lists, dictionaries and
+    features (see :py:meth:`W3DFeature.content_hash`)."""
+    if isinstance(value, W3DFeature):
+        return value.content_hash()
+    if isinstance(value, (list, tuple, SortedList)):
+        return hash(tuple(content_hash(item) for item in value))
+    if isinstance(value, dict):
+        return hash(frozenset(
+            (key, content_hash(item)) for key, item in value.items()))
+    try:
+        return hash((type(value), value))
+    except TypeError:
+        return hash((type(value), repr(value)))
+
+
+_NONE_ORDER, _NUMBER_ORDER, _STRING_ORDER, _TUPLE_ORDER, _LIST_ORDER, \
+    _DICT_ORDER, _FEATURE_ORDER, _OTHER_ORDER = range(8)
+
+
+def canonical_key(value):
+    """Return a tuple which identifies value by its contents and orders it
+    consistently relative to any other value
+
+    Values of different kinds (numbers, strings, lists, features, etc.) are
+    ordered by kind first, so that keys can always be compared. For features,
+    see :py:meth:`W3DFeature.canonical_key`."""
+    if isinstance(value, W3DFeature):
+        return value.canonical_key()
+    if value is None:
+        return (_NONE_ORDER,)
+    if isinstance(value, (bool, int, float)):
+        return (_NUMBER_ORDER, value)
+    if isinstance(value, str):
+        return (_STRING_ORDER, value)
+    if isinstance(value, tuple):
+        return (_TUPLE_ORDER, tuple(canonical_key(item) for item in value))
+    if isinstance(value, (list, SortedList)):
+        return (_LIST_ORDER, tuple(canonical_key(item) for item in value))
+    if isinstance(value, dict):
+        return (_DICT_ORDER, tuple(sorted(
+            (canonical_key(key), canonical_key(item))
+            for key, item in value.items()
+        )))
+    return (_OTHER_ORDER, type(value).__name__, repr(value))
+
+
+def _full_class(value):
+    """Return class of value, treating compact and derived features as
+    instances of the class they stand in for"""
+    return getattr(type(value), "full_class", type(value))
+
+
+class CompactStorage(object):
+    """Mixin for W3DFeature classes created by
+    :py:meth:`W3DFeature.compact_class`
+
+    Values are stored in slots named in _value_slots instead of the
+    underlying dictionary, which is always left empty. All methods of the
+    mapping API are overridden accordingly.
+
+    :cvar full_class: The W3DFeature class from which this class was derived
+    :cvar _value_slots: Dictionary mapping names of arguments to the slots in
+        which their values are stored
+
+    Transient attributes are not given slots: their defaults are read from
+    the class, and an instance dictionary is only created for them once one
+    is set.
+    """
+    __slots__ = ()
+    full_class = None
+    _value_slots = {}
+
+    def __new__(feature_class, *args, **kwargs):
+        feature = dict.__new__(feature_class)
+        # Some versions of Python allocate a hash table for every new
+        # dictionary; clearing it releases the table, which is never used
+        dict.clear(feature)
+        return feature
+
+    def __reduce_ex__(self, protocol):
+        return (
+            _new_compact_feature, (self.full_class,), self.__getstate__(),
+            None, iter(self.items())
+        )
+
+    def __getstate__(self):
+        try:
+            state = self.__dict__.copy()
+        except AttributeError:
+            return None
+        for name in self.transient_attributes:
+            state.pop(name, None)
+        return state or None
+
+    def _store(self, key, value):
+        try:
+            setattr(self, self._value_slots[key], value)
+        except KeyError:
+            raise InvalidArgument(
+                "{} not a valid option for this W3D feature".format(key))
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, self._value_slots[key])
+        except (KeyError, AttributeError):
+            return self.__missing__(key)
+
+    def get(self, key, default=None):
+        try:
+            return getattr(self, self._value_slots[key])
+        except (KeyError, AttributeError):
+            return default
+
+    def __contains__(self, key):
+        try:
+            return getattr(self, self._value_slots[key], _UNSET) is not _UNSET
+        except (KeyError, TypeError):
+            return False
+
+    def __iter__(self):
+        for key, slot in self._value_slots.items():
+            if getattr(self, slot, _UNSET) is not _UNSET:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def keys(self):
+        return KeysView(self)
+
+    def values(self):
+        return ValuesView(self)
+
+    def items(self):
+        return ItemsView(self)
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        delattr(self, self._value_slots[key])
+        self.mark_changed()
+
+    def pop(self, key, default=_UNSET):
+        if key not in self:
+            if default is _UNSET:
+                raise KeyError(key)
+            return default
+        value = getattr(self, self._value_slots[key])
+        del self[key]
+        return value
+
+    def popitem(self):
+        for key in self:
+            return (key, self.pop(key))
+        raise KeyError("popitem(): feature is empty")
+
+    def clear(self):
+        for key in list(self):
+            delattr(self, self._value_slots[key])
+        self.mark_changed()
+
+    def copy(self):
+        return dict(self.items())
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return "< {}: {!r} >".format(
+            type(self).__name__, dict(self.items()))
+
+
+class DerivedStorage(object):
+    """Mixin for W3DFeature classes created by
+    :py:meth:`W3DFeature.derived_class`
+
+    Values set on a derived feature are stored in the underlying dictionary
+    as usual. Any other value is looked up in its template (the feature from
+    which it was derived) and copied on first access if it could be modified
+    in place. Validating a derived feature validates the template (which is
+    remembered as usual) and then only the values stored by the derived
+    feature itself.
+
+    Removing a value which comes from the template first copies all values
+    from the template, after which the feature no longer depends on it.
+
+    :cvar full_class: The W3DFeature class from which this class was derived
+    """
+    __slots__ = ()
+    full_class = None
+
+    def __new__(feature_class, *args, **kwargs):
+        feature = dict.__new__(feature_class)
+        for name in feature_class.transient_attributes:
+            setattr(
+                feature, name, getattr(feature_class.full_class, name, None))
+        return feature
+
+    def __reduce_ex__(self, protocol):
+        # Derived features are stored with all of their values as instances
+        # of their full class
+        return (
+            _new_feature, (self.full_class,), self.__getstate__(),
+            None, iter(self.items())
+        )
+
+    def __getstate__(self):
+        try:
+            state = self.__dict__.copy()
+        except AttributeError:
+            return None
+        for name in self.transient_attributes:
+            state.pop(name, None)
+        return state or None
+
+    def _peek(self, key):
+        """Return value for key without copying it from the template, or
+        _UNSET if no value is set"""
+        value = dict.get(self, key, _UNSET)
+        if value is _UNSET and self._template is not None:
+            return _shared_value(self._template, key)
+        return value
+
+    def _read_only_items(self):
+        return [(key, self._peek(key)) for key in self]
+
+    def __getitem__(self, key):
+        value = dict.get(self, key, _UNSET)
+        if value is not _UNSET:
+            return value
+        if self._template is not None:
+            value = _shared_value(self._template, key)
+            if value is not _UNSET:
+                copied = derived_value(value)
+                if copied is not value:
+                    copied = track(copied, self)
+                    self._store(key, copied)
+                return copied
+        return self.__missing__(key)
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def __contains__(self, key):
+        return self._peek(key) is not _UNSET
+
+    def __iter__(self):
+        yield from dict.__iter__(self)
+        if self._template is not None:
+            for key in self._template:
+                if not dict.__contains__(self, key):
+                    yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def keys(self):
+        return KeysView(self)
+
+    def values(self):
+        return ValuesView(self)
+
+    def items(self):
+        return ItemsView(self)
+
+    def _detach(self):
+        """Copy all values from the template and stop using it"""
+        template = self._template
+        if template is None:
+            return
+        for key in list(template):
+            if not dict.__contains__(self, key):
+                self._store(key, track(
+                    derived_value(_shared_value(template, key)), self))
+        self._template = None
+        template._derived_features.pop(id(self), None)
+
+    def __delitem__(self, key):
+        self._detach()
+        super().__delitem__(key)
+
+    def pop(self, *args):
+        self._detach()
+        return super().pop(*args)
+
+    def popitem(self):
+        self._detach()
+        return super().popitem()
+
+    def clear(self):
+        self._detach()
+        super().clear()
+
+    def copy(self):
+        return dict(self.items())
+
+    def __repr__(self):
+        return "< {}: {!r} >".format(
+            type(self).__name__, dict(self.items()))
+
+    def validate(self, project=None):
+        if self._template is not None:
+            self._template.validate(project=project)
+        identifier = self._identifier()
+        for key in list(dict.keys(self)):
+            self._validate_key(
+                key, self.argument_validators[key], identifier, project)
+        self._validated = True
+        self._dirty_children = None
+        return True
+
+    def validation_errors(self, project=None, keys=None):
+        if keys is None:
+            keys = self.argument_validators.keys()
+        if self._template is None:
+            return super().validation_errors(project=project, keys=keys)
+        inherited = [key for key in keys if not dict.__contains__(self, key)]
+        own = [key for key in keys if dict.__contains__(self, key)]
+        return (
+            self._template.validation_errors(project=project, keys=inherited) +
+            super().validation_errors(project=project, keys=own)
+        )
+
+
+def derived_value(value):
+    """Return a copy of value which may be modified without changing value
+
+    Features are derived from (see :py:meth:`W3DFeature.derive`) rather than
+    copied, and values which cannot be modified in place are returned
+    unchanged."""
+    if isinstance(value, W3DFeature):
+        return value.derive()
+    if isinstance(value, SortedList):
+        return SortedList(
+            [derived_value(item) for item in value], sort_key=value.sort_key)
+    if isinstance(value, list):
+        return [derived_value(item) for item in value]
+    if isinstance(value, tuple):
+        copied = tuple(derived_value(item) for item in value)
+        if all(new is old for new, old in zip(copied, value)):
+            return value
+        return copied
+    if isinstance(value, defaultdict):
+        return defaultdict(value.default_factory, (
+            (key, derived_value(item)) for key, item in value.items()))
+    if isinstance(value, dict):
+        return {key: derived_value(item) for key, item in value.items()}
+    return value
+
+
+def _shared_value(feature, key):
+    """Return value for key from feature without copying it, or _UNSET"""
+    if isinstance(feature, DerivedStorage):
+        return feature._peek(key)
+    return feature.get(key, _UNSET)
+
+
+def _new_feature(feature_class):
+    """Create empty instance of feature_class (used when unpickling derived
+    features)"""
+    return feature_class.__new__(feature_class)
+
+
+def _new_compact_feature(feature_class):
+    """Create empty instance of compact version of feature_class (used when
+    unpickling compact features)"""
+    compact = feature_class.compact_class()
+    return compact.__new__(compact)
@@ -0,0 +1,150 @@
+# Copyright (C) 2016 William Hicks
+#
+# This file is part of Writing3D.
+#
+# Writing3D is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+"""Cache of file system stat results used when validating filenames
+
+Checking whether a file exists can be slow on network file systems, and large
+projects may refer to the same images, models, fonts and sounds many times.
+:py:data:`STAT_CACHE` remembers the result of each check along with the
+modification time of the directory containing the file. Since creating,
+deleting or renaming a file changes the modification time of its directory, a
+cached result is reused for as long as that directory is unchanged. Each
+directory is checked at most once every max_age seconds, so a whole project
+costs one stat call per directory rather than one per reference.
+"""
+import os
+import stat
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_STAT_WORKERS = 16
+
+
+class FileStat(object):
+    """Result of a stat call on a single file
+
+    :param bool isfile: True if file exists and is a regular file
+    :param mtime: Modification time of the file (None if it does not exist)
+    :param directory_mtime: Modification time of the containing directory
+    when the file was checked
+    """
+    __slots__ = ("isfile", "mtime", "directory_mtime")
+
+    def __init__(self, isfile, mtime, directory_mtime):
+        self.isfile = isfile
+        self.mtime = mtime
+        self.directory_mtime = directory_mtime
+
+
+class FileStatCache(object):
+    """Shared cache of the existence and modification times of files
+
+    :param float max_age: Seconds for which the modification time of a
+    directory is trusted before it is checked again
+    """
+
+    def __init__(self, max_age=2.0):
+        self.max_age = max_age
+        self._files = {}
+        self._directories = {}
+
+    def _directory_mtime(self, directory, refresh=False):
+        """Return modification time of directory (None if it does not exist),
+        checking it again if the cached value is older than max_age"""
+        now = time.monotonic()
+        try:
+            mtime, checked = self._directories[directory]
+        except KeyError:
+            refresh = True
+        else:
+            refresh = refresh or now - checked >= self.max_age
+        if refresh:
+            try:
+                mtime = os.stat(directory).st_mtime
+            except OSError:
+                mtime = None
+            self._directories[directory] = (mtime, now)
+        return mtime
+
+    def _stat(self, path):
+        """Check file at absolute path and store result"""
+        directory_mtime = self._directory_mtime(os.path.dirname(path))
+        try:
+            result = os.stat(path)
+        except OSError:
+            entry = FileStat(False, None, directory_mtime)
+        else:
+            entry = FileStat(
+                stat.S_ISREG(result.st_mode), result.st_mtime,
+                directory_mtime)
+        self._files[path] = entry
+        return entry
+
+    def stat(self, filename):
+        """Return :py:class:`FileStat` for filename, using the cached result
+        if the directory containing it has not been modified since"""
+        path = os.path.abspath(filename)
+        entry = self._files.get(path)
+        if (
+                entry is None or
+                entry.directory_mtime != self._directory_mtime(
+                    os.path.dirname(path))):
+            entry = self._stat(path)
+        return entry
+
+    def isfile(self, filename):
+        """Return True if filename is an existing regular file"""
+        return self.stat(filename).isfile
+
+    def getmtime(self, filename):
+        """Return modification time of filename as of the last check, or None
+        if it does not exist"""
+        return self.stat(filename).mtime
+
+    def prefetch(self, filenames, workers=DEFAULT_STAT_WORKERS):
+        """Check all given files in a pool of threads, so that subsequent
+        checks are answered from the cache
+
+        Each directory is checked once before the files within it.
+
+        :param filenames: Iterable of filenames
+        :param int workers: Number of threads used to make stat calls
+        """
+        paths = {os.path.abspath(filename) for filename in filenames}
+        directories = {os.path.dirname(path) for path in paths}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(
+                lambda directory: self._directory_mtime(
+                    directory, refresh=True),
+                directories
+            ))
+            list(executor.map(self._stat, paths))
+
+    def invalidate(self, filename=None):
+        """Forget cached results for filename and its directory, or for all
+        files if filename is None"""
+        if filename is None:
+            self._files.clear()
+            self._directories.clear()
+        else:
+            path = os.path.abspath(filename)
+            self._files.pop(path, None)
+            self._directories.pop(os.path.dirname(path), None)
+
+
+STAT_CACHE = FileStatCache()
+"""Cache used by :py:class:`pyw3d.validators.ValidFile` and its subclasses"""
@@ -0,0 +1,119 @@
+# Copyright (C) 2016 William Hicks
+#
+# This file is part of Writing3D.
+#
+# Writing3D is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+"""Resolve the containment of W3D groups within one another
+
+Groups may contain other groups to any depth. :py:class:`GroupGraph` orders
+the groups of a project so that every group comes after all of the groups it
+contains, and computes the complete list of objects in each group (including
+those in contained groups) once, so that it can be written directly to the
+exported game.
+"""
+from collections import OrderedDict, deque
+from .errors import ConsistencyError
+
+
+class GroupGraph(object):
+    """Graph of containment between groups
+
+    :param groups: Iterable of W3DGroups
+    :raises ConsistencyError: If two groups have the same name, a group
+    contains a group which does not exist or groups contain one another in a
+    cycle
+    """
+
+    def __init__(self, groups):
+        self.groups = OrderedDict()
+        """Maps name of each group to that group"""
+        for group in groups:
+            if group["name"] in self.groups:
+                raise ConsistencyError(
+                    "More than one group is named {}".format(group["name"]))
+            self.groups[group["name"]] = group
+        self.order = self._sort()
+        """Names of all groups, each after all groups it contains"""
+        self._members = {}
+        for name in self.order:
+            members = list(OrderedDict.fromkeys(self.groups[name]["objects"]))
+            seen = set(members)
+            for child in self.groups[name]["groups"]:
+                child_members = self._members[child]
+                if not seen.isdisjoint(child_members):
+                    child_members = [
+                        member for member in child_members
+                        if member not in seen]
+                members.extend(child_members)
+                seen.update(child_members)
+            self._members[name] = tuple(members)
+
+    def _sort(self):
+        """Return names of groups in topological order (contained groups
+        first)"""
+        remaining = {}
+        parents = {name: [] for name in self.groups}
+        for name, group in self.groups.items():
+            children = set(group["groups"])
+            for child in children:
+                try:
+                    parents[child].append(name)
+                except KeyError:
+                    raise ConsistencyError(
+                        "Group {} contains group {}, which does not "
+                        "exist".format(name, child))
+            remaining[name] = len(children)
+
+        ready = deque(
+            name for name, count in remaining.items() if count == 0)
+        order = []
+        while ready:
+            name = ready.popleft()
+            order.append(name)
+            for parent in parents[name]:
+                remaining[parent] -= 1
+                if remaining[parent] == 0:
+                    ready.append(parent)
+
+        if len(order) < len(self.groups):
+            raise ConsistencyError(
+                "Groups contain one another in a cycle: {}".format(
+                    ", ".join(self._cycle(remaining))))
+        return order
+
+    def _cycle(self, remaining):
+        """Return names of groups forming one cycle among groups that could
+        not be sorted"""
+        # Every unsorted group contains at least one unsorted group, so
+        # following those from any of them must eventually repeat
+        name = next(name for name, count in remaining.items() if count)
+        path = OrderedDict()
+        while name not in path:
+            path[name] = None
+            name = next(
+                child for child in self.groups[name]["groups"]
+                if remaining[child])
+        names = list(path)
+        return names[names.index(name):] + [name]
+
+    def sorted_groups(self):
+        """Return list of groups such that every group comes after all
+        groups it contains"""
+        return [self.groups[name] for name in self.order]
+
+    def members(self, name):
+        """Return tuple of names of all objects in the named group, including
+        those in groups it contains, without duplicates"""
+        return self._members[name]
@@ -112,20 +112,32 @@ class W3DGroup(W3DFeature):
                     raise BadW3DXML("Groups node has no name attrib")
         return group
 
-    def blend_objects(self):
-        """Store data on objects in group in Blender script"""
+    def blend_objects(self, object_names=None):
+        """Store data on objects in group in Blender script
+
+        :param object_names: Names of all objects in this group, including
+        those in groups it contains (see
+        :py:meth:`pyw3d.group_graph.GroupGraph.members`). If None, only
+        objects directly in this group are stored, and
+        :py:meth:`blend_groups` must be used to add the rest.
+        """
         group_name = generate_group_name(self["name"])
         script = bpy.data.texts["group_defs.py"]
+        if object_names is None:
+            object_names = self["objects"]
         object_names = [
             generate_blender_object_name(object_) for object_ in
-            self["objects"]
+            object_names
         ]
         script.write("\n{} = {}".format(
             group_name, object_names))
         return script
 
     def blend_groups(self):
-        """Store data on groups in group in Blender script"""
+        """Store data on groups in group in Blender script
+
+        This is only needed if :py:meth:`blend_objects` was called without
+        the complete list of objects in this group."""
         group_name = generate_group_name(self["name"])
         script = bpy.data.texts["group_defs.py"]
         script_text = [""]
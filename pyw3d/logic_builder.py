@@ -0,0 +1,139 @@
+# Copyright (C) 2016 William Hicks
+#
+# This file is part of Writing3D.
+#
+# Writing3D is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+"""Add game properties and logic bricks to Blender objects
+
+Blender offers no data API for creating game properties, sensors,
+controllers or actuators; they can only be added with operators. Used as
+Blender's own interface does, each operator call first needs its object to
+be made active and is given the object by name, which Blender resolves by
+searching every object in the file. The new property or brick must then be
+found by name in turn.
+
+In builder mode (see :py:data:`BUILDER_MODE`), a :py:class:`LogicBuilder`
+instead passes each operator a context override holding the object itself,
+shared by everything added to that object, and takes each new property or
+brick from the end of its list. Neither the active object nor any name
+lookup is involved. A game property which the object already has (as
+objects copied from others do) is reused rather than added again.
+"""
+import logging
+from .build_trace import CountedCall
+LOGGER = logging.getLogger("pyw3d")
+try:
+    import bpy
+    from _bpy import ops as ops_module
+    BPY_OPS_CALL = CountedCall(ops_module.call)
+except ImportError:
+    LOGGER.debug(
+        "Module bpy not found. Loading pyw3d.logic_builder as standalone")
+
+BUILDER_MODE = False
+"""If True, LogicBuilders add properties and bricks through a context
+override rather than the active object and names"""
+
+
+class LogicBuilder(object):
+    """Adds game properties and logic bricks to a single Blender object
+
+    :param blender_object: The object to add properties and bricks to
+    :param bool builder_mode: Use builder mode rather than the active object
+    and names (defaults to :py:data:`BUILDER_MODE`)
+    """
+
+    def __init__(self, blender_object, builder_mode=None):
+        self.blender_object = blender_object
+        if builder_mode is None:
+            builder_mode = BUILDER_MODE
+        self.builder_mode = builder_mode
+        self._context = None
+        if builder_mode:
+            self._context = {
+                "object": blender_object, "active_object": blender_object
+            }
+
+    def activate(self):
+        """Make object active for the operator calls which follow, unless in
+        builder mode, and return it
+
+        Outside builder mode, operators act on the active object, so this
+        must be called before adding to an object which may not be active.
+        """
+        if not self.builder_mode:
+            bpy.context.scene.objects.active = self.blender_object
+        return self.blender_object
+
+    def _add(self, operator, arguments, items, name):
+        """Call operator to add to items of object and return the new item,
+        named name"""
+        if self.builder_mode:
+            BPY_OPS_CALL(operator, self._context, arguments)
+        else:
+            arguments["object"] = self.blender_object.name
+            BPY_OPS_CALL(operator, None, arguments)
+        item = items[-1]
+        if item.name != name:
+            item.name = name
+        if self.builder_mode:
+            return item
+        return items[name]
+
+    def game_property(self, name, property_type, value=None):
+        """Add game property and return it
+
+        Objects copied from others (e.g. models and images, which are loaded
+        once and then copied) may already have a property of the same name.
+        In builder mode, that property is used instead of adding another.
+
+        :param str name: Name of property
+        :param str property_type: Blender type of property (e.g. "BOOL")
+        :param value: Initial value of property (if not None)
+        """
+        properties = self.blender_object.game.properties
+        arguments = {'type': property_type, 'name': name}
+        if not self.builder_mode:
+            BPY_OPS_CALL("object.game_property_new", None, arguments)
+            game_property = properties[name]
+        elif name in properties:
+            game_property = properties[name]
+        else:
+            BPY_OPS_CALL("object.game_property_new", self._context, arguments)
+            game_property = properties[-1]
+        if value is not None:
+            game_property.value = value
+        return game_property
+
+    def sensor(self, sensor_type, name):
+        """Add sensor of given Blender type and return it"""
+        return self._add(
+            "logic.sensor_add", {'type': sensor_type, 'name': name},
+            self.blender_object.game.sensors, name
+        )
+
+    def controller(self, controller_type, name):
+        """Add controller of given Blender type and return it"""
+        return self._add(
+            "logic.controller_add", {'type': controller_type, 'name': name},
+            self.blender_object.game.controllers, name
+        )
+
+    def actuator(self, actuator_type, name):
+        """Add actuator of given Blender type and return it"""
+        return self._add(
+            "logic.actuator_add", {'type': actuator_type, 'name': name},
+            self.blender_object.game.actuators, name
+        )
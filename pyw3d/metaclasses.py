@@ -25,6 +25,8 @@ class SubRegisteredClass(type):
     def __init__(cls, name, bases, attributes):
         if not hasattr(cls, "_subclass_registry"):
             cls._subclass_registry = {}
-        else:
+        elif "full_class" not in attributes:
+            # Compact storage variants of W3DFeature classes share the name
+            # of the class they are derived from, so only register the latter
             cls._subclass_registry[name] = cls
         super(SubRegisteredClass, cls).__init__(name, bases, attributes)
@@ -38,16 +38,26 @@ from .metaclasses import SubRegisteredClass
 from .activators import BlenderClickTrigger
 from .sounds import audio_playback_object
 import logging
+from .build_trace import CountedCall
+from .logic_builder import LogicBuilder
 LOGGER = logging.getLogger("pyw3d")
 try:
     import bpy
     import mathutils
     from _bpy import ops as ops_module
-    BPY_OPS_CALL = ops_module.call
+    BPY_OPS_CALL = CountedCall(ops_module.call)
 except ImportError:
     LOGGER.debug(
         "Module bpy not found. Loading pyw3d.objects as standalone")
 
+SHARED_MESHES = True
+"""If True, objects whose shape, image or text content is structurally equal
+share a single mesh"""
+_MESH_CACHE = {}
+"""Dictionary mapping canonical keys of content to the meshes shared by
+objects with that content in the current build (see
+:py:func:`clear_shared_meshes`)"""
+
 
 def line_count(string):
     """Count lines in string"""
@@ -88,16 +98,79 @@ def set_object_center(blender_object, center_vec):
     )
 
 
-def duplicate_object(original):
-    """Duplicate given object"""
+def duplicate_object(original, linked=False):
+    """Duplicate given object
+
+    :param bool linked: Use the data of the original rather than a copy of
+    it, as for a linked duplicate"""
     new = original.copy()
-    if original.data is not None:
+    if original.data is not None and not linked:
         new.data = original.data.copy()
     new.animation_data_clear()
     bpy.context.scene.objects.link(new)
     return new
 
 
+def is_shared(blender_object):
+    """Return True if the data of object may be used by other objects"""
+    return (
+        blender_object.data is not None and blender_object.data.users > 1)
+
+
+def shared_mesh_object(content, create_object):
+    """Return new Blender object for content, using the same mesh as any
+    object previously created for structurally equal content
+
+    The first object for each content is returned by create_object. Its mesh
+    is given a fake user (so that every object using it, including the first,
+    is seen to share it by :py:func:`is_shared`) and a material slot if it
+    has none, so that each object using it can be given its own material.
+    Later objects are linked duplicates using the same mesh. The fake user
+    is removed by :py:func:`release_shared_meshes` if no object is left
+    using the mesh.
+
+    :param W3DContent content: Content of the object
+    :param create_object: Function creating a new Blender object for content
+    """
+    if not SHARED_MESHES:
+        return create_object()
+    key = content.canonical_key()
+    mesh = _MESH_CACHE.get(key)
+    if mesh is None:
+        new_object = create_object()
+        mesh = new_object.data
+        mesh.use_fake_user = True
+        if not len(mesh.materials):
+            mesh.materials.append(None)
+        _MESH_CACHE[key] = mesh
+    else:
+        new_object = bpy.data.objects.new(mesh.name, mesh)
+        bpy.context.scene.objects.link(new_object)
+    return new_object
+
+
+def release_shared_meshes():
+    """Forget each mesh shared by :py:func:`shared_mesh_object` which no
+    object uses any longer and remove its fake user, so that it is not saved
+    with the .blend file
+
+    Objects which change their mesh (e.g. to recenter it) are given a copy
+    of it, so a shared mesh may be left with no users once every object has
+    been created."""
+    for key, mesh in list(_MESH_CACHE.items()):
+        if mesh.users == 1:  # Only its fake user remains
+            mesh.use_fake_user = False
+            del _MESH_CACHE[key]
+
+
+def clear_shared_meshes():
+    """Forget all meshes shared by :py:func:`shared_mesh_object`
+
+    This must be done at the start of each build, since meshes from an
+    earlier build may have been removed along with the rest of its scene."""
+    _MESH_CACHE.clear()
+
+
 def generate_object_from_model(filename):
     """Generate Blender object from model file"""
     try:
@@ -374,6 +447,8 @@ class W3DContent(W3DFeature, metaclass=SubRegisteredClass):
             return W3DLight.fromXML(content_root)
         if content_root.find("ParticleSystem") is not None:
             return W3DPSys.fromXML(content_root)
+        if content_root.find("Shape") is not None:
+            return W3DShape.fromXML(content_root)
         raise BadW3DXML("No known child node found in Content node")
 
 
@@ -432,6 +507,11 @@ class W3DShape(W3DContent):
         return new_shape
 
     def blend(self):
+        """Create representation of W3DShape in Blender"""
+        return shared_mesh_object(self, self._create_object)
+
+    def _create_object(self):
+        """Create new Blender object with a mesh of this shape"""
         if self["shape_type"] == "Sphere":
             BPY_OPS_CALL(
                 "mesh.primitive_uv_sphere_add", None,
@@ -546,7 +626,15 @@ class W3DText(W3DContent):
             "Content node must contain Text node to create W3DText object")
 
     def blend(self):
-        """Create representation of W3DText in Blender"""
+        """Create representation of W3DText in Blender
+
+        The text, font, depth and alignment determine the mesh of the text,
+        so objects with the same values share a single mesh, which is only
+        laid out and converted from a font curve once"""
+        return shared_mesh_object(self, self._create_object)
+
+    def _create_object(self):
+        """Create new Blender object with a mesh converted from this text"""
         type(self).object_count += 1
         text_content = self["text"].strip()
         new_text_object = add_text_object(
@@ -651,6 +739,10 @@ class W3DImage(W3DContent):
 
     def blend(self):
         """Create representation of W3DImage in Blender"""
+        return shared_mesh_object(self, self._create_object)
+
+    def _create_object(self):
+        """Create new Blender object with a textured plane for this image"""
         BPY_OPS_CALL(
             "mesh.primitive_plane_add", None,
             {'radius': 0.1524}
@@ -956,10 +1048,6 @@ class W3DObject(W3DFeature):
 
     def __init__(self, *args, **kwargs):
         super(W3DObject, self).__init__(*args, **kwargs)
-        self.ui_order = [
-            "name", "visible", "color", "lighting", "scale", "click_through",
-            "around_own_axis", "sound", "placement", "link", "content"
-        ]
         if "placement" not in self:
             self["placement"] = W3DPlacement()
 
@@ -1049,7 +1137,22 @@ class W3DObject(W3DFeature):
 
     def apply_material(self, blender_object):
         """Apply properties of object to material for Blender object"""
-        if not len(blender_object.material_slots):
+        if is_shared(blender_object):
+            # Materials of a shared mesh belong to every object using it, so
+            # this object is given materials of its own
+            for slot in blender_object.material_slots:
+                material = slot.material
+                slot.link = 'OBJECT'
+                if material is None:
+                    material = bpy.data.materials.new(
+                        generate_blender_material_name(self["name"]))
+                    material.game_settings.use_backface_culling = (
+                        not self["double_sided"]
+                    )
+                    slot.material = material
+                else:
+                    slot.material = material.copy()
+        elif not len(blender_object.material_slots):
             blender_object.active_material = bpy.data.materials.new(
                 generate_blender_material_name(self["name"]))
             if blender_object.active_material is not None:
@@ -1094,17 +1197,9 @@ class W3DObject(W3DFeature):
         blender_object.select = True
         bpy.context.scene.objects.active = blender_object
 
-        BPY_OPS_CALL(
-            "object.game_property_new", None,
-            {'type': 'BOOL', 'name': 'visible_tag'}
-        )
-        blender_object.game.properties["visible_tag"].value = self["visible"]
-        BPY_OPS_CALL(
-            "object.game_property_new", None,
-            {'type': 'BOOL', 'name': 'click_through'}
-        )
-        blender_object.game.properties[
-            "click_through"].value = self["click_through"]
+        logic = LogicBuilder(blender_object)
+        logic.game_property("visible_tag", "BOOL", self["visible"])
+        logic.game_property("click_through", "BOOL", self["click_through"])
 
         blender_object.game.physics_type = 'DYNAMIC'
         blender_object.game.use_ghost = True
@@ -1120,6 +1215,10 @@ class W3DObject(W3DFeature):
         blender_object.layers = [layer == 0 for layer in range(20)]
 
         if self["around_own_axis"]:
+            if is_shared(blender_object):
+                # Recentering changes the mesh, so this object needs its own
+                blender_object.data = blender_object.data.copy()
+                blender_object.data.use_fake_user = False
             set_object_center(
                 blender_object, find_object_midpoint(blender_object)
             )
@@ -1127,7 +1226,8 @@ class W3DObject(W3DFeature):
         # TODO: It is *ridiculous* to duplicate every single object to get
         # particle copies. This should be handled smartly in psys.py
         particle_name = generate_blender_particle_name(blender_object.name)
-        particle_copy = duplicate_object(blender_object)
+        particle_copy = duplicate_object(
+            blender_object, linked=is_shared(blender_object))
         particle_copy.name = particle_name
         particle_copy.hide_render = False
         particle_copy.color[3] = 1
@@ -1142,16 +1242,8 @@ class W3DObject(W3DFeature):
         if self["sound"] is not None:
             sound_name = generate_blender_sound_name(self["sound"])
             sound_actuator_name = generate_blender_sound_name(self["name"])
-            BPY_OPS_CALL(
-                "logic.actuator_add", None,
-                {
-                    'type': 'SOUND',
-                    'object': blender_object.name,
-                    'name': sound_actuator_name
-                }
-            )
+            actuator = logic.actuator("SOUND", sound_actuator_name)
             try:
-                actuator = blender_object.game.actuators[sound_actuator_name]
                 central_actuator = audio_playback_object().game.actuators[
                     sound_name]
             except KeyError:
@@ -1326,31 +1418,15 @@ def activate_particles(cont):
         psys_object = bpy.data.objects.new(psys_name, None)
         bpy.context.scene.objects.link(psys_object)
 
-        bpy.context.scene.objects.active = psys_object
-
-        BPY_OPS_CALL(
-            "logic.sensor_add", None,
-            {
-                'type': 'PROPERTY', 'object': psys_object.name,
-                'name': 'visible_sensor'
-            }
-        )
-        psys_object.game.sensors[-1].name = "visible_sensor"
-        visible_sensor = psys_object.game.sensors["visible_sensor"]
+        logic = LogicBuilder(psys_object)
+        logic.activate()
+        visible_sensor = logic.sensor("PROPERTY", "visible_sensor")
         visible_sensor.property = "visible_tag"
         visible_sensor.value = "True"
         visible_sensor.use_pulse_true_level = True
 
-        bpy.context.scene.objects.active = psys_object
-        BPY_OPS_CALL(
-            "logic.controller_add", None,
-            {
-                'type': 'PYTHON', 'object': psys_object.name,
-                'name': 'activate_particles'
-            }
-        )
-        psys_object.game.controllers[-1].name = "activate_particles"
-        controller = psys_object.game.controllers["activate_particles"]
+        logic.activate()
+        controller = logic.controller("PYTHON", "activate_particles")
         controller.mode = "MODULE"
         controller.module = "{}.activate_particles".format(psys_name)
         controller.link(visible_sensor)
@@ -15,7 +15,23 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>
 
-"""Classes for specifying options within W3DProject structure"""
+"""Classes for specifying options within W3DProject structure
+
+A :py:class:`ProjectPath` is a list of specifiers (keys of features and
+dictionaries or indices of lists) leading from a project to one of its
+elements. Paths to elements of lists are created with
+:py:meth:`ProjectPath.create_child_path`, which gives each element a stable
+:py:class:`ElementHandle` in place of a bare index. The handle follows its
+element as others are inserted into or removed from the list through
+:py:meth:`ProjectPath.insert_index_element` and
+:py:meth:`ProjectPath.remove_index_element`, so no path needs to be rewritten
+when its siblings move.
+
+Handles are kept by the list itself (see
+:py:class:`pyw3d.structs.TrackedList`) rather than by each path, so that all
+paths to the same list (however they were created) agree on the handles of
+its elements, and a list which is replaced takes its handles with it.
+"""
 
 
 class PathError(Exception):
@@ -30,29 +46,161 @@ class UnsetValueError(Exception):
         super(UnsetValueError, self).__init__(message)
 
 
+class ElementHandle(object):
+    """Stable identity of an element within a list
+
+    :ivar index: The :py:class:`HandleIndex` this handle belongs to, or None
+    once its element has been removed
+    :ivar position: Position of the element as last numbered by the index
+    """
+
+    __slots__ = ("index", "position")
+
+    def __init__(self, index, position):
+        self.index = index
+        self.position = position
+
+    def resolve(self):
+        """Return current position of element in its list
+
+        :raises UnsetValueError: If element has been removed"""
+        if self.index is None:
+            raise UnsetValueError(
+                "Element {} has been removed".format(self.position))
+        return self.index.position(self)
+
+    def __repr__(self):
+        return "ElementHandle({})".format(self.position)
+
+    def __str__(self):
+        try:
+            return str(self.resolve())
+        except UnsetValueError:
+            return "<removed>"
+
+
+class HandleIndex(object):
+    """Handles for the elements of a single list, in the order of the list
+
+    Inserting or removing a handle only records the first position whose
+    numbering may be out of date. Positions are renumbered from there the
+    next time a handle past that point is resolved, so that any number of
+    edits are followed by at most one pass over the list.
+    """
+
+    def __init__(self):
+        self.handles = []
+        self._stale_from = None
+
+    def _renumber(self):
+        """Bring positions of all handles up to date"""
+        if self._stale_from is not None:
+            for position in range(self._stale_from, len(self.handles)):
+                self.handles[position].position = position
+            self._stale_from = None
+
+    def _mark_stale(self, position):
+        """Record that handles from given position on may be misnumbered"""
+        if self._stale_from is None or position < self._stale_from:
+            self._stale_from = position
+
+    def handle(self, position):
+        """Return handle for element at given position, creating handles up
+        to that position if necessary"""
+        if position >= len(self.handles):
+            self._renumber()
+            self.handles.extend(
+                ElementHandle(self, new_position) for new_position in
+                range(len(self.handles), position + 1)
+            )
+        return self.handles[position]
+
+    def position(self, handle):
+        """Return current position of given handle"""
+        if self._stale_from is not None and \
+                handle.position >= self._stale_from:
+            self._renumber()
+        return handle.position
+
+    def insert(self, position):
+        """Insert a new handle at given position"""
+        if position < len(self.handles):
+            self.handles.insert(position, ElementHandle(self, position))
+            self._mark_stale(position + 1)
+
+    def remove(self, position):
+        """Remove and detach handle at given position"""
+        if position < len(self.handles):
+            self.handles.pop(position).index = None
+            self._mark_stale(position)
+
+
+def _resolve(spec):
+    """Return key or index given by a path specifier"""
+    if isinstance(spec, ElementHandle):
+        return spec.resolve()
+    return spec
+
+
 class ProjectPath(object):
-    """Specifies a location within W3DProject tree"""
+    """Specifies a location within W3DProject tree
 
-    def insert_index_element(self, index, value):
-        """Insert element in list and update indices in path"""
-        self.get_element().insert(index, value)
-        for i in range(index+1, len(self.get_element())):
+    :param project: The project (or other root element) the path starts from
+    :param list path: Specifiers leading from project to the element
+    """
+
+    def _handle_index(self, element=None):
+        """Return HandleIndex for elements of the list specified by this
+        path, which is shared by all paths to that list
+
+        If the list cannot hold its own index (i.e. it is not part of a
+        feature), the index is kept by this path alone.
+
+        :param element: The list specified by this path, if already known
+        """
+        if element is None:
+            element = self.get_element()
+        index = getattr(element, "handles", None)
+        if index is None:
+            index = HandleIndex()
             try:
-                self.get_element()[i].project_path.set_specifier(i+1)
+                element.handles = index
             except AttributeError:
-                pass
+                if self._handles is None:
+                    self._handles = index
+                return self._handles
+        return index
+
+    def insert_index_element(self, index, value):
+        """Insert element in list
+
+        Paths to later elements created from this path are unaffected, since
+        they refer to their elements by handle"""
+        element = self.get_element()
+        if index < 0:
+            index = max(len(element) + index, 0)
+        index = min(index, len(element))
+        element.insert(index, value)
+        self._handle_index(element).insert(index)
 
     def remove_index_element(self, index):
-        """Removes an element from a list within W3DProject tree"""
-        del self.get_element()[index]
-        for i in range(len(self.get_element())):
-            try:
-                self.get_element()[i].project_path.set_specifier(i)
-            except AttributeError:
-                pass
+        """Removes an element from a list within W3DProject tree
+
+        Paths to the removed element become unset; paths to other elements
+        created from this path are unaffected"""
+        element = self.get_element()
+        if index < 0:
+            index += len(element)
+        del element[index]
+        self._handle_index(element).remove(index)
 
     def create_child_path(self, specifier):
-        """Create a new path with given specifier appended"""
+        """Create a new path with given specifier appended
+
+        Non-negative integer specifiers are replaced by the handle of the
+        corresponding list element"""
+        if type(specifier) is int and specifier >= 0:
+            specifier = self._handle_index().handle(specifier)
         new_path = [spec for spec in self.path]
         new_path.append(specifier)
         return ProjectPath(self.project, new_path)
@@ -72,7 +220,7 @@ class ProjectPath(object):
     def get_validator(self):
         """Get the validator for this element"""
         parent_path = self.create_parent_path()
-        parent = self.get_element_parent()
+        parent = parent_path.get_element()
         try:
             validator = parent.argument_validators[self.get_specifier()]
         except AttributeError:
@@ -84,20 +232,21 @@ class ProjectPath(object):
     def del_element(self):
         """Delete the element specified by this path"""
         parent = self.get_element_parent()
-        del parent[self.path[-1]]
+        del parent[self.get_specifier()]
 
     def set_element(self, value):
         """Set the element specified by this path to given value"""
 
         parent = self.get_element_parent()
+        specifier = self.get_specifier()
         try:
-            parent[self.get_specifier()] = value
+            parent[specifier] = value
         except TypeError:
             parent_path = self.create_parent_path()
             parent_path.set_element(parent_path.get_validator().def_value)
             self.set_element(value)
         except IndexError:  # Element not created yet in iterable
-            if self.get_specifier() == len(parent):
+            if specifier == len(parent):
                 parent.append(value)
             else:
                 raise PathError(
@@ -113,6 +262,7 @@ class ProjectPath(object):
             raise UnsetValueError(
                 "Project not set for this path")
         for spec in self.path:
+            spec = _resolve(spec)
             try:
                 element = element[spec]
             except (KeyError, IndexError):
@@ -122,8 +272,8 @@ class ProjectPath(object):
         return element
 
     def get_specifier(self):
-        """Return the last element in path"""
-        return self.path[-1]
+        """Return the last element in path (as a key or index)"""
+        return _resolve(self.path[-1])
 
     def set_specifier(self, new_specifier):
         """Set the last element in path to given value"""
@@ -140,3 +290,4 @@ class ProjectPath(object):
     def __init__(self, project=None, path=[]):
         self.project = project
         self.path = [spec for spec in path]
+        self._handles = None
@@ -24,11 +24,14 @@ from .validators import OptionValidator, ListValidator, IsNumeric, \
 from .errors import BadW3DXML, ConsistencyError
 from .xml_tools import text2tuple
 from .names import generate_relative_to_name
+from .build_trace import CountedCall
 import logging
 LOGGER = logging.getLogger("pyw3d")
 try:
     import bpy
     import mathutils
+    from _bpy import ops as ops_module
+    BPY_OPS_CALL = CountedCall(ops_module.call)
 except ImportError:
     logging.debug(
         "Module bpy not found. Loading pyw3d.objects as standalone")
@@ -257,12 +260,12 @@ class W3DPlacement(W3DFeature):
                     "relative_to"].valid_options) - 1:
             for wall_name, position in wall_positions.items():
                 if wall_name not in ("Camera",):
-                    bpy.ops.object.add(
-                        type="EMPTY",
-                        location=position,
-                        rotation=wall_rotations[wall_name],
-                        layers=[layer == 3 for layer in range(1, 21)]
-                    )
+                    BPY_OPS_CALL("object.add", None, {
+                        'type': "EMPTY",
+                        'location': position,
+                        'rotation': wall_rotations[wall_name],
+                        'layers': [layer == 3 for layer in range(1, 21)]
+                    })
                     place_class.relative_to_objects[
                         wall_name] = bpy.context.object
                     place_class.relative_to_objects[
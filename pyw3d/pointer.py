@@ -20,9 +20,12 @@
 
 import logging
 from .blender_scripts import MOUSE_LOOK_SCRIPT
+from .build_trace import CountedCall
 LOGGER = logging.getLogger("pyw3d")
 try:
     import bpy
+    from _bpy import ops as ops_module
+    BPY_OPS_CALL = CountedCall(ops_module.call)
 except ImportError:
     LOGGER.info(
         "Module bpy not found. Loading pyw3d.pointer as standalone")
@@ -30,39 +33,40 @@ except ImportError:
 
 def setup_mouselook(project):
     bpy.context.scene.objects.active = project.main_camera
-    bpy.ops.logic.sensor_add(
-        type="MOUSE",
-        object=project.main_camera.name,
-        name="Look"
-    )
+    BPY_OPS_CALL("logic.sensor_add", None, {
+        'type': "MOUSE",
+        'object': project.main_camera.name,
+        'name': "Look"
+    })
     project.main_camera.game.sensors[-1].name = "Look"
     sensor = project.main_camera.game.sensors["Look"]
     sensor.mouse_event = "MOVEMENT"
-    bpy.ops.logic.controller_add(
-        type='PYTHON',
-        object=project.main_camera.name,
-        name="Look")
+    BPY_OPS_CALL("logic.controller_add", None, {
+        'type': 'PYTHON',
+        'object': project.main_camera.name,
+        'name': "Look"
+    })
     project.main_camera.game.controllers[-1].name = "Look"
     controller = project.main_camera.game.controllers["Look"]
     controller.mode = "MODULE"
     controller.module = "mouse.look"
     controller.link(sensor=sensor)
-    bpy.ops.logic.actuator_add(
-        type="MOTION",
-        object=project.main_camera.name,
-        name="Look_x"
-    )
+    BPY_OPS_CALL("logic.actuator_add", None, {
+        'type': "MOTION",
+        'object': project.main_camera.name,
+        'name': "Look_x"
+    })
     project.main_camera.game.actuators[-1].name = "Look_x"
     actuator = project.main_camera.game.actuators["Look_x"]
     actuator.mode = "OBJECT_NORMAL"
     actuator.use_local_rotation = True
     controller.link(actuator=actuator)
 
-    bpy.ops.logic.actuator_add(
-        type="MOTION",
-        object=project.main_camera.name,
-        name="Look_y"
-    )
+    BPY_OPS_CALL("logic.actuator_add", None, {
+        'type': "MOTION",
+        'object': project.main_camera.name,
+        'name': "Look_y"
+    })
     project.main_camera.game.actuators[-1].name = "Look_y"
     actuator = project.main_camera.game.actuators["Look_y"]
     actuator.mode = "OBJECT_NORMAL"
@@ -77,20 +81,20 @@ def setup_mouselook(project):
 
 
 def setup_click(project):
-    bpy.ops.logic.sensor_add(
-        type="MOUSE",
-        object=project.main_camera.name,
-        name="Click"
-    )
+    BPY_OPS_CALL("logic.sensor_add", None, {
+        'type': "MOUSE",
+        'object': project.main_camera.name,
+        'name': "Click"
+    })
     project.main_camera.game.sensors[-1].name = "Click"
     click_sensor = project.main_camera.game.sensors["Click"]
     click_sensor.mouse_event = "LEFTCLICK"
 
-    bpy.ops.logic.controller_add(
-        type='PYTHON',
-        object=project.main_camera.name,
-        name="Click"
-    )
+    BPY_OPS_CALL("logic.controller_add", None, {
+        'type': 'PYTHON',
+        'object': project.main_camera.name,
+        'name': "Click"
+    })
     project.main_camera.game.controllers[-1].name = "Click"
     controller = project.main_camera.game.controllers["Click"]
     controller.mode = "MODULE"
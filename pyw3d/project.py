@@ -18,39 +18,201 @@
 """Tools for working with W3D projects
 """
 import xml.etree.ElementTree as ET
-import xml.dom.minidom as minidom
+import io
 import logging
 import math
 import os
+import re
 import sys
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from .features import W3DFeature
 from .placement import W3DPlacement, W3DRotation, convert_to_blender_axes
 from .validators import ListValidator, IsNumeric, OptionValidator,\
-    IsBoolean, FeatureValidator, IsInteger, DictValidator
-from .xml_tools import bool2text, text2tuple, attrib2bool, text2bool
-from .objects import W3DObject
+    IsBoolean, FeatureValidator, IsInteger, DictValidator, option_name
+from .xml_tools import bool2text, text2tuple, attrib2bool, text2bool, \
+    write_pretty_xml, pretty_xml_fragment
+from .objects import W3DObject, clear_shared_meshes, release_shared_meshes
 from .psys import W3DPAction
 from .sounds import W3DSound
 from .timeline import W3DTimeline
 from .groups import W3DGroup
 from .triggers import W3DTrigger
-from .errors import BadW3DXML
+from .errors import BadW3DXML, EBKAC
+from .path import ProjectPath
+from .structs import NameIndex
+from .group_graph import GroupGraph
+from .schema import validate_story, check_story, check_section, \
+    raise_violations
+from .snapshot import dumps_values, loads_section
+from .project_validation import validate_project, SECTION_KEYS
+from .file_stats import STAT_CACHE, DEFAULT_STAT_WORKERS
+from .build_cache import referenced_files
 from .blender_scripts import MOVE_TOGGLE_SCRIPT, ANGLES_SCRIPT
 from .names import generate_light_object_name
 from .pointer import setup_mouselook, setup_click
+from .build_trace import BuildTrace, CountedCall
 LOGGER = logging.getLogger("pyw3d")
 try:
     import bpy
+    from _bpy import ops as ops_module
+    BPY_OPS_CALL = CountedCall(ops_module.call)
 except ImportError:
     LOGGER.debug(
         "Module bpy not found. Loading pyw3d.project as standalone")
 
+PROJECT_SECTIONS = (
+    ("ObjectRoot", "Object", "objects", W3DObject),
+    ("GroupRoot", "Group", "groups", W3DGroup),
+    ("TimelineRoot", "Timeline", "timelines", W3DTimeline),
+    ("SoundRoot", "Sound", "sounds", W3DSound),
+    ("ParticleActionRoot", "ParticleActionList", "particle_actions",
+     W3DPAction),
+    ("EventRoot", "EventTrigger", "trigger_events", W3DTrigger),
+)
+"""Tuples of (section node tag, feature node tag, project key, feature class)
+for each list of top-level features in a W3D XML Story"""
+
+
+class LazySection(object):
+    """Placeholder for a list of top-level project features which have not yet
+    been created from XML
+
+    :param section_root: The XML node (e.g. ObjectRoot) containing the nodes
+    for each feature
+    :type section_root: :class:`xml.etree.ElementTree.Element`
+    :param str child_tag: Tag of the feature nodes within section_root
+    :param feature_class: W3DFeature subclass used to create each feature
+    """
+
+    def __init__(self, section_root, child_tag, feature_class):
+        self.section_root = section_root
+        self.child_tag = child_tag
+        self.feature_class = feature_class
+
+    def __repr__(self):
+        return "< {}: {} {} nodes >".format(
+            type(self).__name__, len(self.section_root.findall(
+                self.child_tag)), self.child_tag)
+
+    def materialize(self):
+        """Create and return list of features from stored XML"""
+        return [
+            self.feature_class.fromXML(child) for child in
+            self.section_root.findall(self.child_tag)
+        ]
+
+
+_SECTION_PATTERNS = tuple(
+    (re.compile(r"<{}[\s>/]".format(root_tag).encode("ascii")),
+     re.compile(r"<{}[\s>/]".format(child_tag).encode("ascii")))
+    for root_tag, child_tag, _, _ in PROJECT_SECTIONS
+)
+"""Compiled patterns matching the start tags of the section node and of each
+feature node for each entry of PROJECT_SECTIONS"""
+_XML_ENCODING = re.compile(rb"<\?xml[^>]*encoding=[\"']([^\"']*)")
+
+
+def _story_layout(data, chunk_size):
+    """Locate the features of each section of a W3D XML document by scanning
+    its bytes for start tags, without parsing it
+
+    Returns a tuple of (skeleton, runs). skeleton is a copy of the document
+    with the content of each section removed. runs is a list of (index into
+    PROJECT_SECTIONS, start, end, first position) for each run of up to
+    chunk_size consecutive feature nodes, where start and end are byte
+    offsets into data and first position is the position of the first
+    feature of the run within its section. Returns None if the document
+    cannot safely be split this way, i.e. if it contains comments, CDATA
+    sections, a DTD or namespace declarations, or is not encoded as UTF-8.
+
+    :param bytes data: Content of W3D XML file
+    :param int chunk_size: Maximum number of features in each run
+    """
+    if data.startswith((b"\xfe\xff", b"\xff\xfe")):
+        return None
+    encoding = _XML_ENCODING.match(
+        data[:256].lstrip(b"\xef\xbb\xbf \t\r\n"))
+    if encoding is not None and encoding.group(1).lower() not in (
+            b"utf-8", b"utf8", b"us-ascii", b"ascii"):
+        return None
+    if b"<!" in data or b"xmlns" in data:
+        return None
+
+    skeleton = []
+    runs = []
+    skeleton_start = 0
+    for index, (root_tag, _, _, _) in enumerate(PROJECT_SECTIONS):
+        root_pattern, child_pattern = _SECTION_PATTERNS[index]
+        section_match = root_pattern.search(data)
+        if section_match is None:
+            continue
+        content_start = data.find(b">", section_match.start()) + 1
+        if data[content_start - 2:content_start] == b"/>":
+            continue
+        content_end = data.find(
+            "</{}".format(root_tag).encode("ascii"), content_start)
+        if content_end < 0:
+            return None
+        starts = [
+            match.start() for match in
+            child_pattern.finditer(data, content_start, content_end)
+        ]
+        if not starts and not data[content_start:content_end].strip():
+            continue
+        boundaries = (
+            [content_start] + starts[chunk_size::chunk_size] + [content_end])
+        for run, (start, end) in enumerate(
+                zip(boundaries[:-1], boundaries[1:])):
+            runs.append((index, start, end, run * chunk_size + 1))
+        skeleton.append(data[skeleton_start:content_start])
+        skeleton_start = content_end
+    skeleton.append(data[skeleton_start:])
+    return b"".join(skeleton), runs
+
+
+def _features_from_file(
+        filename, section_index, start, end, first_position,
+        validate_schema):
+    """Create features from a run of feature nodes in a W3D XML file
+
+    Run in worker processes by :py:meth:`W3DProject.fromXML_parallel`.
+    Returns a tuple of (snapshot bytes holding the list of features, list of
+    schema violations). If any violations are found, no features are
+    created.
+
+    :param str filename: Absolute path of W3D XML file
+    :param int section_index: Index into PROJECT_SECTIONS of the section
+    containing the run
+    :param int start: Byte offset of the start of the run
+    :param int end: Byte offset of the end of the run
+    :param int first_position: Position of first feature within section
+    :param bool validate_schema: If True, check nodes against caveschema.xsd
+    """
+    root_tag, child_tag, _, feature_class = PROJECT_SECTIONS[section_index]
+    with open(filename, "rb") as xml_file:
+        xml_file.seek(start)
+        content = xml_file.read(end - start)
+    section_root = ET.fromstring(b"".join((
+        "<{}>".format(root_tag).encode("ascii"), content,
+        "</{}>".format(root_tag).encode("ascii")
+    )))
+    if validate_schema:
+        violations = check_section(section_root, first_position)
+        if violations:
+            return None, violations
+    return dumps_values({"features": [
+        feature_class.fromXML(child)
+        for child in section_root.findall(child_tag)
+    ]}), []
+
 
 def clear_blender_scene():
     LOGGER.debug("Clearing all objects from Blender scene...")
     for obj in bpy.context.scene.objects:
         obj.select = True
-    bpy.ops.object.delete()
+    BPY_OPS_CALL("object.delete", None, {})
     bpy.data.lamps[-1].name = generate_light_object_name("first")
 
 
@@ -75,26 +237,26 @@ def add_key_movement(
     :param int direction: 0, 1, 2 for x, y, z
     :param float speed: Speed of motion"""
     bpy.context.scene.objects.active = blender_object
-    bpy.ops.logic.sensor_add(
-        type="KEYBOARD",
-        object=blender_object.name,
-        name=move_name
-    )
+    BPY_OPS_CALL("logic.sensor_add", None, {
+        'type': "KEYBOARD",
+        'object': blender_object.name,
+        'name': move_name
+    })
     blender_object.game.sensors[-1].name = move_name
     sensor = blender_object.game.sensors[move_name]
     sensor.key = key
-    bpy.ops.logic.controller_add(
-        type='LOGIC_AND',
-        object=blender_object.name,
-        name=move_name
-    )
+    BPY_OPS_CALL("logic.controller_add", None, {
+        'type': 'LOGIC_AND',
+        'object': blender_object.name,
+        'name': move_name
+    })
     blender_object.game.controllers[-1].name = move_name
     controller = blender_object.game.controllers[move_name]
-    bpy.ops.logic.actuator_add(
-        type="MOTION",
-        object=blender_object.name,
-        name=move_name
-    )
+    BPY_OPS_CALL("logic.actuator_add", None, {
+        'type': "MOTION",
+        'object': blender_object.name,
+        'name': move_name
+    })
     blender_object.game.actuators[-1].name = move_name
     actuator = blender_object.game.actuators[move_name]
     actuator.mode = "OBJECT_NORMAL"
@@ -131,6 +293,16 @@ class W3DProject(W3DFeature):
     #     "allow_movement", "allow_rotation", "background"
     # ]
     ui_order = ["camera_placement"]
+    compact_storage = False
+    transient_attributes = W3DFeature.transient_attributes + (
+        "_reference_names", "_name_indices", "_reference_dependents",
+        "_group_graph", "build_trace")
+    build_trace = None
+    """:py:class:`pyw3d.build_trace.BuildTrace` of most recent build"""
+    _reference_names = None
+    _group_graph = None
+    _name_indices = None
+    _reference_dependents = None
 
     argument_validators = {
         "objects": ListValidator(
@@ -197,6 +369,172 @@ class W3DProject(W3DFeature):
                 LOGGER.setLevel(logging.WARNING)
         super().__setitem__(key, value)
 
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        if isinstance(value, LazySection):
+            LOGGER.debug("Creating {} from XML on first access".format(key))
+            self[key] = value.materialize()
+            value = super().__getitem__(key)
+        return value
+
+    def load_sections(self):
+        """Create features for every section of a lazily loaded project which
+        has not yet been accessed (see :py:meth:`fromXML`)"""
+        for key, value in list(super().items()):
+            if isinstance(value, LazySection):
+                self[key]
+
+    # Anything which exposes values other than through __getitem__ loads
+    # any pending sections first, so that LazySections are never seen
+    # outside of the project
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def items(self):
+        self.load_sections()
+        return super().items()
+
+    def values(self):
+        self.load_sections()
+        return super().values()
+
+    def copy(self):
+        self.load_sections()
+        return super().copy()
+
+    def __eq__(self, other):
+        self.load_sections()
+        if isinstance(other, W3DProject):
+            other.load_sections()
+        return super().__eq__(other)
+
+    def __reduce_ex__(self, protocol):
+        # Used by both pickle and copy.deepcopy
+        self.load_sections()
+        return super().__reduce_ex__(protocol)
+
+    def __repr__(self):
+        self.load_sections()
+        return super().__repr__()
+
+    def mark_changed(self, child=None):
+        """Discard cached XML, content hash, reference names and group graph
+        for this project"""
+        if self._reference_names is not None:
+            self._reference_names = None
+        if self._group_graph is not None:
+            self._group_graph = None
+        super().mark_changed(child=child)
+
+    def reference_names(self, path):
+        """Return set of names by which the elements at given path within
+        this project may be referenced
+
+        For the top-level lists of features (objects, groups, etc.), this is
+        the :py:class:`pyw3d.structs.NameIndex` for that list, which is kept
+        up to date as features are added, removed or renamed. For any other
+        path, the result is a frozenset which is cached until the project is
+        modified.
+
+        :param list path: Specifiers of a ProjectPath within this project
+        """
+        path = tuple(path)
+        if len(path) == 1 and path[0] in SECTION_KEYS:
+            return self.name_index(path[0])
+        if self._reference_names is None:
+            self._reference_names = {}
+        try:
+            return self._reference_names[path]
+        except KeyError:
+            names = frozenset(
+                option_name(option) for option in
+                ProjectPath(self, path).get_element()
+            )
+            self._reference_names[path] = names
+            return names
+
+    def name_index(self, key):
+        """Return :py:class:`pyw3d.structs.NameIndex` of the names of the
+        features in the given top-level list (e.g. "objects")
+
+        The index is created when first requested and then updated along with
+        the list. If the list is replaced, a new index is created for it.
+        """
+        if self._name_indices is None:
+            self._name_indices = {}
+        section = self[key]
+        index = self._name_indices.get(key)
+        if index is None or section.listener is not index:
+            index = NameIndex(
+                section, name_of=option_name,
+                name_removed=partial(self._reference_removed, key))
+            section.listener = index
+            self._name_indices[key] = index
+        return index
+
+    def name_changed(self, feature):
+        """Update name indices after the name of feature is set"""
+        if self._name_indices is not None:
+            for index in self._name_indices.values():
+                index.rename(feature)
+
+    def register_dependent(self, feature, dependencies):
+        """Record that the validity of feature depends on the names of
+        elements of this project, so that it can be marked dirty if any of
+        those names is removed
+
+        :param feature: A feature within this project
+        :param dependencies: Dictionary of dependencies logged while
+        validating one value of feature (see
+        :py:func:`pyw3d.validators.start_dependency_log`)
+        """
+        for validator, value in dependencies:
+            try:
+                path = validator.ref_path.path
+            except AttributeError:
+                continue
+            if len(path) != 1 or path[0] not in SECTION_KEYS:
+                continue
+            if self._reference_dependents is None:
+                self._reference_dependents = {}
+            try:
+                dependents = self._reference_dependents[(path[0], value)]
+            except KeyError:
+                dependents = weakref.WeakValueDictionary()
+                self._reference_dependents[(path[0], value)] = dependents
+            dependents[id(feature)] = feature
+
+    def _reference_removed(self, key, name):
+        """Mark features which referred to name in given list as dirty"""
+        if self._reference_dependents is None:
+            return
+        dependents = self._reference_dependents.pop((key, name), None)
+        if dependents is not None:
+            for feature in list(dependents.values()):
+                feature.mark_dirty()
+
+    def prefetch_files(self, workers=DEFAULT_STAT_WORKERS):
+        """Check every file referenced by this project in a pool of threads,
+        so that validating filenames does not wait on the file system
+
+        :param int workers: Number of threads used to make stat calls
+        """
+        STAT_CACHE.prefetch(
+            referenced_files(self, candidates=True), workers=workers)
+
+    def validation_report(self, workers=1):
+        """Validate every feature in this project, collecting all problems
+        rather than stopping at the first
+
+        :param int workers: Number of worker processes to use (None for one
+        per CPU)
+        :rtype: :py:class:`pyw3d.project_validation.ValidationReport`
+        """
+        return validate_project(self, workers=workers)
+
     def __init__(self, *args, **kwargs):
         self.call_directory = kwargs.pop("call_directory", None)
         if self.call_directory is None:
@@ -273,25 +611,36 @@ class W3DProject(W3DFeature):
     def toXML(self):
         """Store W3DProject as W3D XML tree
         """
+        return self._toXML()
+
+    def _toXML(self, fragments=None):
+        """Store W3DProject as W3D XML tree, reusing cached XML for unchanged
+        top-level features if fragments is given
+
+        :param dict fragments: If not None, each top-level feature (object,
+        timeline, etc.) is stored as an empty placeholder node, and fragments
+        is updated to map that node to the feature's indented XML as it will
+        appear in the output of :py:func:`xml_tools.write_pretty_xml`. This
+        XML is cached on the feature and only regenerated if the feature has
+        changed since the last save.
+        """
         project_root = ET.Element("Story", attrib={"version": "8"})
-        object_root = ET.SubElement(project_root, "ObjectRoot")
-        for object_ in self["objects"]:
-            object_.toXML(object_root)
-        group_root = ET.SubElement(project_root, "GroupRoot")
-        for group in self["groups"]:
-            group.toXML(group_root)
-        timeline_root = ET.SubElement(project_root, "TimelineRoot")
-        for timeline in self["timelines"]:
-            timeline.toXML(timeline_root)
-        sound_root = ET.SubElement(project_root, "SoundRoot")
-        for sound in self["sounds"]:
-            sound.toXML(sound_root)
-        paction_root = ET.SubElement(project_root, "ParticleActionRoot")
-        for paction in self["particle_actions"]:
-            paction.toXML(paction_root)
-        event_root = ET.SubElement(project_root, "EventRoot")
-        for trigger in self["trigger_events"]:
-            trigger.toXML(event_root)
+        for root_tag, child_tag, key, _ in PROJECT_SECTIONS:
+            section_root = ET.SubElement(project_root, root_tag)
+            for feature in self[key]:
+                if fragments is None:
+                    feature.toXML(section_root)
+                elif feature._xml_fragment is not None:
+                    fragments[ET.SubElement(section_root, child_tag)] = \
+                        feature._xml_fragment
+                else:
+                    node_count = len(section_root)
+                    feature.toXML(section_root)
+                    if len(section_root) != node_count + 1:
+                        continue  # Only single nodes are cached
+                    node = section_root[-1]
+                    feature._xml_fragment = pretty_xml_fragment(node, "\t\t")
+                    fragments[node] = feature._xml_fragment
         global_node = ET.SubElement(project_root, "Global")
         camera_node = ET.SubElement(
             global_node, "CameraPos", attrib={
@@ -322,38 +671,47 @@ class W3DProject(W3DFeature):
         return project_root
 
     @classmethod
-    def fromXML(project_class, project_root, call_directory=None):
+    def fromXML(
+            project_class, project_root, call_directory=None, lazy=False,
+            validate_schema=True):
         """Create W3DProject from Story node of W3D XML
 
         :param :py:class:xml.etree.ElementTree.Element project_root
+        :param bool lazy: If True, objects, groups, timelines, sounds,
+        particle actions and triggers are not created until they are first
+        accessed. Until then, each section holds a reference to its
+        unparsed XML node. Comparing, copying or pickling the project, or
+        reading its values other than by key, first creates any sections
+        not yet accessed. Note that file references are validated relative
+        to the working directory at the time of first access.
+        :param bool validate_schema: If True, check the structure of the
+        entire document against caveschema.xsd before creating any features
+        (see :py:mod:`pyw3d.schema`)
+        :raises BadW3DXML: If document does not conform to schema
         """
+        if validate_schema:
+            validate_story(project_root)
         new_project = project_class(call_directory=call_directory)
-        object_root = project_root.find("ObjectRoot")
-        if object_root is not None:
-            for child in object_root.findall("Object"):
-                new_project["objects"].append(W3DObject.fromXML(child))
-        group_root = project_root.find("GroupRoot")
-        if group_root is not None:
-            for child in group_root.findall("Group"):
-                new_project["groups"].append(W3DGroup.fromXML(child))
-        timeline_root = project_root.find("TimelineRoot")
-        if timeline_root is not None:
-            for child in timeline_root.findall("Timeline"):
-                new_project["timelines"].append(W3DTimeline.fromXML(child))
-        sound_root = project_root.find("SoundRoot")
-        if sound_root is not None:
-            for child in sound_root.findall("Sound"):
-                new_project["sounds"].append(W3DSound.fromXML(child))
-        paction_root = project_root.find("ParticleActionRoot")
-        if paction_root is not None:
-            for child in paction_root.findall("ParticleActionList"):
-                new_project["particle_actions"].append(
-                    W3DPAction.fromXML(child))
-        trigger_root = project_root.find("EventRoot")
-        if trigger_root is not None:
-            for child in trigger_root.findall("EventTrigger"):
-                new_project["trigger_events"].append(W3DTrigger.fromXML(child))
+        for root_tag, child_tag, key, feature_class in PROJECT_SECTIONS:
+            section_root = project_root.find(root_tag)
+            if section_root is None:
+                continue
+            if lazy:
+                dict.__setitem__(
+                    new_project, key,
+                    LazySection(section_root, child_tag, feature_class)
+                )
+            else:
+                for child in section_root.findall(child_tag):
+                    new_project[key].append(feature_class.fromXML(child))
+        new_project._globals_fromXML(project_root)
+        return new_project
+
+    def _globals_fromXML(self, project_root):
+        """Read global settings and wall placements from Story node
 
+        :param :py:class:xml.etree.ElementTree.Element project_root
+        """
         global_root = project_root.find("Global")
         if global_root is None:
             raise BadW3DXML("Story root has no Global node")
@@ -362,28 +720,28 @@ class W3DProject(W3DFeature):
         if camera_node is None:
             raise BadW3DXML("Global node has no CaveCameraPos child")
         if "far-clip" in camera_node.attrib:
-            new_project["far_clip"] = float(camera_node.attrib["far-clip"])
+            self["far_clip"] = float(camera_node.attrib["far-clip"])
         place_node = camera_node.find("Placement")
         if camera_node is None:
             raise BadW3DXML("CameraPos node has no Placement child")
-        new_project["camera_placement"] = W3DPlacement.fromXML(place_node)
+        self["camera_placement"] = W3DPlacement.fromXML(place_node)
 
         camera_node = global_root.find("CameraPos")
         if camera_node is None:
             raise BadW3DXML("Global node has no CameraPos child")
         if "far-clip" in camera_node.attrib:
-            new_project["far_clip"] = float(camera_node.attrib["far-clip"])
+            self["far_clip"] = float(camera_node.attrib["far-clip"])
         place_node = camera_node.find("Placement")
         if camera_node is None:
             raise BadW3DXML("CameraPos node has no Placement child")
-        new_project["desktop_camera_placement"] = W3DPlacement.fromXML(
+        self["desktop_camera_placement"] = W3DPlacement.fromXML(
             place_node)
 
         bg_node = global_root.find("Background")
         if bg_node is None:
             raise BadW3DXML("Global node has no Background child")
         if "color" in bg_node.attrib:
-            new_project["background"] = text2tuple(
+            self["background"] = text2tuple(
                 bg_node.attrib["color"],
                 evaluator=int
             )
@@ -391,17 +749,17 @@ class W3DProject(W3DFeature):
         wand_node = global_root.find("WandNavigation")
         if wand_node is None:
             raise BadW3DXML("Global node has no WandNavigation child")
-        new_project["allow_rotation"] = attrib2bool(
+        self["allow_rotation"] = attrib2bool(
             wand_node, "allow-rotation", default=False)
-        new_project["allow_movement"] = attrib2bool(
+        self["allow_movement"] = attrib2bool(
             wand_node, "allow-movement", default=False)
 
         debug_node = global_root.find("Debug")
         if debug_node is not None:
-            new_project["debug"] = text2bool(debug_node.text)
+            self["debug"] = text2bool(debug_node.text)
         profile_node = global_root.find("Profile")
         if profile_node is not None:
-            new_project["profile"] = text2bool(profile_node.text)
+            self["profile"] = text2bool(profile_node.text)
 
         wall_root = project_root.find("PlacementRoot")
         for placement in wall_root.findall("Placement"):
@@ -410,48 +768,194 @@ class W3DProject(W3DFeature):
             except KeyError:
                 raise BadW3DXML(
                     "Placements within PlacementRoot must specify name")
-            new_project["wall_placements"][
+            self["wall_placements"][
                 wall_name] = W3DPlacement.fromXML(placement)
-        return new_project
+        return self
 
     @classmethod
-    def fromXML_file(project_class, filename):
+    def fromXML_file(
+            project_class, filename, streaming=False, lazy=False,
+            validate_schema=True, workers=None):
         """Create W3DProject from XML file of given filename
 
         :param str filename: Filename of XML file for project
+        :param bool streaming: If True, build features incrementally as the
+        file is parsed rather than loading the entire document first (see
+        :py:meth:`fromXML_stream`)
+        :param bool lazy: If True, defer creation of each section of the
+        project until it is first accessed (see :py:meth:`fromXML`)
+        :param bool validate_schema: If True, check the structure of the
+        document against caveschema.xsd before creating any features. Since
+        the document is never held in memory as a whole, this check is not
+        made when streaming.
+        :param int workers: If given, parse the file and create features in
+        this many worker processes (see :py:meth:`fromXML_parallel`)
         """
+        if sum((streaming, lazy, workers is not None)) > 1:
+            raise EBKAC(
+                "Only one of streaming, lazy or parallel loading may be used")
         # For relative paths...
         call_directory = os.path.normpath(os.path.dirname(filename))
+        if streaming:
+            return project_class.fromXML_stream(filename, call_directory)
+        if workers is not None:
+            return project_class.fromXML_parallel(
+                filename, call_directory, workers=workers,
+                validate_schema=validate_schema)
         return project_class.fromXML(
-            ET.parse(filename).getroot(), call_directory)
+            ET.parse(filename).getroot(), call_directory, lazy=lazy,
+            validate_schema=validate_schema)
+
+    @classmethod
+    def fromXML_parallel(
+            project_class, filename, call_directory=None, workers=None,
+            chunk_size=500, validate_schema=True):
+        """Create W3DProject from XML file using a pool of worker processes
+
+        The file is scanned for the start tags of feature nodes (without
+        being parsed) and split into runs of up to chunk_size features. Each
+        worker reads its runs directly from the file, checks them against
+        the schema, creates their features and returns them as a snapshot
+        (see :py:mod:`pyw3d.snapshot`), so that they are not validated
+        again when they are decoded. The parent process parses only the
+        document with its sections emptied, for global settings and wall
+        placements, and decodes results in document order as they arrive.
+
+        Decoding results is not parallelized and costs roughly two thirds of
+        the time taken to create the same features from XML, so this is
+        slower than :py:meth:`fromXML` with a single CPU and at best about
+        twice as fast with many (see benchmarks/parallel_loading.py).
+        Documents which cannot safely be split without parsing (see
+        :py:func:`_story_layout`) are loaded sequentially.
+
+        :param str filename: Filename of XML file for project
+        :param int workers: Maximum number of worker processes (defaults to
+        number of CPUs)
+        :param int chunk_size: Maximum number of features created by each
+        task
+        :param bool validate_schema: If True, check the structure of the
+        document against caveschema.xsd before adding any features
+        :raises BadW3DXML: If document does not conform to schema
+        """
+        # Workers are started after project creation changes the working
+        # directory, so that they resolve relative paths in the same way
+        filename = os.path.abspath(filename)
+        with open(filename, "rb") as xml_file:
+            data = xml_file.read()
+        layout = _story_layout(data, chunk_size)
+        if layout is None:
+            LOGGER.debug(
+                "{} cannot be split without parsing; loading it"
+                " sequentially".format(filename))
+            return project_class.fromXML(
+                ET.fromstring(data), call_directory,
+                validate_schema=validate_schema)
+        skeleton, runs = layout
+        del data
+        project_root = ET.fromstring(skeleton)
+        violations = check_story(project_root) if validate_schema else []
+
+        new_project = project_class(call_directory=call_directory)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                (PROJECT_SECTIONS[section_index][2], executor.submit(
+                    _features_from_file, filename, section_index, start,
+                    end, first_position, validate_schema))
+                for section_index, start, end, first_position in runs
+            ]
+            for key, future in futures:
+                snapshot, run_violations = future.result()
+                if run_violations or violations:
+                    violations.extend(run_violations)
+                    continue
+                for feature in loads_section(snapshot, "features"):
+                    new_project[key].append(feature)
+        raise_violations(violations)
+        new_project._globals_fromXML(project_root)
+        return new_project
+
+    @classmethod
+    def fromXML_stream(project_class, filename, call_directory=None):
+        """Create W3DProject from XML file using an incremental parser
+
+        Each object, group, timeline, sound, particle action and trigger is
+        created as soon as its closing tag has been parsed, after which its
+        XML node is cleared. Peak memory use is therefore bounded by the
+        largest single feature rather than by the size of the document.
+
+        :param str filename: Filename of XML file for project
+        """
+        # Project creation changes the working directory
+        filename = os.path.abspath(filename)
+        new_project = project_class(call_directory=call_directory)
+        sections = {
+            root_tag: (child_tag, key, feature_class) for
+            root_tag, child_tag, key, feature_class in PROJECT_SECTIONS
+        }
+        ancestors = []
+        for event, node in ET.iterparse(filename, events=("start", "end")):
+            if event == "start":
+                ancestors.append(node)
+                continue
+            ancestors.pop()
+            if len(ancestors) == 2:
+                section_root = ancestors[1]
+                try:
+                    child_tag, key, feature_class = sections[
+                        section_root.tag]
+                except KeyError:
+                    continue
+                if node.tag == child_tag:
+                    new_project[key].append(feature_class.fromXML(node))
+                    node.clear()
+                    section_root.remove(node)
+            elif len(ancestors) == 0:
+                project_root = node
+        new_project._globals_fromXML(project_root)
+        return new_project
 
     def toprettyxml(self):
-        tree = self.toXML()
-        xml_string = ET.tostring(tree, encoding="unicode")
-        xml_string = minidom.parseString(xml_string).toprettyxml()
-        # WARNING: Need to make sure that this doesn't miss up paragraphs of
-        # text
-        xml_string = "\n".join(
-            [line for line in xml_string.split("\n") if line.strip()])
-        return xml_string
+        """Return project as indented W3D XML string"""
+        return self.write_prettyxml(io.StringIO()).getvalue()
+
+    def write_prettyxml(self, file_):
+        """Write project as indented W3D XML to given file object
+
+        Only top-level features which have changed since the last time the
+        project was written are serialized again.
+
+        :param file_: File-like object to write to
+        """
+        fragments = {}
+        return write_pretty_xml(
+            self._toXML(fragments=fragments), file_, fragments=fragments)
 
     def save_XML(self, filename):
         with open(filename, "w") as file_:
-            file_.write(self.toprettyxml())
+            self.write_prettyxml(file_)
+
+    def group_graph(self):
+        """Return :py:class:`pyw3d.group_graph.GroupGraph` of the groups in
+        this project
+
+        The graph is cached until the project is modified.
+
+        :raises ConsistencyError: If groups contain one another in a cycle
+        """
+        if self._group_graph is None:
+            self._group_graph = GroupGraph(self["groups"])
+        return self._group_graph
 
     def sort_groups(self):
-        """Sort groups such that no group contains a later group"""
-        new_groups = []
-        while len(self["groups"]):
-            group = self["groups"].pop()
-            cur_len = len(new_groups)
-            for i in range(cur_len):
-                if group["name"] in new_groups[i]["groups"]:
-                    new_groups.insert(i, group)
-                    break
-            if cur_len == len(new_groups):
-                new_groups.append(group)
-        self["groups"] = new_groups
+        """Sort groups such that no group contains a later group
+
+        :raises ConsistencyError: If groups contain one another in a cycle
+        """
+        sorted_groups = self.group_graph().sorted_groups()
+        if any(
+                old is not new
+                for old, new in zip(self["groups"], sorted_groups)):
+            self["groups"] = sorted_groups
 
     def setup_controls(self):
         self.add_move_toggle()
@@ -470,18 +974,20 @@ class W3DProject(W3DFeature):
         return script
 
     def setup_camera(self):
-        bpy.ops.object.camera_add(rotation=(math.pi / 2, 0, 0))
+        BPY_OPS_CALL("object.camera_add", None, {
+            'rotation': (math.pi / 2, 0, 0)
+        })
         bpy.data.cameras[-1].clip_end = self["far_clip"]
         # TODO: Does this need to be converted to meters?
         self.main_camera = bpy.context.object
         self.main_camera.name = "CAMERA"
         self.main_camera.layers = [layer == 1 for layer in range(1, 21)]
         self["desktop_camera_placement"].place(self.main_camera)
-        bpy.ops.object.add(
-            type="EMPTY",
-            location=(0, 0, 0),
-            layers=[layer == 3 for layer in range(1, 21)]
-        )
+        BPY_OPS_CALL("object.add", None, {
+            'type': "EMPTY",
+            'location': (0, 0, 0),
+            'layers': [layer == 3 for layer in range(1, 21)]
+        })
         vr_center = bpy.context.object
         vr_center.name = "VRCENTER"
         self.main_camera.parent = vr_center
@@ -509,25 +1015,26 @@ class W3DProject(W3DFeature):
 
     def add_move_toggle(self):
         bpy.context.scene.objects.active = self.main_camera
-        bpy.ops.logic.controller_add(
-            type='PYTHON',
-            object=self.main_camera.name,
-            name="move_toggle")
+        BPY_OPS_CALL("logic.controller_add", None, {
+            'type': 'PYTHON',
+            'object': self.main_camera.name,
+            'name': "move_toggle"
+        })
         self.main_camera.game.controllers[-1].name = "move_toggle"
         controller = self.main_camera.game.controllers["move_toggle"]
         controller.mode = "MODULE"
         controller.module = "move.move_toggle"
 
-        bpy.ops.object.game_property_new(
-            type="BOOL",
-            name="toggle_movement"
-        )
+        BPY_OPS_CALL("object.game_property_new", None, {
+            'type': "BOOL",
+            'name': "toggle_movement"
+        })
         self.main_camera.game.properties["toggle_movement"].value = False
-        bpy.ops.logic.sensor_add(
-            type="KEYBOARD",
-            object=self.main_camera.name,
-            name="toggle_movement"
-        )
+        BPY_OPS_CALL("logic.sensor_add", None, {
+            'type': "KEYBOARD",
+            'object': self.main_camera.name,
+            'name': "toggle_movement"
+        })
         self.main_camera.game.sensors[-1].name = "toggle_movement"
         sensor = self.main_camera.game.sensors["toggle_movement"]
         sensor.key = "TAB"
@@ -538,22 +1045,111 @@ class W3DProject(W3DFeature):
 
         controller.link(sensor=sensor)
 
-    def blend(self):
-        """Create representation of W3DProject in Blender"""
+    def blend(self, trace=None):
+        """Create representation of W3DProject in Blender
+
+        The time, operator calls and objects created by each phase of the
+        build and each feature within it are recorded in a
+        :py:class:`pyw3d.build_trace.BuildTrace`, which is kept as
+        build_trace. If profile is set, the trace is also written to
+        build_trace.json in the Chrome trace event format, along with a
+        cProfile dump in profile.out.
+
+        :param BuildTrace trace: Trace to record the build in (a new one is
+        created if None)
+        """
         # if self["debug"]:
         #     LOGGER.debug("Validating project")
         #     self.validate(project=self)
         #     LOGGER.debug("Project validation complete")
+        if trace is None:
+            trace = BuildTrace()
+        self.build_trace = trace
         if self["profile"]:
             import cProfile
             cProfile.runctx(
-                'self._blend()', {}, {"self": self}, "profile.out"
+                'self._blend(trace)', {}, {"self": self, "trace": trace},
+                "profile.out"
             )
+            trace.write("build_trace.json", trace_format="chrome")
+            LOGGER.info("Build trace:\n{}".format(trace.report()))
         else:
-            self._blend()
+            self._blend(trace)
+
+    def _blend(self, trace):
+        with trace.phase("setup"):
+            self._blend_setup()
+
+        # Create assets
+        with trace.phase("sounds"):
+            for sound in self["sounds"]:
+                with trace.feature(sound):
+                    sound.blend()
+
+        # Create Objects
+        with trace.phase("group scripts"):
+            group_graph = self.group_graph()
+            for group in self["groups"]:
+                with trace.feature(group):
+                    group.blend_objects(
+                        object_names=group_graph.members(group["name"]))
+        with trace.phase("objects"):
+            for object_ in self["objects"]:
+                with trace.feature(object_):
+                    object_.blend()
+            release_shared_meshes()
+            bpy.context.scene.update()
+
+        # Create particle action logic
+        with trace.phase("particle actions"):
+            for paction in self["particle_actions"]:
+                with trace.feature(paction):
+                    paction.blend()
 
-    def _blend(self):
+        # Create Activators
+        with trace.phase("activators"):
+            for timeline in self["timelines"]:
+                with trace.feature(timeline):
+                    timeline.blend()
+            for trigger in self["trigger_events"]:
+                with trace.feature(trigger):
+                    trigger.blend()
+        # Write any necessary game engine logic for Activators
+        with trace.phase("logic"):
+            for timeline in self["timelines"]:
+                with trace.feature(timeline):
+                    timeline.write_blender_logic()
+            for object_ in self["objects"]:
+                if object_["link"] is not None:
+                    with trace.feature(object_["link"], object_["name"]):
+                        object_["link"].write_blender_logic()
+            for trigger in self["trigger_events"]:
+                with trace.feature(trigger):
+                    trigger.write_blender_logic()
+        # Link game engine logic bricks for Activators
+        with trace.phase("linking"):
+            for timeline in self["timelines"]:
+                with trace.feature(timeline):
+                    timeline.link_blender_logic()
+            for object_ in self["objects"]:
+                if object_["link"] is not None:
+                    with trace.feature(object_["link"], object_["name"]):
+                        object_["link"].link_blender_logic()
+            for trigger in self["trigger_events"]:
+                with trace.feature(trigger):
+                    trigger.link_blender_logic()
+
+        with trace.phase("layout"):
+            bpy.context.scene.update()
+            setup_blender_layout()
+        with trace.phase("pack"):
+            BPY_OPS_CALL("file.pack_all", None, {})
+
+    def _blend_setup(self):
+        """Prepare Blender scene, camera, controls and scripts for the
+        features of the project"""
         clear_blender_scene()
+        clear_shared_meshes()
         bpy.data.scenes["Scene"].game_settings.physics_gravity = 0
         bpy.data.scenes["Scene"].game_settings.material_mode = "GLSL"
         bpy.data.scenes["Scene"].layers = [
@@ -574,46 +1170,3 @@ class W3DProject(W3DFeature):
         # bpy.data.worlds["World"].ambient_color = [
         #     value / 255.0 for value in self["background"]
         # ]
-
-        # Create assets
-        for sound in self["sounds"]:
-            sound.blend()
-
-        # Create Objects
-        for group in self["groups"]:
-            group.blend_objects()
-        for group in self["groups"]:
-            group.blend_groups()
-        for object_ in self["objects"]:
-            object_.blend()
-        bpy.context.scene.update()
-
-        # Create particle action logic
-        for paction in self["particle_actions"]:
-            paction.blend()
-
-        # Create Activators
-        for timeline in self["timelines"]:
-            timeline.blend()
-        for trigger in self["trigger_events"]:
-            trigger.blend()
-        # Write any necessary game engine logic for Activators
-        for timeline in self["timelines"]:
-            timeline.write_blender_logic()
-        for object_ in self["objects"]:
-            if object_["link"] is not None:
-                object_["link"].write_blender_logic()
-        for trigger in self["trigger_events"]:
-            trigger.write_blender_logic()
-        # Link game engine logic bricks for Activators
-        for timeline in self["timelines"]:
-            timeline.link_blender_logic()
-        for object_ in self["objects"]:
-            if object_["link"] is not None:
-                object_["link"].link_blender_logic()
-        for trigger in self["trigger_events"]:
-            trigger.link_blender_logic()
-
-        bpy.context.scene.update()
-        setup_blender_layout()
-        bpy.ops.file.pack_all()
@@ -0,0 +1,234 @@
+# Copyright (C) 2016 William Hicks
+#
+# This file is part of Writing3D.
+#
+# Writing3D is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+"""Validate an entire W3D project, reporting every problem found
+
+Unlike :py:meth:`pyw3d.features.W3DFeature.validate`, which stops at the first
+invalid value, :py:func:`validate_project` checks every top-level feature of a
+project (objects, groups, timelines, sounds, particle actions and triggers) as
+well as the global settings of the project, and collects all errors along
+with the :py:class:`pyw3d.path.ProjectPath` of the invalid value. Features
+may optionally be validated in a pool of worker processes, each of which
+receives a snapshot of the whole project so that references between features
+can be checked.
+"""
+import logging
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from .errors import ValidationError
+from .path import ProjectPath
+from .snapshot import dumps_project, loads_project
+LOGGER = logging.getLogger("pyw3d")
+
+SECTION_KEYS = (
+    "objects", "groups", "timelines", "sounds", "particle_actions",
+    "trigger_events"
+)
+"""Project keys of the lists of top-level features, in validation order"""
+GLOBALS_SECTION = "globals"
+
+
+class ValidationIssue(object):
+    """A single invalid value found in a project
+
+    :param path: Location of the invalid value within the project
+    :type path: :py:class:`pyw3d.path.ProjectPath`
+    :param str message: Description of the problem
+    """
+
+    def __init__(self, path, message):
+        self.path = path
+        self.message = message
+
+    def location(self):
+        """Return location of invalid value as a string (e.g.
+        objects/3/placement)"""
+        return "/".join(str(spec) for spec in self.path.path)
+
+    def __repr__(self):
+        return "< {}: {} >".format(type(self).__name__, self.location())
+
+    def __str__(self):
+        return "{}: {}".format(self.location(), self.message.strip())
+
+
+class ValidationReport(object):
+    """Result of validating an entire project
+
+    :ivar list issues: :py:class:`ValidationIssue` for each invalid value, in
+    the order in which they appear in the project
+    :ivar dict section_times: Maps each section (and "globals") to the time
+    in s spent validating it. When validating in worker processes, this is
+    the total time spent across all workers.
+    :ivar dict section_counts: Maps each section to the number of features
+    validated
+    :ivar float total_time: Wall time in s for the entire validation
+    """
+
+    def __init__(self):
+        self.issues = []
+        self.section_times = OrderedDict()
+        self.section_counts = OrderedDict()
+        self.total_time = 0
+
+    @property
+    def valid(self):
+        """True if no problems were found"""
+        return not self.issues
+
+    def raise_errors(self):
+        """Raise a single ValidationError listing every problem found
+
+        :raises ValidationError: If any problems were found"""
+        if self.issues:
+            raise ValidationError("\n\n{} problems found:\n{}".format(
+                len(self.issues),
+                "\n".join(str(issue) for issue in self.issues)))
+
+    def summary(self):
+        """Return timing breakdown and number of problems as a string"""
+        lines = ["{:>18} {:>8} {:>10}".format(
+            "section", "features", "time (s)")]
+        for section, section_time in self.section_times.items():
+            lines.append("{:>18} {:>8} {:10.3f}".format(
+                section, self.section_counts.get(section, ""), section_time))
+        lines.append("{:>18} {:>8} {:10.3f}".format(
+            "total", "", self.total_time))
+        lines.append("{} problems found".format(len(self.issues)))
+        return "\n".join(lines)
+
+
+def _feature_issues(target_project, path, feature):
+    """Validate feature and return list of (path specifiers, message) for each
+    invalid value"""
+    return [
+        (path + [key], "\n".join(str(arg) for arg in error.args))
+        for key, error in feature.validation_errors(project=target_project)
+    ]
+
+
+def _global_issues(target_project):
+    """Validate settings of project which are not in any section"""
+    keys = [
+        key for key in target_project.argument_validators
+        if key not in SECTION_KEYS
+    ]
+    return [
+        ([key], "\n".join(str(arg) for arg in error.args))
+        for key, error in target_project.validation_errors(
+            project=target_project, keys=keys)
+    ]
+
+
+def _validate_shard(project_snapshot, shard):
+    """Validate a subset of the top-level features of a project
+
+    This is run in worker processes by :py:func:`validate_project`.
+
+    :param bytes project_snapshot: Snapshot of the entire project
+    :param list shard: (section key, index) of each feature to validate
+    :return: Tuple of list of (path specifiers, message) for each problem
+    found and a dictionary mapping section keys to time spent
+    """
+    target_project = loads_project(project_snapshot)
+    issues = []
+    section_times = {}
+    for key, index in shard:
+        start_time = time.perf_counter()
+        issues.extend(_feature_issues(
+            target_project, [key, index], target_project[key][index]))
+        section_times[key] = section_times.get(key, 0) + (
+            time.perf_counter() - start_time)
+    return issues, section_times
+
+
+def validate_project(target_project, workers=1):
+    """Validate every feature in project and return a
+    :py:class:`ValidationReport`
+
+    :param target_project: The project to validate
+    :type target_project: :py:class:`pyw3d.project.W3DProject`
+    :param int workers: Number of worker processes among which top-level
+    features are divided. If 1, features are validated in this process, and
+    successful validation is remembered by each feature as with
+    :py:meth:`pyw3d.features.W3DFeature.validate`; files referenced by the
+    project are first checked together with
+    :py:meth:`pyw3d.project.W3DProject.prefetch_files`. If None, the number
+    of CPUs is used.
+    """
+    start_time = time.perf_counter()
+    report = ValidationReport()
+    for key in SECTION_KEYS:
+        report.section_times[key] = 0
+        report.section_counts[key] = len(target_project[key])
+
+    if workers == 1:
+        target_project.prefetch_files()
+        raw_issues = []
+        for key in SECTION_KEYS:
+            section_start = time.perf_counter()
+            for index, feature in enumerate(target_project[key]):
+                raw_issues.extend(
+                    _feature_issues(target_project, [key, index], feature))
+            report.section_times[key] = time.perf_counter() - section_start
+    else:
+        raw_issues = _validate_in_pool(target_project, workers, report)
+
+    globals_start = time.perf_counter()
+    raw_issues.extend(_global_issues(target_project))
+    report.section_times[GLOBALS_SECTION] = (
+        time.perf_counter() - globals_start)
+
+    report.issues = [
+        ValidationIssue(ProjectPath(target_project, path), message)
+        for path, message in raw_issues
+    ]
+    report.total_time = time.perf_counter() - start_time
+    LOGGER.debug("Validated project:\n{}".format(report.summary()))
+    return report
+
+
+def _validate_in_pool(target_project, workers, report):
+    """Validate top-level features in pool of worker processes and return
+    list of (path specifiers, message) in project order"""
+    if workers is None:
+        workers = os.cpu_count() or 1
+    features = [
+        (key, index) for key in SECTION_KEYS
+        for index in range(len(target_project[key]))
+    ]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # One shard per worker, so that the project snapshot is sent to each
+        # worker only once; interleaving balances the sections between them
+        project_snapshot = dumps_project(target_project)
+        results = [
+            executor.submit(
+                _validate_shard, project_snapshot, features[start::workers]
+            ) for start in range(workers)
+        ]
+        raw_issues = []
+        for result in results:
+            shard_issues, section_times = result.result()
+            raw_issues.extend(shard_issues)
+            for key, section_time in section_times.items():
+                report.section_times[key] += section_time
+    section_order = {key: order for order, key in enumerate(SECTION_KEYS)}
+    raw_issues.sort(
+        key=lambda issue: (section_order[issue[0][0]], issue[0][1]))
+    return raw_issues
@@ -0,0 +1,551 @@
+# Copyright (C) 2016 William Hicks
+#
+# This file is part of Writing3D.
+#
+# Writing3D is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+"""Structural validation of W3D XML against caveschema.xsd
+
+The schema is compiled once into a table of rules for each element
+declaration. Documents can then be checked in a single pass over their nodes,
+collecting every violation rather than stopping at the first, before any
+W3DFeature is created from them.
+
+Only the structure of documents is checked: which child elements and
+attributes may appear where, which are required, how many times they may
+occur and whether simple values (booleans, numbers, enumerations) are valid.
+Identity constraints (xs:key and xs:keyref) are left to the validators of
+each feature. Since neither legacy editors nor pyw3d write elements in
+exactly the order given by the schema, and both omit some elements that the
+schema requires, the relaxations listed in :py:data:`SCHEMA_RELAXATIONS` are
+applied to the compiled rules.
+"""
+import logging
+import os
+import xml.etree.ElementTree as ET
+from .errors import BadW3DXML
+LOGGER = logging.getLogger("pyw3d")
+
+SCHEMA_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "caveschema.xsd")
+XS = "{http://www.w3.org/2001/XMLSchema}"
+MAX_REPORTED_VIOLATIONS = 100
+
+SCHEMA_RELAXATIONS = {
+    "Story": {
+        "optional": (
+            "ObjectRoot", "GroupRoot", "TimelineRoot", "PlacementRoot",
+            "SoundRoot", "EventRoot", "ParticleActionRoot", "About"),
+    },
+    "Story/ObjectRoot": {"optional": ("Object",)},
+    "Story/PlacementRoot": {"optional": ("Placement",)},
+    "Global": {"extra": {"Debug": "xs:boolean", "Profile": "xs:boolean"}},
+    "Group": {"optional": ("Objects", "Groups"), "mixed_choices": True},
+    "Object": {"extra": {"DoubleSided": "xs:boolean"}},
+    "Content": {"extra_choices": ("Shape",)},
+    "Object/SoundRef": {"extra_attributes": {"name": "xs:string"}},
+    "Placement": {"optional": ("Position",)},
+    "Placement/LookAt": {"extra_attributes": {"angle": "xs:double"}},
+    "Placement/Normal": {"extra_attributes": {"rotation": "vector"}},
+    "GroupRef": {"extra_attributes": {"random": "xs:boolean"}},
+    "SoundRef": {"extra_attributes": {"action": "xs:string"}},
+    "ParticleActionList": {"optional": ("ParticleAction", "RemoveCondition")},
+}
+"""Dictionary mapping elements (given as a path from a global element) to
+relaxations of their compiled rules. "optional" lists children which may be
+omitted, "extra" and "extra_attributes" map names of additional children and
+attributes written by pyw3d to their simple types, "extra_choices" adds
+children with unchecked content to the choices of an element and
+"mixed_choices" allows members of a choice to appear together."""
+
+
+def _check_boolean(text):
+    return text in ("true", "false", "1", "0")
+
+
+def _check_float(text):
+    try:
+        float(text)
+    except ValueError:
+        return False
+    return True
+
+
+def _check_unsigned(text):
+    try:
+        return int(text) >= 0
+    except ValueError:
+        return False
+
+
+def _check_string(text):
+    return True
+
+
+BUILTIN_TYPES = {
+    "xs:boolean": ("boolean", _check_boolean, str),
+    "xs:double": ("number", _check_float, float),
+    "xs:float": ("number", _check_float, float),
+    "xs:unsignedInt": ("non-negative integer", _check_unsigned, int),
+    "xs:string": ("text", _check_string, str),
+}
+
+
+class SimpleType(object):
+    """Compiled check for the text of a simple-typed element or attribute
+
+    :param str description: Description of valid values
+    :param check: Callable returning True for valid (stripped) text
+    :param convert: Callable converting text for comparison with bounds
+    :param options: If not None, tuple of valid values
+    :param minimum: If not None, minimum valid value
+    :param maximum: If not None, maximum valid value
+    :ivar set known_valid: Values already found to be valid, so that common
+    values (e.g. "true") are only checked once
+    """
+    max_known_valid = 1024
+
+    def __init__(
+            self, description, check, convert=str, options=None,
+            minimum=None, maximum=None):
+        self.description = description
+        self.check = check
+        self.convert = convert
+        self.options = options
+        self.minimum = minimum
+        self.maximum = maximum
+        self.known_valid = set()
+
+    def __call__(self, text):
+        """Return None if text is valid, otherwise a description of the
+        problem"""
+        if text in self.known_valid:
+            return None
+        problem = self._problem(text)
+        if problem is None and len(self.known_valid) < self.max_known_valid:
+            self.known_valid.add(text)
+        return problem
+
+    def _problem(self, text):
+        if self.options is not None:
+            if text in self.options:
+                return None
+            return "must be one of {}".format(", ".join(self.options))
+        stripped = text.strip()
+        if not self.check(stripped):
+            return "must be a {}".format(self.description)
+        if self.minimum is not None and \
+                self.convert(stripped) < self.minimum:
+            return "must be at least {}".format(self.minimum)
+        if self.maximum is not None and \
+                self.convert(stripped) > self.maximum:
+            return "must be at most {}".format(self.maximum)
+        return None
+
+
+def _either(first, second):
+    """Return check accepting values valid for either of two SimpleTypes"""
+    def check(text):
+        problem = first(text)
+        if problem is not None and second(text) is None:
+            return None
+        return problem
+    return check
+
+
+class ElementRule(object):
+    """Compiled content model of a single element declaration
+
+    :ivar dict children: Maps tags of allowed children to their rules
+    :ivar set required: Tags of children which must appear
+    :ivar set single: Tags of children which may appear at most once
+    :ivar list choices: (tags, required, exclusive) for each choice group
+    :ivar dict attributes: Maps names of allowed attributes to their types
+    :ivar set required_attributes: Names of attributes which must appear
+    :ivar text_type: SimpleType of element text, if element has simple type
+    :ivar bool any_content: True if element content is not constrained
+    """
+    __slots__ = (
+        "name", "children", "required", "single", "choices", "attributes",
+        "required_attributes", "text_type", "any_content")
+
+    def __init__(self, name):
+        self.name = name
+        self.children = {}
+        self.required = set()
+        self.single = set()
+        self.choices = []
+        self.attributes = {}
+        self.required_attributes = set()
+        self.text_type = None
+        self.any_content = False
+
+
+class SchemaCompiler(object):
+    """Compile an XSD document into ElementRules
+
+    Only the subset of XML Schema used by caveschema.xsd is supported.
+
+    :param schema_root: Root node of XSD document
+    :type schema_root: :class:`xml.etree.ElementTree.Element`
+    """
+
+    def __init__(self, schema_root):
+        self.schema_root = schema_root
+        self.complex_types = {
+            node.attrib["name"]: node for node in
+            schema_root.findall(XS + "complexType")
+        }
+        self.simple_types = {
+            node.attrib["name"]: node for node in
+            schema_root.findall(XS + "simpleType")
+        }
+        self.elements = {
+            node.attrib["name"]: ElementRule(node.attrib["name"]) for node in
+            schema_root.findall(XS + "element")
+        }
+
+    def compile(self):
+        """Return dictionary mapping names of global elements to rules"""
+        for node in self.schema_root.findall(XS + "element"):
+            self._fill_element(self.elements[node.attrib["name"]], node)
+        for path, relaxations in SCHEMA_RELAXATIONS.items():
+            names = path.split("/")
+            rule = self.elements[names[0]]
+            for name in names[1:]:
+                rule = rule.children[name]
+            rule.required.difference_update(relaxations.get("optional", ()))
+            for tag, type_name in relaxations.get("extra", {}).items():
+                child = ElementRule(tag)
+                child.text_type = self.simple_type(type_name)
+                rule.children[tag] = child
+                rule.single.add(tag)
+            for tag in relaxations.get("extra_choices", ()):
+                child = ElementRule(tag)
+                child.any_content = True
+                rule.children[tag] = child
+                rule.single.add(tag)
+                rule.choices = [
+                    (tags | {tag}, required, exclusive) for
+                    tags, required, exclusive in rule.choices
+                ]
+            for name, type_name in relaxations.get(
+                    "extra_attributes", {}).items():
+                extra_type = self.simple_type(type_name)
+                if name in rule.attributes:
+                    rule.attributes[name] = _either(
+                        rule.attributes[name], extra_type)
+                else:
+                    rule.attributes[name] = extra_type
+            for tag in relaxations.get("optional", ()):
+                for index, (tags, _, exclusive) in enumerate(rule.choices):
+                    if tag in tags:
+                        rule.choices[index] = (tags, False, exclusive)
+            if relaxations.get("mixed_choices", False):
+                rule.choices = [
+                    (tags, required, False) for tags, required, _ in
+                    rule.choices
+                ]
+        return self.elements
+
+    def simple_type(self, type_name=None, node=None):
+        """Return SimpleType for named type or xs:simpleType node"""
+        if node is None:
+            if type_name in BUILTIN_TYPES:
+                return SimpleType(*BUILTIN_TYPES[type_name])
+            node = self.simple_types[type_name]
+        restriction = node.find(XS + "restriction")
+        simple_type = self.simple_type(restriction.attrib["base"])
+        options = [
+            option.attrib["value"] for option in
+            restriction.findall(XS + "enumeration")
+        ]
+        if options:
+            simple_type.options = tuple(options)
+        for bound in ("minInclusive", "maxInclusive"):
+            bound_node = restriction.find(XS + bound)
+            if bound_node is not None:
+                setattr(
+                    simple_type, "minimum" if bound == "minInclusive" else
+                    "maximum", simple_type.convert(bound_node.attrib["value"])
+                )
+        return simple_type
+
+    def _fill_element(self, rule, node):
+        type_name = node.attrib.get("type")
+        if type_name is not None:
+            if type_name in self.complex_types:
+                self._fill_complex(rule, self.complex_types[type_name])
+            else:
+                rule.text_type = self.simple_type(type_name)
+            return
+        complex_node = node.find(XS + "complexType")
+        simple_node = node.find(XS + "simpleType")
+        if complex_node is not None:
+            self._fill_complex(rule, complex_node)
+        elif simple_node is not None:
+            rule.text_type = self.simple_type(node=simple_node)
+        else:
+            rule.any_content = True
+
+    def _fill_complex(self, rule, node):
+        for child in node:
+            if child.tag in (XS + "sequence", XS + "choice"):
+                self._fill_group(rule, child, False)
+            elif child.tag == XS + "attribute":
+                self._add_attribute(rule, child)
+            elif child.tag == XS + "complexContent":
+                extension = child.find(XS + "extension")
+                self._fill_complex(
+                    rule, self.complex_types[extension.attrib["base"]])
+                self._fill_complex(rule, extension)
+
+    def _add_attribute(self, rule, node):
+        name = node.attrib["name"]
+        if "type" in node.attrib:
+            rule.attributes[name] = self.simple_type(node.attrib["type"])
+        elif node.find(XS + "simpleType") is not None:
+            rule.attributes[name] = self.simple_type(
+                node=node.find(XS + "simpleType"))
+        else:
+            rule.attributes[name] = self.simple_type("xs:string")
+        if node.attrib.get("use") == "required":
+            rule.required_attributes.add(name)
+
+    def _child_rule(self, node):
+        if "ref" in node.attrib:
+            return self.elements[node.attrib["ref"]]
+        child_rule = ElementRule(node.attrib["name"])
+        self._fill_element(child_rule, node)
+        return child_rule
+
+    def _fill_group(self, rule, node, optional):
+        optional = optional or node.attrib.get("minOccurs") == "0"
+        repeated = node.attrib.get("maxOccurs", "1") != "1"
+        tags = []
+        for particle in node:
+            if particle.tag == XS + "element":
+                child_rule = self._child_rule(particle)
+                tag = child_rule.name
+                tags.append(tag)
+                rule.children[tag] = child_rule
+                if particle.attrib.get("maxOccurs", "1") == "1" and \
+                        not repeated:
+                    rule.single.add(tag)
+                if (
+                        node.tag == XS + "sequence" and not optional and
+                        particle.attrib.get("minOccurs", "1") != "0"):
+                    rule.required.add(tag)
+            elif particle.tag in (XS + "sequence", XS + "choice"):
+                tags.extend(self._fill_group(
+                    rule, particle,
+                    optional or node.tag == XS + "choice"
+                ))
+        if node.tag == XS + "choice":
+            rule.choices.append((frozenset(tags), not optional, not repeated))
+        return tags
+
+
+def compile_schema(filename=SCHEMA_FILE):
+    """Compile XSD file and return the rule for its Story element"""
+    return SchemaCompiler(ET.parse(filename).getroot()).compile()["Story"]
+
+
+class _SchemaCache(object):
+    """Holds the default compiled schema, which is compiled on first use
+
+    :ivar bool compiled: True once compilation has been attempted, so that a
+    missing schema file is only reported once"""
+    story_rule = None
+    compiled = False
+
+
+def default_schema():
+    """Return compiled rule for Story element of caveschema.xsd, or None if
+    the schema file is not available"""
+    if not _SchemaCache.compiled:
+        _SchemaCache.compiled = True
+        try:
+            _SchemaCache.story_rule = compile_schema()
+        except FileNotFoundError:
+            LOGGER.warning(
+                "Schema {} not found; W3D XML will not be checked against"
+                " it".format(SCHEMA_FILE))
+    return _SchemaCache.story_rule
+
+
+def _format_path(path):
+    """Return XPath-like string for path given as nested tuples of
+    (parent path, tag, position)"""
+    steps = []
+    while path is not None:
+        path, tag, position = path
+        steps.append("{}[{}]".format(tag, position) if position else tag)
+    return "/" + "/".join(reversed(steps))
+
+
+def _check_node(node, rule, path, violations):
+    """Check node and its descendants against rule, appending a description
+    of each violation found to violations
+
+    Paths are only formatted as strings when a violation is found, since
+    valid documents are by far the most common case."""
+    if node.attrib:
+        for name, value in node.attrib.items():
+            try:
+                problem = rule.attributes[name](value)
+            except KeyError:
+                if not rule.any_content:
+                    violations.append("{}: unexpected attribute {}".format(
+                        _format_path(path), name))
+                continue
+            if problem is not None:
+                violations.append("{}: attribute {}={!r} {}".format(
+                    _format_path(path), name, value, problem))
+    for name in rule.required_attributes:
+        if name not in node.attrib:
+            violations.append("{}: missing required attribute {}".format(
+                _format_path(path), name))
+
+    if rule.any_content:
+        return
+    if rule.text_type is not None:
+        if len(node):
+            violations.append("{}: must not have child elements".format(
+                _format_path(path)))
+        text = node.text or ""
+        if text not in rule.text_type.known_valid:
+            problem = rule.text_type(text)
+            if problem is not None:
+                violations.append("{}: value {!r} {}".format(
+                    _format_path(path), node.text, problem))
+        return
+
+    counts = {}
+    children = rule.children
+    for child in node:
+        tag = child.tag
+        count = counts.get(tag, 0) + 1
+        counts[tag] = count
+        try:
+            child_rule = children[tag]
+        except KeyError:
+            violations.append("{}: unexpected element".format(
+                _format_path((path, tag, count))))
+            continue
+        if count == 2 and tag in rule.single:
+            violations.append("{}: {} may only appear once".format(
+                _format_path(path), tag))
+        _check_node(child, child_rule, (path, tag, count), violations)
+    for tag in rule.required:
+        if tag not in counts:
+            violations.append("{}: missing required element {}".format(
+                _format_path(path), tag))
+    for tags, required, exclusive in rule.choices:
+        present = [tag for tag in tags if tag in counts]
+        if required and not present:
+            violations.append("{}: must contain one of {}".format(
+                _format_path(path), ", ".join(sorted(tags))))
+        elif exclusive and len(present) > 1:
+            violations.append("{}: may contain only one of {}".format(
+                _format_path(path), ", ".join(sorted(present))))
+
+
+def check_story(story_root, story_rule=None):
+    """Check Story node against compiled schema and return a list of
+    descriptions of all violations found
+
+    :param story_root: Story node of W3D XML document
+    :type story_root: :class:`xml.etree.ElementTree.Element`
+    :param story_rule: Compiled rule for Story element (defaults to rule
+    compiled from caveschema.xsd)
+    """
+    if story_rule is None:
+        story_rule = default_schema()
+        if story_rule is None:
+            return []
+    if story_root.tag != story_rule.name:
+        return ["/{}: root element must be {}".format(
+            story_root.tag, story_rule.name)]
+    violations = []
+    _check_node(
+        story_root, story_rule, (None, story_root.tag, 0), violations)
+    return violations
+
+
+def check_section(section_root, first_position=1, story_rule=None):
+    """Check a run of consecutive features from one section of a Story (e.g.
+    some of the Object nodes of its ObjectRoot) against compiled schema and
+    return a list of descriptions of any violations found
+
+    This allows the sections of a large document to be checked separately;
+    the Story node itself should then be checked by :py:func:`check_story`
+    with its sections emptied.
+
+    :param section_root: Section node holding the features to check
+    :type section_root: :class:`xml.etree.ElementTree.Element`
+    :param int first_position: Position of the first of these features
+    within the full section, used when reporting violations
+    :param story_rule: Compiled rule for Story element (defaults to rule
+    compiled from caveschema.xsd)
+    """
+    if story_rule is None:
+        story_rule = default_schema()
+        if story_rule is None:
+            return []
+    section_path = ((None, story_rule.name, 0), section_root.tag, 1)
+    try:
+        section_rule = story_rule.children[section_root.tag]
+    except KeyError:
+        return ["{}: unexpected element".format(_format_path(section_path))]
+    violations = []
+    for position, child in enumerate(section_root, first_position):
+        child_path = (section_path, child.tag, position)
+        try:
+            child_rule = section_rule.children[child.tag]
+        except KeyError:
+            violations.append("{}: unexpected element".format(
+                _format_path(child_path)))
+            continue
+        _check_node(child, child_rule, child_path, violations)
+    return violations
+
+
+def raise_violations(violations):
+    """Raise BadW3DXML describing given schema violations, if there are any
+
+    :param list violations: Descriptions returned by :py:func:`check_story`
+    or :py:func:`check_section`
+    :raises BadW3DXML: If violations is not empty
+    """
+    if violations:
+        shown = violations[:MAX_REPORTED_VIOLATIONS]
+        if len(violations) > len(shown):
+            shown.append("... and {} more".format(
+                len(violations) - len(shown)))
+        raise BadW3DXML(
+            "Story does not conform to schema ({} problems found):\n"
+            "{}".format(len(violations), "\n".join(shown))
+        )
+
+
+def validate_story(story_root, story_rule=None):
+    """Raise BadW3DXML describing all violations if Story node does not
+    conform to compiled schema
+
+    :param story_root: Story node of W3D XML document
+    :type story_root: :class:`xml.etree.ElementTree.Element`
+    :raises BadW3DXML: If any violations are found
+    """
+    raise_violations(check_story(story_root, story_rule=story_rule))
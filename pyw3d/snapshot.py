@@ -0,0 +1,586 @@
+# Copyright (C) 2016 William Hicks
+#
+# This file is part of Writing3D.
+#
+# Writing3D is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+"""Compact binary snapshots of W3D projects
+
+Snapshots are used to hand a project from one Python process to another (e.g.
+to the Blender subprocess used for export). Unlike the archival XML format,
+they store the in-memory representation of a project exactly, and unlike
+pickle they do not need to revalidate every feature when loaded.
+
+File layout (all integers little-endian)::
+
+    magic          8 bytes  b"W3DSNAP\\0"
+    version        uint32
+    section count  uint32
+    string table   uint64 offset, uint32 count
+    name list table
+                   uint64 offset, uint32 count
+    section table  (uint32 name, uint64 offset, uint64 length) per section
+    sections       encoded values, one per section
+    string table   (uint32 length, utf-8 bytes) per string
+    name list table
+                   (uint32 count, uint32 string index * count) per list
+
+Every string (feature keys, class names and text values) is stored once in the
+string table and referenced by index. Likewise, lists of strings (e.g. the
+objects in a group) are stored once in the name list table. Lists and tuples
+of floats or of small integers (positions, colors, etc.) are stored as packed
+arrays. Each list of top-level features (objects, timelines, ...) is stored in
+its own section so that it can be read without decoding the rest of the
+project; all remaining project settings are stored in the "globals" section.
+"""
+import importlib
+import io
+import mmap
+import struct
+from collections import defaultdict
+from .errors import BadW3DSnapshot
+from .features import W3DFeature
+from .structs import SortedList, TrackedList, TrackedDict, \
+    TrackedDefaultDict
+
+SNAPSHOT_MAGIC = b"W3DSNAP\0"
+SNAPSHOT_VERSION = 1
+GLOBALS_SECTION = "globals"
+
+_HEADER = struct.Struct("<8sIIQIQI")
+_SECTION_ENTRY = struct.Struct("<IQQ")
+_UINT8 = struct.Struct("<B")
+_UINT32 = struct.Struct("<I")
+_INT64 = struct.Struct("<q")
+_FLOAT64 = struct.Struct("<d")
+_INT32_RANGE = (-2**31, 2**31)
+_INT64_RANGE = (-2**63, 2**63)
+
+_NONE = b"N"
+_TRUE = b"T"
+_FALSE = b"F"
+_INT = b"i"
+_FLOAT = b"d"
+_STRING = b"s"
+_NAME_LIST = b"S"
+_FLOAT_LIST = b"v"
+_FLOAT_TUPLE = b"V"
+_INT_LIST = b"w"
+_INT_TUPLE = b"W"
+_LIST = b"l"
+_TUPLE = b"t"
+_SORTED_LIST = b"q"
+_DICT = b"m"
+_LIST_DICT = b"L"
+_FEATURE = b"f"
+
+
+_UNTRACKED_TYPES = {
+    TrackedList: list,
+    TrackedDict: dict,
+    TrackedDefaultDict: defaultdict
+}
+
+
+def _saved_attributes(feature):
+    """Return (name, value) pairs for instance attributes of feature which
+    should be stored"""
+    return [
+        (name, value) for name, value in feature.__dict__.items()
+        if name not in feature.transient_attributes
+    ]
+
+
+def _packable(values, item_type, value_range=None, max_length=255):
+    """Return True if all values are exactly of item_type and within range"""
+    if not 0 < len(values) <= max_length:
+        return False
+    for value in values:
+        if type(value) is not item_type:
+            return False
+        if value_range is not None and not (
+                value_range[0] <= value < value_range[1]):
+            return False
+    return True
+
+
+class SnapshotWriter(object):
+    """Encode W3DProject into snapshot format"""
+
+    def __init__(self):
+        self.strings = []
+        self._string_indices = {}
+        self.name_lists = []
+        self._name_list_indices = {}
+
+    def intern(self, string):
+        """Return index of string in string table, adding it if necessary"""
+        try:
+            return self._string_indices[string]
+        except KeyError:
+            self._string_indices[string] = len(self.strings)
+            self.strings.append(string)
+            return self._string_indices[string]
+
+    def intern_list(self, names):
+        """Return index of list of strings in name list table, adding it if
+        necessary"""
+        names = tuple(names)
+        try:
+            return self._name_list_indices[names]
+        except KeyError:
+            self._name_list_indices[names] = len(self.name_lists)
+            self.name_lists.append([self.intern(name) for name in names])
+            return self._name_list_indices[names]
+
+    def _encode_sequence(self, values, out, float_tag, int_tag, generic_tag):
+        if _packable(values, float):
+            out += float_tag
+            out += _UINT8.pack(len(values))
+            out += struct.pack("<{}d".format(len(values)), *values)
+        elif _packable(values, int, _INT32_RANGE):
+            out += int_tag
+            out += _UINT8.pack(len(values))
+            out += struct.pack("<{}i".format(len(values)), *values)
+        else:
+            out += generic_tag
+            out += _UINT32.pack(len(values))
+            for value in values:
+                self.encode(value, out)
+
+    def encode(self, value, out):
+        """Append encoded value to bytearray out"""
+        value_type = _UNTRACKED_TYPES.get(type(value), type(value))
+        if value is None:
+            out += _NONE
+        elif value_type is bool:
+            out += _TRUE if value else _FALSE
+        elif value_type is int:
+            if not _INT64_RANGE[0] <= value < _INT64_RANGE[1]:
+                raise BadW3DSnapshot(
+                    "Integer {} is too large for snapshot".format(value))
+            out += _INT
+            out += _INT64.pack(value)
+        elif value_type is float:
+            out += _FLOAT
+            out += _FLOAT64.pack(value)
+        elif value_type is str:
+            out += _STRING
+            out += _UINT32.pack(self.intern(value))
+        elif value_type is list and _packable(value, str, max_length=2**32):
+            out += _NAME_LIST
+            out += _UINT32.pack(self.intern_list(value))
+        elif value_type is list:
+            self._encode_sequence(
+                value, out, _FLOAT_LIST, _INT_LIST, _LIST)
+        elif value_type is tuple:
+            self._encode_sequence(
+                value, out, _FLOAT_TUPLE, _INT_TUPLE, _TUPLE)
+        elif isinstance(value, SortedList):
+            if value.sort_key is not None:
+                raise BadW3DSnapshot(
+                    "Cannot store SortedList with custom sort key")
+            out += _SORTED_LIST
+            out += _UINT32.pack(len(value))
+            for item in value:
+                self.encode(item, out)
+        elif isinstance(value, W3DFeature):
+            self._encode_feature(value, out)
+        elif value_type is defaultdict and value.default_factory is list:
+            out += _LIST_DICT
+            self._encode_items(value, out)
+        elif value_type is dict:
+            out += _DICT
+            self._encode_items(value, out)
+        else:
+            raise BadW3DSnapshot(
+                "Cannot store value of type {} in snapshot".format(
+                    value_type.__name__)
+            )
+        return out
+
+    def _encode_items(self, dictionary, out):
+        out += _UINT32.pack(len(dictionary))
+        for key, value in dictionary.items():
+            self.encode(key, out)
+            self.encode(value, out)
+
+    def _encode_attributes(self, attributes, out):
+        out += _UINT32.pack(len(attributes))
+        for key, value in attributes:
+            out += _UINT32.pack(self.intern(key))
+            self.encode(value, out)
+
+    def _encode_feature(self, feature, out):
+        # Compact features are stored as their full class, so that snapshots
+        # do not depend on the storage mode in use
+        feature_class = getattr(type(feature), "full_class", type(feature))
+        out += _FEATURE
+        out += _UINT32.pack(self.intern("{}:{}".format(
+            feature_class.__module__, feature_class.__qualname__)))
+        self._encode_attributes(feature.items(), out)
+        self._encode_attributes(_saved_attributes(feature), out)
+
+    def write(self, project, file_):
+        """Write project as snapshot to binary file object"""
+        sections = []
+        global_items = []
+        for key, value in project.items():
+            if isinstance(value, list):
+                sections.append((key, self.encode(value, bytearray())))
+            else:
+                global_items.append((key, value))
+        global_section = bytearray()
+        self._encode_attributes(global_items, global_section)
+        self._encode_attributes(_saved_attributes(project), global_section)
+        sections.append((GLOBALS_SECTION, global_section))
+        return self._write_sections(sections, file_)
+
+    def write_values(self, values, file_):
+        """Write values as snapshot to binary file object
+
+        :param dict values: Dictionary mapping section names to the value to
+        be stored in each section
+        """
+        return self._write_sections([
+            (name, self.encode(value, bytearray()))
+            for name, value in values.items()
+        ], file_)
+
+    def _write_sections(self, sections, file_):
+        """Write list of (name, encoded data) sections to file object"""
+        for name, _ in sections:
+            self.intern(name)
+
+        offset = _HEADER.size + _SECTION_ENTRY.size * len(sections)
+        section_table = bytearray()
+        for name, data in sections:
+            section_table += _SECTION_ENTRY.pack(
+                self.intern(name), offset, len(data))
+            offset += len(data)
+
+        string_table = bytearray()
+        for string in self.strings:
+            encoded = string.encode("utf-8")
+            string_table += _UINT32.pack(len(encoded))
+            string_table += encoded
+        name_list_table = bytearray()
+        for indices in self.name_lists:
+            name_list_table += struct.pack(
+                "<I{}I".format(len(indices)), len(indices), *indices)
+
+        file_.write(_HEADER.pack(
+            SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(sections), offset,
+            len(self.strings), offset + len(string_table),
+            len(self.name_lists)
+        ))
+        file_.write(section_table)
+        for _, data in sections:
+            file_.write(data)
+        file_.write(string_table)
+        file_.write(name_list_table)
+        return file_
+
+
+class SnapshotReader(object):
+    """Decode a snapshot held in a bytes-like buffer
+
+    :param buffer: Bytes-like object (e.g. an mmap) containing the snapshot
+    """
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        try:
+            (magic, version, section_count, string_offset, string_count,
+             name_list_offset, name_list_count) = _HEADER.unpack_from(
+                 buffer, 0)
+        except struct.error:
+            raise BadW3DSnapshot("File is too short to be a W3D snapshot")
+        if magic != SNAPSHOT_MAGIC:
+            raise BadW3DSnapshot("File is not a W3D snapshot")
+        if version != SNAPSHOT_VERSION:
+            raise BadW3DSnapshot(
+                "Snapshot version {} is not supported (expected {})".format(
+                    version, SNAPSHOT_VERSION)
+            )
+        self.strings = []
+        offset = string_offset
+        for _ in range(string_count):
+            length = _UINT32.unpack_from(buffer, offset)[0]
+            offset += _UINT32.size
+            self.strings.append(
+                bytes(buffer[offset:offset + length]).decode("utf-8"))
+            offset += length
+        self.name_lists = []
+        offset = name_list_offset
+        for _ in range(name_list_count):
+            count = _UINT32.unpack_from(buffer, offset)[0]
+            indices = struct.unpack_from(
+                "<{}I".format(count), buffer, offset + 4)
+            self.name_lists.append(
+                tuple(self.strings[index] for index in indices))
+            offset += 4 * (count + 1)
+
+        self.sections = {}
+        offset = _HEADER.size
+        for _ in range(section_count):
+            name, section_offset, length = _SECTION_ENTRY.unpack_from(
+                buffer, offset)
+            self.sections[self.strings[name]] = (section_offset, length)
+            offset += _SECTION_ENTRY.size
+        self._classes = {}
+        self._decoders = {
+            _NONE[0]: lambda offset: (None, offset),
+            _TRUE[0]: lambda offset: (True, offset),
+            _FALSE[0]: lambda offset: (False, offset),
+            _INT[0]: self._decode_int,
+            _FLOAT[0]: self._decode_float,
+            _STRING[0]: self._decode_string,
+            _NAME_LIST[0]: self._decode_name_list,
+            _FLOAT_LIST[0]: self._decode_float_list,
+            _FLOAT_TUPLE[0]: self._decode_float_tuple,
+            _INT_LIST[0]: self._decode_int_list,
+            _INT_TUPLE[0]: self._decode_int_tuple,
+            _LIST[0]: self._decode_list,
+            _TUPLE[0]: self._decode_tuple,
+            _SORTED_LIST[0]: self._decode_sorted_list,
+            _DICT[0]: self._decode_dict,
+            _LIST_DICT[0]: self._decode_list_dict,
+            _FEATURE[0]: self._decode_feature,
+        }
+
+    def decode(self, offset):
+        """Decode value at offset, returning (value, offset of next value)
+        """
+        try:
+            decoder = self._decoders[self.buffer[offset]]
+        except KeyError:
+            raise BadW3DSnapshot(
+                "Unknown value tag at offset {}".format(offset))
+        return decoder(offset + 1)
+
+    def _decode_int(self, offset):
+        return _INT64.unpack_from(self.buffer, offset)[0], offset + 8
+
+    def _decode_float(self, offset):
+        return _FLOAT64.unpack_from(self.buffer, offset)[0], offset + 8
+
+    def _decode_string(self, offset):
+        return (
+            self.strings[_UINT32.unpack_from(self.buffer, offset)[0]],
+            offset + 4
+        )
+
+    def _decode_name_list(self, offset):
+        return (
+            list(self.name_lists[_UINT32.unpack_from(self.buffer, offset)[0]]),
+            offset + 4
+        )
+
+    def _decode_packed(self, offset, item_format, item_size):
+        count = self.buffer[offset]
+        values = struct.unpack_from(
+            "<{}{}".format(count, item_format), self.buffer, offset + 1)
+        return values, offset + 1 + count * item_size
+
+    def _decode_float_list(self, offset):
+        values, offset = self._decode_packed(offset, "d", 8)
+        return list(values), offset
+
+    def _decode_float_tuple(self, offset):
+        return self._decode_packed(offset, "d", 8)
+
+    def _decode_int_list(self, offset):
+        values, offset = self._decode_packed(offset, "i", 4)
+        return list(values), offset
+
+    def _decode_int_tuple(self, offset):
+        return self._decode_packed(offset, "i", 4)
+
+    def _decode_list(self, offset):
+        count = _UINT32.unpack_from(self.buffer, offset)[0]
+        offset += 4
+        values = []
+        for _ in range(count):
+            value, offset = self.decode(offset)
+            values.append(value)
+        return values, offset
+
+    def _decode_tuple(self, offset):
+        values, offset = self._decode_list(offset)
+        return tuple(values), offset
+
+    def _decode_sorted_list(self, offset):
+        values, offset = self._decode_list(offset)
+        return SortedList(values), offset
+
+    def _decode_items(self, dictionary, offset):
+        count = _UINT32.unpack_from(self.buffer, offset)[0]
+        offset += 4
+        for _ in range(count):
+            key, offset = self.decode(offset)
+            dictionary[key], offset = self.decode(offset)
+        return dictionary, offset
+
+    def _decode_dict(self, offset):
+        return self._decode_items({}, offset)
+
+    def _decode_list_dict(self, offset):
+        return self._decode_items(defaultdict(list), offset)
+
+    def _decode_attributes(self, offset):
+        count = _UINT32.unpack_from(self.buffer, offset)[0]
+        offset += 4
+        attributes = {}
+        for _ in range(count):
+            key = self.strings[_UINT32.unpack_from(self.buffer, offset)[0]]
+            attributes[key], offset = self.decode(offset + 4)
+        return attributes, offset
+
+    def feature_class(self, class_path):
+        """Return W3DFeature subclass given "module:qualname" string"""
+        try:
+            return self._classes[class_path]
+        except KeyError:
+            module_name, _, class_name = class_path.partition(":")
+            try:
+                feature_class = importlib.import_module(module_name)
+                for name in class_name.split("."):
+                    feature_class = getattr(feature_class, name)
+            except (ImportError, AttributeError):
+                raise BadW3DSnapshot(
+                    "Unknown feature class {}".format(class_path))
+            if not (
+                    isinstance(feature_class, type) and
+                    issubclass(feature_class, W3DFeature)):
+                raise BadW3DSnapshot(
+                    "{} is not a W3DFeature".format(class_path))
+            self._classes[class_path] = feature_class
+            return feature_class
+
+    def _new_feature(self, feature_class, items, attributes):
+        # Features were validated before they were written, so bypass
+        # __init__ and __setitem__
+        feature = feature_class.__new__(feature_class)
+        for key, value in items.items():
+            feature._store(key, value)
+        for name, value in attributes.items():
+            setattr(feature, name, value)
+        feature.track_values()
+        return feature
+
+    def _decode_feature(self, offset):
+        feature_class = self.feature_class(
+            self.strings[_UINT32.unpack_from(self.buffer, offset)[0]])
+        items, offset = self._decode_attributes(offset + 4)
+        attributes, offset = self._decode_attributes(offset)
+        return self._new_feature(feature_class, items, attributes), offset
+
+    def read_section(self, name):
+        """Decode and return the named section of the snapshot"""
+        try:
+            offset, length = self.sections[name]
+        except KeyError:
+            raise BadW3DSnapshot("Snapshot has no section {}".format(name))
+        if name == GLOBALS_SECTION:
+            items, offset = self._decode_attributes(offset)
+            attributes, offset = self._decode_attributes(offset)
+            return items, attributes
+        return self.decode(offset)[0]
+
+    def read_project(self, project_class):
+        """Decode all sections and return as instance of project_class"""
+        items, attributes = self.read_section(GLOBALS_SECTION)
+        for name in self.sections:
+            if name != GLOBALS_SECTION:
+                items[name] = self.read_section(name)
+        project = self._new_feature(project_class, items, attributes)
+        if "debug" in items:
+            project["debug"] = items["debug"]  # Reapply logging level
+        return project
+
+
+def save_snapshot(input_project, filename):
+    """Write W3DProject to snapshot file of given filename"""
+    with open(filename, "wb") as snapshot_file:
+        SnapshotWriter().write(input_project, snapshot_file)
+    return filename
+
+
+def dumps_project(input_project):
+    """Return snapshot of W3DProject as bytes"""
+    return SnapshotWriter().write(input_project, io.BytesIO()).getvalue()
+
+
+def loads_project(buffer, project_class=None):
+    """Create W3DProject from snapshot bytes
+
+    :param buffer: Bytes-like object returned by :py:func:`dumps_project`
+    :param project_class: Class of project to create (defaults to
+    :py:class:`pyw3d.project.W3DProject`)"""
+    if project_class is None:
+        from .project import W3DProject
+        project_class = W3DProject
+    return SnapshotReader(buffer).read_project(project_class)
+
+
+def dumps_values(values):
+    """Return snapshot of given values as bytes
+
+    :param dict values: Dictionary mapping section names to the value to be
+    stored in each section (e.g. a list of features)
+    """
+    return SnapshotWriter().write_values(values, io.BytesIO()).getvalue()
+
+
+def loads_section(buffer, name):
+    """Decode and return a single section from snapshot bytes
+
+    :param buffer: Bytes-like object returned by :py:func:`dumps_values`
+    :param str name: Name of section"""
+    return SnapshotReader(buffer).read_section(name)
+
+
+def _map_file(filename):
+    with open(filename, "rb") as snapshot_file:
+        return mmap.mmap(
+            snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def load_snapshot(filename, project_class=None):
+    """Create W3DProject from snapshot file of given filename
+
+    The file is memory-mapped rather than read into memory up front.
+
+    :param project_class: Class of project to create (defaults to
+    :py:class:`pyw3d.project.W3DProject`)"""
+    if project_class is None:
+        from .project import W3DProject
+        project_class = W3DProject
+    snapshot_map = _map_file(filename)
+    try:
+        return SnapshotReader(snapshot_map).read_project(project_class)
+    finally:
+        snapshot_map.close()
+
+
+def load_snapshot_section(filename, name):
+    """Decode and return a single section from snapshot file
+
+    :param str name: Name of section (e.g. "timelines")"""
+    snapshot_map = _map_file(filename)
+    try:
+        return SnapshotReader(snapshot_map).read_section(name)
+    finally:
+        snapshot_map.close()
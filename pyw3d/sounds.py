@@ -28,10 +28,12 @@ from .validators import IsNumeric, OptionValidator, ValidPyString, IsBoolean,\
 from .errors import ConsistencyError, BadW3DXML
 from .xml_tools import bool2text, text2bool
 from .names import generate_blender_sound_name
+from .build_trace import CountedCall
+from .logic_builder import LogicBuilder
 try:
     import bpy
     from _bpy import ops as ops_module
-    BPY_OPS_CALL = ops_module.call
+    BPY_OPS_CALL = CountedCall(ops_module.call)
 except ImportError:
     pass
 
@@ -133,7 +135,7 @@ class W3DSound(W3DFeature):
         settings = {}
         attrib_map = {
             "frequency_scale": "freq", "volume_scale": "volume", "pan": "pan"}
-        for key, xml_attrib in attrib_map:
+        for key, xml_attrib in attrib_map.items():
             if not self.is_default(key):
                 settings[xml_attrib] = str(self[key])
         node = ET.SubElement(sound_root, "Settings", attrib=settings)
@@ -213,17 +215,9 @@ class W3DSound(W3DFeature):
         blender_sound.name = sound_name
 
         LOGGER.debug("Creating actuator for {}".format(sound_name))
-        bpy.context.scene.objects.active = audio_playback_object()
-        BPY_OPS_CALL(
-            "logic.actuator_add", None,
-            {
-                'type': 'SOUND',
-                'object': "AUDIO",
-                'name': sound_name
-            }
-        )
-        actuator = audio_playback_object().game.actuators[-1]
-        actuator.name = sound_name
+        logic = LogicBuilder(audio_playback_object())
+        logic.activate()
+        actuator = logic.actuator("SOUND", sound_name)
         actuator.sound = blender_sound
         actuator.use_sound_3d = (self["movement_mode"] == "Positional")
         if self["repetitions"] < 0:
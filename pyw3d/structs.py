@@ -17,25 +17,413 @@
 
 """Non-feature data structures used by Writing3D
 """
-from collections import MutableSequence
+from bisect import bisect_right
+from collections import MutableSequence, defaultdict
+
+_UNTRACKED_TYPES = (type(None), bool, int, float, str)
+
+
+def track(value, owner):
+    """Return value set up to report any changes to it to owner
+
+    Lists and dictionaries are replaced by tracked equivalents, features and
+    tracked structures have owner added to their owners and the items of
+    tuples are tracked in turn. Any other value is returned unchanged.
+
+    :param owner: Object with a mark_changed method (usually a W3DFeature)
+    """
+    value_type = type(value)
+    if value_type in _UNTRACKED_TYPES:
+        return value
+    if value_type is list:
+        return TrackedList(value, owner)
+    if value_type is tuple:
+        return tuple(track(item, owner) for item in value)
+    if value_type is dict:
+        return TrackedDict(value, owner)
+    if value_type is defaultdict:
+        return TrackedDefaultDict(value.default_factory, value, owner)
+    try:
+        value.add_owner(owner)
+    except AttributeError:
+        pass
+    return value
+
+
+class _Tracked(object):
+    """Mixin for structures which notify their owners when modified"""
+    __slots__ = ()
+
+    def _track(self, value):
+        for owner in self.owners:
+            value = track(value, owner)
+        return value
+
+    def add_owner(self, owner):
+        """Report future changes to this structure to owner as well"""
+        if not any(current is owner for current in self.owners):
+            self.owners += (owner,)
+            self._track_items(owner)
+
+    def mark_changed(self):
+        """Notify all owners that this structure has been modified"""
+        for owner in self.owners:
+            owner.mark_changed()
+
+    def __reduce_ex__(self, protocol):
+        # Owners are restored when the owning feature is unpickled
+        return (self._untracked_type, (self._untracked_type(self),))
+
+
+class TrackedList(_Tracked, list):
+    """A list which notifies its owners when modified
+
+    Optionally, a listener may also be told which items are added to or
+    removed from the list (see :py:class:`NameIndex`).
+
+    :param iterable: Initial contents of list
+    :param owner: Object with a mark_changed method to be notified of changes
+    :ivar listener: None or object with items_added and items_removed
+    methods, each taking a list of items
+    :ivar handles: None or :py:class:`pyw3d.path.HandleIndex` giving stable
+    handles for the items of the list to ProjectPaths
+    """
+    __slots__ = ("owners", "listener", "handles")
+    _untracked_type = list
+
+    def __init__(self, iterable=(), owner=None):
+        self.owners = ()
+        self.listener = None
+        self.handles = None
+        super().__init__(iterable)
+        if owner is not None:
+            self.add_owner(owner)
+
+    def _track_items(self, owner):
+        for index, item in enumerate(self):
+            list.__setitem__(self, index, track(item, owner))
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = [self._track(item) for item in value]
+            added = value
+        else:
+            value = self._track(value)
+            added = [value]
+        if self.listener is not None:
+            removed = self[index]
+            if not isinstance(index, slice):
+                removed = [removed]
+        super().__setitem__(index, value)
+        if self.listener is not None:
+            self.listener.items_removed(removed)
+            self.listener.items_added(added)
+        self.mark_changed()
+
+    def __delitem__(self, index):
+        if self.listener is not None:
+            removed = self[index]
+            if not isinstance(index, slice):
+                removed = [removed]
+        super().__delitem__(index)
+        if self.listener is not None:
+            self.listener.items_removed(removed)
+        self.mark_changed()
+
+    def __iadd__(self, values):
+        self.extend(values)
+        return self
+
+    def __imul__(self, count):
+        original = list(self) if self.listener is not None else None
+        super().__imul__(count)
+        if original is not None:
+            if count > 0:
+                self.listener.items_added(original * (count - 1))
+            else:
+                self.listener.items_removed(original)
+        self.mark_changed()
+        return self
+
+    def append(self, value):
+        value = self._track(value)
+        super().append(value)
+        if self.listener is not None:
+            self.listener.items_added([value])
+        self.mark_changed()
+
+    def extend(self, values):
+        values = [self._track(value) for value in values]
+        super().extend(values)
+        if self.listener is not None:
+            self.listener.items_added(values)
+        self.mark_changed()
+
+    def insert(self, index, value):
+        value = self._track(value)
+        super().insert(index, value)
+        if self.listener is not None:
+            self.listener.items_added([value])
+        self.mark_changed()
+
+    def pop(self, *index):
+        value = super().pop(*index)
+        if self.listener is not None:
+            self.listener.items_removed([value])
+        self.mark_changed()
+        return value
+
+    def remove(self, value):
+        if self.listener is not None:
+            del self[self.index(value)]
+            return
+        super().remove(value)
+        self.mark_changed()
+
+    def clear(self):
+        removed = list(self) if self.listener is not None else None
+        super().clear()
+        if removed is not None:
+            self.listener.items_removed(removed)
+        self.mark_changed()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self.mark_changed()
+
+    def reverse(self):
+        super().reverse()
+        self.mark_changed()
+
+
+class NameIndex(object):
+    """Index of the names of the items in a list, allowing constant-time
+    checks of whether any item has a given name
+
+    Once set as the listener of a :py:class:`TrackedList`, the index is kept
+    up to date as items are added to and removed from that list. If the name
+    of an item changes, :py:meth:`rename` must be called with that item.
+
+    :param items: Initial items
+    :param name_of: Function returning the name of an item
+    :param name_removed: Optional function called with a name when the last
+    item with that name is removed or renamed
+    """
+
+    def __init__(self, items=(), name_of=str, name_removed=None):
+        self.name_of = name_of
+        self.name_removed = name_removed
+        self.counts = {}
+        """Maps each name to the number of items with that name"""
+        self.members = {}
+        """Maps id of each item to [name, number of times item appears]"""
+        self.items_added(items)
+
+    def items_added(self, items):
+        """Add names of given items to the index"""
+        for item in items:
+            try:
+                entry = self.members[id(item)]
+            except KeyError:
+                entry = [self.name_of(item), 0]
+                self.members[id(item)] = entry
+            entry[1] += 1
+            self.counts[entry[0]] = self.counts.get(entry[0], 0) + 1
+
+    def items_removed(self, items):
+        """Remove names of given items from the index"""
+        for item in items:
+            entry = self.members[id(item)]
+            entry[1] -= 1
+            if not entry[1]:
+                del self.members[id(item)]
+            self._remove_name(entry[0], 1)
+
+    def rename(self, item):
+        """Update the name of item if it is in the index"""
+        try:
+            entry = self.members[id(item)]
+        except KeyError:
+            return
+        self._remove_name(entry[0], entry[1])
+        entry[0] = self.name_of(item)
+        self.counts[entry[0]] = self.counts.get(entry[0], 0) + entry[1]
+
+    def _remove_name(self, name, count):
+        remaining = self.counts[name] - count
+        if remaining:
+            self.counts[name] = remaining
+        else:
+            del self.counts[name]
+            if self.name_removed is not None:
+                self.name_removed(name)
+
+    def names(self):
+        """Return list of all names in the order in which they were first
+        added"""
+        return list(self.counts)
+
+    def __contains__(self, name):
+        return name in self.counts
+
+    def __iter__(self):
+        return iter(self.counts)
+
+    def __len__(self):
+        return len(self.counts)
+
+
+class _TrackedMapping(_Tracked):
+    """Mixin for dictionaries which notify their owners when modified"""
+    __slots__ = ()
+
+    def _track_items(self, owner):
+        for key, value in self.items():
+            dict.__setitem__(self, key, track(value, owner))
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, self._track(value))
+        self.mark_changed()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.mark_changed()
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self.mark_changed()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self.mark_changed()
+        return item
+
+    def clear(self):
+        super().clear()
+        self.mark_changed()
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+
+class TrackedDict(_TrackedMapping, dict):
+    """A dictionary which notifies its owners when modified
+
+    :param mapping: Initial contents of dictionary
+    :param owner: Object with a mark_changed method to be notified of changes
+    """
+    __slots__ = ("owners",)
+    _untracked_type = dict
+
+    def __init__(self, mapping=(), owner=None):
+        self.owners = ()
+        dict.__init__(self, mapping)
+        if owner is not None:
+            self.add_owner(owner)
+
+
+class TrackedDefaultDict(_TrackedMapping, defaultdict):
+    """A defaultdict which notifies its owners when modified
+
+    Values created by default_factory on lookup of a missing key are tracked
+    as well.
+
+    :param default_factory: Callable used to create values for missing keys
+    :param mapping: Initial contents of dictionary
+    :param owner: Object with a mark_changed method to be notified of changes
+    """
+    __slots__ = ("owners",)
+
+    def __init__(self, default_factory=None, mapping=(), owner=None):
+        self.owners = ()
+        defaultdict.__init__(self, default_factory, mapping)
+        if owner is not None:
+            self.add_owner(owner)
+
+    def __missing__(self, key):
+        if self.default_factory is None:
+            raise KeyError(key)
+        self[key] = self.default_factory()
+        return dict.__getitem__(self, key)
+
+    def __reduce_ex__(self, protocol):
+        return (defaultdict, (self.default_factory, dict(self)))
+
+    def __repr__(self):
+        return "defaultdict({!r}, {!r})".format(
+            self.default_factory, dict(self))
 
 
 class SortedList(MutableSequence):
     """A list that is guaranteed to remain sorted
 
+    Items which compare equal are kept in the order in which they were added.
+    If sort_key is given, the key of each item is computed once, when it is
+    added, and kept alongside it for use in later binary searches.
+
     :param init_list: Initial list of elements (not necessarily sorted)
-    :param sort_key: Key function for sorting"""
-    def __init__(self, init_list=[], sort_key=None):
+    :param sort_key: Key function for sorting
+    :ivar handles: None or :py:class:`pyw3d.path.HandleIndex` giving stable
+    handles for the items of the list to ProjectPaths"""
+    owners = ()
+    handles = None
+
+    def __init__(self, init_list=(), sort_key=None):
         self.sort_key = sort_key
-        self._data = init_list
+        self._data = list(init_list)
+        self.sort()
+
+    def add_owner(self, owner):
+        """Report future changes to this list to owner as well"""
+        if not any(current is owner for current in self.owners):
+            self.owners += (owner,)
+            for index, item in enumerate(self._data):
+                self._data[index] = track(item, owner)
+
+    def mark_changed(self):
+        """Notify all owners that this list has been modified"""
+        for owner in self.owners:
+            owner.mark_changed()
+
+    def _track(self, value):
+        for owner in self.owners:
+            value = track(value, owner)
+        return value
+
+    def __getstate__(self):
+        # Owners are restored when the owning feature is unpickled, and sort
+        # keys are recomputed
+        state = self.__dict__.copy()
+        state.pop("owners", None)
+        state.pop("_keys", None)
+        state.pop("handles", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
         self.sort()
 
     def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = [self._track(item) for item in value]
+        else:
+            value = self._track(value)
         self._data.__setitem__(index, value)
         self.sort()
+        self.mark_changed()
 
     def __delitem__(self, index):
         del self._data[index]
+        if self.sort_key is not None:
+            del self._keys[index]
+        self.mark_changed()
 
     def __len__(self):
         return len(self._data)
@@ -44,30 +432,53 @@ class SortedList(MutableSequence):
         return self._data[index]
 
     def insert(self, index, new_item):
-        self._data.insert(index, new_item)
+        """Add new_item to list
+
+        Since the position of each item is determined by its sort key, index
+        is ignored."""
+        self.add(new_item)
 
     def add(self, new_item):
-        """Add new_item to list, maintaining proper ordering"""
-        for index, item in enumerate(self):
-            if self.sort_key is None:
-                if new_item < item:
-                    self._data.insert(index, new_item)
-                    return
-            else:
-                if self.sort_key(new_item) < self.sort_key(item):
-                    self._data.insert(index, new_item)
-                    return
-        self._data.insert(len(self), new_item)
+        """Add new_item to list after any equal items, maintaining proper
+        ordering"""
+        new_item = self._track(new_item)
+        if self.sort_key is None:
+            position = bisect_right(self._data, new_item)
+        else:
+            new_key = self.sort_key(new_item)
+            position = bisect_right(self._keys, new_key)
+            self._keys.insert(position, new_key)
+        self._data.insert(position, new_item)
+        self.mark_changed()
 
     def sort(self):
         self._data.sort(key=self.sort_key)
+        if self.sort_key is not None:
+            self._keys = [self.sort_key(item) for item in self._data]
 
     def append(self, value):
         self.add(value)
 
     def extend(self, value_list):
-        for value in value_list:
-            self.add(value)
+        """Add all values in value_list, maintaining proper ordering
+
+        The new values are sorted together with the current ones, which takes
+        O(n log n) time rather than a search and insertion for each value.
+        Values which compare equal to current ones are placed after them."""
+        new_items = [self._track(value) for value in value_list]
+        if not new_items:
+            return
+        if len(new_items) == 1:
+            self.add(new_items[0])
+            return
+        # sort is stable, so current items remain ahead of equal new ones
+        self._data.extend(new_items)
+        self.sort()
+        self.mark_changed()
+
+    def __iadd__(self, value_list):
+        self.extend(value_list)
+        return self
 
     def reverse(self):
         raise NotImplementedError("Cannot reverse a SortedList")
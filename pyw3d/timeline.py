@@ -97,6 +97,7 @@ class W3DTimeline(W3DFeature):
         if "start-immediately" in timeline_root.attrib:
             new_timeline["start_immediately"] = text2bool(timeline_root.attrib[
                 "start-immediately"])
+        timed_actions = []
         for timed_action in timeline_root.findall("TimedActions"):
             try:
                 action_time = float(timed_action.attrib["seconds-time"])
@@ -104,9 +105,9 @@ class W3DTimeline(W3DFeature):
                 raise BadW3DXML(
                     "TimedActions node must specify numeric seconds-time "
                     "attribute")
-            for child in timed_action.getchildren():
-                new_timeline["actions"].add(
-                    (action_time, W3DAction.fromXML(child)))
+            for child in timed_action:
+                timed_actions.append((action_time, W3DAction.fromXML(child)))
+        new_timeline["actions"].extend(timed_actions)
 
         return new_timeline
 
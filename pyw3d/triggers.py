@@ -40,6 +40,8 @@ class W3DTrigger(W3DFeature):
     :ivar base_trigger: A trigger object wrapped by this trigger (see
     __setitem__ and __getitem__ implementation for details)
     """
+    compact_storage = False
+
     def __init__(self, *args, **kwargs):
         self.base_trigger = BareTrigger()
         super(W3DTrigger, self).__init__(*args, **kwargs)
@@ -0,0 +1,190 @@
+# Copyright (C) 2016 William Hicks
+#
+# This file is part of Writing3D.
+#
+# Writing3D is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+"""Compile validators into specialized Python functions
+
+Each validator in the argument_validators of a feature class is turned into
+a single function with the same signature and result as calling the
+validator. The checks made by simple validators (numeric ranges, options,
+names, feature types) are written out inline, including within lists and
+dictionaries, so that no validator methods are called for them. Validators
+which consult the project or the file system are called as usual.
+
+Compiled functions capture the settings of each validator (e.g. min_value)
+at the time of compilation; call :py:func:`clear_compiled_validators` if
+validators are modified afterwards.
+"""
+import logging
+from .validators import TextValidator, ValidPyString, OptionValidator, \
+    ListValidator, DictValidator, IsBoolean, IsNumeric, IsInteger, \
+    FeatureValidator, PY_ID_REGEX
+LOGGER = logging.getLogger("pyw3d")
+
+_COMPILED_VALIDATORS = {}
+
+
+class _FunctionWriter(object):
+    """Writes the source of a single compiled validator
+
+    :ivar list lines: Lines of source written so far
+    :ivar dict namespace: Objects referenced by the source
+    """
+
+    def __init__(self):
+        self.lines = []
+        self.namespace = {"PY_ID_REGEX": PY_ID_REGEX}
+        self.names = 0
+
+    def constant(self, value, prefix="_c"):
+        """Add value to namespace and return its name in the source"""
+        name = "{}{}".format(prefix, len(self.namespace))
+        self.namespace[name] = value
+        return name
+
+    def variable(self):
+        """Return a new local variable name"""
+        self.names += 1
+        return "_x{}".format(self.names)
+
+    def write(self, indent, line):
+        self.lines.append("    " * indent + line)
+
+    def check(self, validator, target, indent):
+        """Write statements which return False from the function if target
+        is not valid according to validator"""
+        validator_type = type(validator)
+        if validator_type in (TextValidator, IsBoolean):
+            return
+        if validator_type is OptionValidator:
+            self.write(indent, "if {} not in {}:".format(
+                target, self.constant(validator.valid_options)))
+            self.write(indent + 1, "return False")
+        elif validator_type is ValidPyString:
+            text = self.variable()
+            self.write(indent, "{} = str({})".format(text, target))
+            self.write(
+                indent, "if not PY_ID_REGEX.match({0}) and len({0}):".format(
+                    text))
+            self.write(indent + 1, "return False")
+        elif validator_type in (IsNumeric, IsInteger):
+            self._check_numeric(validator, target, indent)
+        elif validator_type is FeatureValidator:
+            self.write(indent, "if not isinstance({}, {}):".format(
+                target, self.constant(validator.correct_class)))
+            self.write(indent + 1, "return False")
+            self.write(
+                indent,
+                "if not fallback and not {}.validate(project={}.project):"
+                "".format(target, self.constant(validator)))
+            self.write(indent + 1, "return False")
+        elif validator_type is ListValidator:
+            self._check_list(validator, target, indent)
+        elif validator_type is DictValidator:
+            key = self.variable()
+            value = self.variable()
+            self.write(indent, "for {}, {} in {}.items():".format(
+                key, value, target))
+            self.check(validator.key_validator, key, indent + 1)
+            self.check(validator.value_validator, value, indent + 1)
+            self.write(indent + 1, "pass")
+        else:
+            self.write(indent, "if not {}({}, fallback=fallback):".format(
+                self.constant(validator), target))
+            self.write(indent + 1, "return False")
+
+    def _check_numeric(self, validator, target, indent):
+        number = self.variable()
+        self.write(indent, "try:")
+        self.write(indent + 1, "{} = float({})".format(number, target))
+        self.write(indent, "except (TypeError, ValueError):")
+        self.write(indent + 1, "return False")
+        bounds = []
+        if validator.min_value is not None:
+            bounds.append("{} >= {}".format(
+                number, self.constant(validator.min_value)))
+        if validator.max_value is not None:
+            bounds.append("{} <= {}".format(
+                number, self.constant(validator.max_value)))
+        if bounds:
+            self.write(indent, "if not ({}):".format(" and ".join(bounds)))
+            self.write(indent + 1, "return False")
+        if type(validator) is IsInteger:
+            self.write(indent, "if {0} != int({0}):".format(target))
+            self.write(indent + 1, "return False")
+
+    def _check_list(self, validator, target, indent):
+        index = self.variable()
+        item = self.variable()
+        self.write(indent, "for {} in range(len({})):".format(index, target))
+        self.write(indent + 1, "{} = {}[{}]".format(item, target, index))
+        if len(validator.base_validators) == 1:
+            self.check(validator.base_validators[0], item, indent + 1)
+        else:
+            base_checks = self.constant(tuple(
+                compile_validator(base) for base in
+                validator.base_validators
+            ))
+            self.write(
+                indent + 1,
+                "if not {0}[{1} % {2}]({3}, fallback=fallback):".format(
+                    base_checks, index, len(validator.base_validators),
+                    item))
+            self.write(indent + 2, "return False")
+
+
+def compile_validator(validator):
+    """Return function equivalent to calling validator
+
+    The function takes the same arguments as the validator (value and
+    optionally fallback) and returns True if value is valid."""
+    writer = _FunctionWriter()
+    writer.write(0, "def check(value, fallback=True):")
+    writer.check(validator, "value", 1)
+    writer.write(1, "return True")
+    source = "\n".join(writer.lines)
+    exec(
+        compile(source, "<{}>".format(type(validator).__name__), "exec"),
+        writer.namespace
+    )
+    check = writer.namespace["check"]
+    check.source = source
+    return check
+
+
+def compiled_validators(feature_class):
+    """Return dictionary mapping names of arguments of feature_class to
+    compiled versions of their validators
+
+    Validators are compiled the first time this is called for each class.
+    """
+    try:
+        return _COMPILED_VALIDATORS[feature_class]
+    except KeyError:
+        pass
+    LOGGER.debug("Compiling validators for {}".format(feature_class.__name__))
+    compiled = {
+        key: compile_validator(validator) for key, validator in
+        feature_class.argument_validators.items()
+    }
+    _COMPILED_VALIDATORS[feature_class] = compiled
+    return compiled
+
+
+def clear_compiled_validators():
+    """Discard all compiled validators, so that they are compiled again from
+    the current settings of each validator"""
+    _COMPILED_VALIDATORS.clear()
@@ -21,11 +21,73 @@ import re
 import os
 import logging
 from .path import ProjectPath
+from .file_stats import STAT_CACHE
 LOGGER = logging.getLogger("pyw3d")
 
 
 PY_ID_REGEX = re.compile(r"^[A-Za-z0-9_]+$")
 
+_DEPENDENCY_LOGS = []
+_DIRECT_DEPENDENCY_LOGS = []
+
+
+def start_dependency_log():
+    """Start recording the external state consulted by validators
+
+    Logs may be nested; entries recorded while a log is active are added to
+    every enclosing log when it is finished."""
+    _DEPENDENCY_LOGS.append({})
+    _DIRECT_DEPENDENCY_LOGS.append({})
+
+
+def finish_dependency_log():
+    """Stop recording external state and return the current log
+
+    :return: Dictionary mapping (validator, value) pairs to the external
+        state on which the validity of value depended"""
+    _DIRECT_DEPENDENCY_LOGS.pop()
+    dependencies = _DEPENDENCY_LOGS.pop()
+    if _DEPENDENCY_LOGS:
+        _DEPENDENCY_LOGS[-1].update(dependencies)
+    return dependencies
+
+
+def current_dependency_log(direct=False):
+    """Return the current log without finishing it
+
+    :param bool direct: If True, only return entries recorded by validators
+        while this log was the innermost, excluding those added by nested
+        logs"""
+    if direct:
+        return _DIRECT_DEPENDENCY_LOGS[-1]
+    return _DEPENDENCY_LOGS[-1]
+
+
+def log_dependencies(dependencies):
+    """Record previously logged dependencies in the current log, if any"""
+    if _DEPENDENCY_LOGS:
+        _DEPENDENCY_LOGS[-1].update(dependencies)
+
+
+def dependencies_unchanged(dependencies):
+    """Return True if the external state recorded in dependencies is still
+    current"""
+    try:
+        return all(
+            validator.external_state(value) == state for
+            (validator, value), state in dependencies.items()
+        )
+    except Exception:
+        return False
+
+
+def option_name(option):
+    """Return the name by which option may be referenced"""
+    try:
+        return option["name"]
+    except KeyError:
+        return str(option)
+
 
 class Validator(object):
     """Callable object for validating input
@@ -52,6 +114,21 @@ class Validator(object):
     def __repr__(self):
         return self.__class__.__name__
 
+    def external_state(self, value):
+        """Return the state outside of value on which its validity depends
+
+        For most validators, validity depends only on the value itself and
+        this returns None. Validators which consult files or other parts of
+        the project should record that state using _log_dependency when
+        called, so that memoized results can be discarded when it changes.
+        """
+        return None
+
+    def _log_dependency(self, value, state):
+        if _DEPENDENCY_LOGS:
+            _DEPENDENCY_LOGS[-1][(self, value)] = state
+            _DIRECT_DEPENDENCY_LOGS[-1][(self, value)] = state
+
     def set_project(self, project):
         """Set project to given value for consistency validation"""
         self.project = project
@@ -107,6 +184,9 @@ class ValidPyString(Validator):
 
 
 class ValidFile(Validator):
+    """Callable object that returns true if value is an existing file
+
+    Results are looked up in :py:data:`pyw3d.file_stats.STAT_CACHE`"""
 
     def __init__(self, help_string=None):
         super().__init__()
@@ -125,7 +205,9 @@ class ValidFile(Validator):
             self.help_string = "Could not find file {}".format(
                 value
             )
-        return os.path.isfile(value)
+        validity = STAT_CACHE.isfile(value)
+        self._log_dependency(value, validity)
+        return validity
 
     def __repr__(self):
         return "{}()".format(super().__repr__())
@@ -134,6 +216,9 @@ class ValidFile(Validator):
         # TODO: Think about something clever with os.path here
         return str(value)
 
+    def external_state(self, value):
+        return STAT_CACHE.isfile(value)
+
 
 class ValidFontFile(ValidFile):
     def __call__(self, value, fallback=True):
@@ -343,11 +428,29 @@ class ReferenceValidator(Validator):
             LOGGER.info("Cannot check relative reference to {}".format(
                 value))
             return self.fallback_validator(value)
-        return value in self.valid_menu_items
+        validity = value in self.reference_names()
+        self._log_dependency(value, validity)
+        return validity
 
     def coerce(self, value):
         return self.fallback_validator.coerce(value)
 
+    def external_state(self, value):
+        """Return True if value currently names an element of the project
+        at ref_path"""
+        return value in self.reference_names()
+
+    def reference_names(self):
+        """Return collection of names of the elements at ref_path
+
+        If the project provides an index of these names, that is used
+        directly; otherwise, the names are gathered from the elements."""
+        try:
+            reference_names = self.ref_path.project.reference_names
+        except AttributeError:
+            return [option_name(option) for option in self.valid_options]
+        return reference_names(self.ref_path.path)
+
     def set_project(self, project):
         """Set project to given value"""
         super().set_project(project)
@@ -356,21 +459,20 @@ class ReferenceValidator(Validator):
 
     @property
     def valid_menu_items(self):
-        menu = []
-        for option in self.valid_options:
-            try:
-                menu.append(option["name"])
-            except KeyError:
-                menu.append(str(option))
-        return menu
+        names = self.reference_names()
+        try:
+            return names.names()
+        except AttributeError:
+            return sorted(set(names))
 
     @property
     def valid_options(self):
+        # Features compare by their cached canonical keys, so duplicates can
+        # be found among neighbours after sorting
         _valid_options = []
-        for option in self.ref_path.get_element():
-            if option not in _valid_options:
+        for option in sorted(self.ref_path.get_element()):
+            if not _valid_options or option != _valid_options[-1]:
                 _valid_options.append(option)
-        _valid_options.sort()
         return _valid_options
 
 
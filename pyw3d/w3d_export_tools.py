@@ -25,6 +25,9 @@ import subprocess
 import argparse
 from pyw3d import BLENDER_EXEC, BLENDER_PLAY
 from pyw3d import project
+from pyw3d.snapshot import save_snapshot, load_snapshot
+from pyw3d.build_cache import BuildCache
+from pyw3d.build_trace import BuildTrace
 
 EXPORT_SCRIPT = os.path.abspath(__file__)
 
@@ -40,24 +43,49 @@ def unpickle_w3dproject(filename="run.p"):
 
 
 def export_to_blender(
-        input_project, filename="run.blend", display=True, fullscreen=False):
+        input_project, filename="run.blend", display=True, fullscreen=False,
+        use_cache=True, trace_file=None, trace_format="json"):
     """Save project as .blend file
 
     :param str filename: Name of .blend file to export to
     :param bool display: Display project in standalone player after export?
+    :param bool use_cache: Reuse a previous export if neither the project nor
+    any file it references has changed since then (see
+    :py:class:`pyw3d.build_cache.BuildCache`)
+    :param str trace_file: If given, write a
+    :py:class:`pyw3d.build_trace.BuildTrace` of the build to this file
+    :param str trace_format: "json" or "chrome" (see
+    :py:meth:`pyw3d.build_trace.BuildTrace.write`)
     """
-    try:
-        import bpy  # Check if we're in Blender environment
-        input_project.blend()
-        if os.path.exists(filename):
-            os.remove(filename)
-        bpy.ops.wm.save_as_mainfile(filepath=filename)
-    except ImportError:
-        pickle_w3dproject(input_project)
-        subprocess.check_call([
-            BLENDER_EXEC, "--background", "--python", EXPORT_SCRIPT, "--", "-f"
-            "pickle", "run.p", "-o", os.path.abspath(filename)]
-        )
+    if trace_file is not None:
+        trace_file = os.path.abspath(trace_file)
+    cache = None
+    if use_cache:
+        cache = BuildCache()
+        cache_key = cache.key(input_project)
+    if cache is None or not cache.fetch(cache_key, filename):
+        try:
+            import bpy  # Check if we're in Blender environment
+            trace = BuildTrace(
+                story=os.path.splitext(os.path.basename(filename))[0])
+            input_project.blend(trace=trace)
+            if trace_file is not None:
+                trace.write(trace_file, trace_format=trace_format)
+            if os.path.exists(filename):
+                os.remove(filename)
+            bpy.ops.wm.save_as_mainfile(filepath=filename)
+        except ImportError:
+            save_snapshot(input_project, "run.w3ds")
+            export_call = [
+                BLENDER_EXEC, "--background", "--python", EXPORT_SCRIPT,
+                "--", "-f", "snapshot", "run.w3ds", "-o",
+                os.path.abspath(filename), "--no-cache"]
+            if trace_file is not None:
+                export_call.extend([
+                    "--trace", trace_file, "--trace-format", trace_format])
+            subprocess.check_call(export_call)
+        if cache is not None:
+            cache.store(cache_key, filename)
     if display:
         display_blender_output(
             filename=os.path.abspath(filename), fullscreen=fullscreen)
@@ -83,8 +111,8 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("project_file")
     parser.add_argument(
-        "-f", "--filetype", default="xml", choices=["xml", "pickle"],
-        help="input filetype")
+        "-f", "--filetype", default="xml",
+        choices=["xml", "pickle", "snapshot"], help="input filetype")
     parser.add_argument(
         "-o", "--output", default="run.blend",
         help="filename for output blend file")
@@ -92,12 +120,24 @@ if __name__ == "__main__":
         "-d", "--display", default=False, action="store_true")
     parser.add_argument(
         "-s", "--fullscreen", default=False, action="store_true")
+    parser.add_argument(
+        "--no-cache", default=False, action="store_true",
+        help="always export, even if a cached export is available")
+    parser.add_argument(
+        "--trace", default=None,
+        help="file to write trace of time spent in each phase of build to")
+    parser.add_argument(
+        "--trace-format", default="json", choices=["json", "chrome"],
+        help="format of build trace")
     args = parser.parse_args(argv)
 
     if args.filetype == "xml":
         input_project = project.W3DProject.fromXML_file(args.project_file)
     elif args.filetype == "pickle":
         input_project = unpickle_w3dproject(args.project_file)
+    elif args.filetype == "snapshot":
+        input_project = load_snapshot(args.project_file)
     export_to_blender(
         input_project, filename=args.output, display=args.display,
-        fullscreen=args.fullscreen)
+        fullscreen=args.fullscreen, use_cache=not args.no_cache,
+        trace_file=args.trace, trace_format=args.trace_format)
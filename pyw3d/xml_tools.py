@@ -16,9 +16,18 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>
 
 """Convenience tools for working with W3D xml"""
+import io
 import re
+import sys
+import xml.etree.ElementTree as ET
 from .errors import BadW3DXML
 
+_RAW_ATTRIBUTE_CR = "&#13;" not in ET.tostring(
+    ET.Element("a", a="\r"), encoding="unicode")
+"""True if ElementTree writes carriage returns in attribute values
+unescaped, so that the parser (and therefore minidom's output) turns them
+into newlines. Newer versions escape them and they are kept."""
+
 
 def text2tuple(text, evaluator=str):
     """Take a string of the format 1,2, 3,... or (1,2, 3,...) or [1,2, 3,...]
@@ -85,3 +94,138 @@ def find_xml_text(root, search):
         return search_root.text
     except AttributeError:
         return None
+
+
+def _escape_xml(data):
+    """Escape data for inclusion in pretty-printed XML"""
+    return data.replace("&", "&amp;").replace("<", "&lt;").replace(
+        "\"", "&quot;").replace(">", "&gt;")
+
+
+def _normalize_newlines(text):
+    """Normalize line endings as an XML parser would"""
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+class BlankLineFilter(object):
+    """File-like wrapper which drops whitespace-only lines written to it
+
+    The final line is not terminated by a newline. This is equivalent to
+    splitting all written text on newlines, discarding blank lines and
+    rejoining the remainder, but does not require holding the full text in
+    memory.
+
+    :param file_: File-like object to which filtered text is written"""
+
+    def __init__(self, file_):
+        self.file_ = file_
+        self._line = []
+        self._started = False
+
+    def _end_line(self):
+        line = "".join(self._line)
+        self._line = []
+        if line.strip():
+            if self._started:
+                self.file_.write("\n")
+            self.file_.write(line)
+            self._started = True
+
+    def write(self, data):
+        if "\n" not in data:
+            self._line.append(data)
+            return
+        lines = data.split("\n")
+        self._line.append(lines[0])
+        for line in lines[1:]:
+            self._end_line()
+            self._line.append(line)
+
+    def write_filtered(self, text):
+        """Write complete lines of text which contain no blank lines
+
+        This bypasses filtering, so that previously filtered output can be
+        written without splitting it into lines again."""
+        self._end_line()
+        if text:
+            if self._started:
+                self.file_.write("\n")
+            self.file_.write(text)
+            self._started = True
+
+    def close(self):
+        """Write out any partially-written final line"""
+        self._end_line()
+
+
+def _write_pretty_node(node, writer, indent, addindent, fragments=None):
+    """Recursively write node in the layout used by minidom's toprettyxml
+    """
+    if fragments and node in fragments:
+        writer.write_filtered(fragments[node])
+        return
+    writer.write("{}<{}".format(indent, node.tag))
+    attributes = node.attrib.items()
+    if sys.version_info < (3, 8):  # Older serializers sort attributes
+        attributes = sorted(attributes)
+    for name, value in attributes:
+        if _RAW_ATTRIBUTE_CR:
+            value = _normalize_newlines(value)
+        writer.write(' {}="{}"'.format(name, _escape_xml(value)))
+    children = list(node)
+    if not children:
+        if node.text:
+            writer.write(">{}</{}>\n".format(
+                _escape_xml(_normalize_newlines(node.text)), node.tag))
+        else:
+            writer.write("/>\n")
+        return
+    writer.write(">\n")
+    child_indent = indent + addindent
+    if node.text:
+        writer.write("{}{}\n".format(
+            child_indent, _escape_xml(_normalize_newlines(node.text))))
+    for child in children:
+        _write_pretty_node(child, writer, child_indent, addindent, fragments)
+        if child.tail:
+            writer.write("{}{}\n".format(
+                child_indent, _escape_xml(_normalize_newlines(child.tail))))
+    writer.write("{}</{}>\n".format(indent, node.tag))
+
+
+def pretty_xml_fragment(node, indent="", addindent="\t"):
+    """Return node as it would appear in the output of write_pretty_xml
+
+    :param xml.etree.ElementTree.Element node: The node to write
+    :param str indent: Indentation of node within the full document
+    :param str addindent: String used for each level of indentation
+    """
+    fragment = io.StringIO()
+    writer = BlankLineFilter(fragment)
+    _write_pretty_node(node, writer, indent, addindent)
+    writer.close()
+    return fragment.getvalue()
+
+
+def write_pretty_xml(root, file_, addindent="\t", fragments=None):
+    """Write ElementTree node to file_ as indented XML in a single pass
+
+    Output is identical to serializing root with ElementTree, re-parsing it
+    with :py:mod:`xml.dom.minidom`, calling toprettyxml and discarding
+    whitespace-only lines, which is the format W3D projects have always been
+    saved in.
+
+    :param xml.etree.ElementTree.Element root: The node to write
+    :param file_: File-like object to write to
+    :param str addindent: String used for each level of indentation
+    :param dict fragments: Dictionary mapping nodes within root to text
+        previously returned by :py:func:`pretty_xml_fragment` for them. These
+        nodes are written as the given text rather than serialized again.
+    """
+    # WARNING: Blank lines within paragraphs of text are dropped along with
+    # blank lines produced by indentation, exactly as in the original format
+    writer = BlankLineFilter(file_)
+    writer.write('<?xml version="1.0" ?>\n')
+    _write_pretty_node(root, writer, "", addindent, fragments)
+    writer.close()
+    return file_
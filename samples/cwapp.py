@@ -23,7 +23,9 @@ To run this script, use the following command::
 
     python3 cwapp.py desktopfull run.xml
 
-where run.xml is a copy of your project in archival XML format.
+where run.xml is a copy of your project in archival XML format. If neither
+run.xml nor any file it references has changed since it was last run, the
+previous export is reused. To force a new export, add the --no-cache option.
 
 It is possible to use this script as a drop-in replacement for cwapp with
 CWEditor. In the "Run" menu of CWEditor, select "Configure Paths". Then, simply
@@ -50,6 +52,9 @@ if __name__ == "__main__":
     parser.add_argument(
         "config", choices=["desktop", "desktopfull"], help="run configuration")
     parser.add_argument("project_file")
+    parser.add_argument(
+        "--no-cache", default=False, action="store_true",
+        help="always export, even if a cached export is available")
     if "blender" in sys.argv[0]:
         args = parser.parse_args(sys.argv[4:])
     else:
@@ -64,5 +69,6 @@ if __name__ == "__main__":
     # ...and exporting it!
     export_to_blender(
         my_project, filename=blend_filename, display=True,
-        fullscreen=(args.config == "desktopfull")
+        fullscreen=(args.config == "desktopfull"),
+        use_cache=not args.no_cache
     )
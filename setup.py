@@ -417,6 +417,7 @@ if __name__ == "__main__":
             "pyw3d", "pyw3d.activators", "pyw3d.blender_actions",
             "pyw3d.activators.triggers"
         ],
+        package_data={"pyw3d": ["caveschema.xsd"]},
         classifiers=[
             "Development Status :: 3 - Alpha",
             "Topic :: Artistic Software",
@@ -0,0 +1,68 @@
+# Copyright (C) 2016 William Hicks
+#
+# This file is part of Writing3D.
+#
+# Writing3D is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+
+"""Tests for pyw3d.build_cache
+"""
+import os
+import tempfile
+import unittest
+from pyw3d.build_cache import BuildCache
+from pyw3d.objects import W3DObject, W3DModel
+from pyw3d.project import W3DProject
+
+
+class TestBuildCacheKey(unittest.TestCase):
+
+    def setUp(self):
+        self.working_directory = os.getcwd()
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.addCleanup(os.chdir, self.working_directory)
+        self.project_dir = temp_dir.name
+        self.write("model.obj", "mtllib model.mtl\nv 0 0 0\n")
+        self.write("model.mtl", "newmtl skin\nKd 1 0 0\nmap_Kd skin.png\n")
+        self.write("skin.png", "first")
+        self.cache = BuildCache(
+            directory=os.path.join(self.project_dir, "cache"))
+
+    def write(self, filename, content):
+        with open(os.path.join(self.project_dir, filename), "w") as file_:
+            file_.write(content)
+
+    def key(self):
+        project = W3DProject(call_directory=self.project_dir)
+        project["objects"].append(W3DObject(
+            name="model", content=W3DModel(filename="model.obj")))
+        return self.cache.key(project)
+
+    def test_material_library_change(self):
+        old_key = self.key()
+        self.write("model.mtl", "newmtl skin\nKd 0 1 0\nmap_Kd skin.png\n")
+        self.assertNotEqual(self.key(), old_key)
+
+    def test_texture_change(self):
+        old_key = self.key()
+        self.write("skin.png", "second")
+        self.assertNotEqual(self.key(), old_key)
+
+    def test_unchanged(self):
+        self.assertEqual(self.key(), self.key())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+# Copyright (C) 2016 William Hicks
+#
+# This file is part of Writing3D.
+#
+# Writing3D is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+
+"""Tests for w3dui
+"""
+import os
+import tkinter as tk
+import unittest
+from pyw3d.objects import W3DObject
+from pyw3d.path import ProjectPath
+from pyw3d.placement import W3DPlacement
+from pyw3d.project import W3DProject
+from w3dui.feature import FeatureInput
+
+
+class TestFeatureInput(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        try:
+            cls.root = tk.Tk()
+        except tk.TclError:
+            raise unittest.SkipTest("No display available for Tk")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.root.destroy()
+
+    def setUp(self):
+        self.addCleanup(os.chdir, os.getcwd())
+        self.project = W3DProject()
+
+    def edit_placement(self, index):
+        """Open editor for placement of object at index and return the
+        placement then stored in the project"""
+        path = ProjectPath(self.project, ["objects", index, "placement"])
+        editor = FeatureInput(
+            self.root, W3DObject.argument_validators["placement"], path)
+        self.addCleanup(editor.destroy)
+        return path.get_element()
+
+    def test_derived_feature(self):
+        template = W3DObject(
+            name="template", placement=W3DPlacement(position=(1, 2, 3)))
+        self.project["objects"].append(template)
+        self.project["objects"].append(template.derive(name="copy"))
+        self.assertEqual(self.edit_placement(1)["position"], (1, 2, 3))
+        self.assertEqual(template["placement"]["position"], (1, 2, 3))
+
+    def test_compact_feature(self):
+        W3DPlacement.compact_storage = True
+        self.addCleanup(delattr, W3DPlacement, "compact_storage")
+        self.project["objects"].append(W3DObject(
+            name="compact", placement=W3DPlacement(position=(1, 2, 3))))
+        self.assertIsNot(
+            type(self.project["objects"][0]["placement"]), W3DPlacement)
+        self.assertEqual(self.edit_placement(0)["position"], (1, 2, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+# Copyright (C) 2016 William Hicks
+#
+# This file is part of Writing3D.
+#
+# Writing3D is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+"""Tests for pyw3d.xml_tools
+"""
+import io
+import unittest
+import xml.dom.minidom as minidom
+import xml.etree.ElementTree as ET
+from pyw3d.xml_tools import write_pretty_xml
+
+
+def minidom_pretty_xml(root):
+    """Return root written as W3D XML was before write_pretty_xml"""
+    xml_string = minidom.parseString(
+        ET.tostring(root, encoding="unicode")).toprettyxml()
+    return "\n".join(
+        [line for line in xml_string.split("\n") if line.strip()])
+
+
+class TestWritePrettyXML(unittest.TestCase):
+
+    def assert_matches_minidom(self, root):
+        self.assertEqual(
+            write_pretty_xml(root, io.StringIO()).getvalue(),
+            minidom_pretty_xml(root)
+        )
+
+    def test_nested_text(self):
+        root = ET.Element("Story")
+        node = ET.SubElement(root, "Object", attrib={"name": "a & <b>"})
+        ET.SubElement(node, "Visible").text = "true"
+        ET.SubElement(node, "Text").text = "first\n\nsecond"
+        self.assert_matches_minidom(root)
+
+    def test_carriage_return_in_attribute(self):
+        for value in ("a\rb", "a\r\nb", "a\r", "a\nb"):
+            with self.subTest(value=value):
+                root = ET.Element("Story")
+                ET.SubElement(root, "Object", attrib={"name": value})
+                self.assert_matches_minidom(root)
+
+    def test_carriage_return_in_text(self):
+        for value in ("a\rb", "a\r\nb"):
+            with self.subTest(value=value):
+                root = ET.Element("Story")
+                ET.SubElement(root, "Text").text = value
+                self.assert_matches_minidom(root)
+
+
+if __name__ == "__main__":
+    unittest.main()
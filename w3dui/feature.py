@@ -79,7 +79,10 @@ class FeatureInput(ProjectInput, ttk.LabelFrame):
             value = self.get_stored_value()
         except UnsetValueError:
             value = None
-        if type(value) != self._get_chosen_class():
+        # Compact and derived features are stored as subclasses of the class
+        # they stand in for, which must not be mistaken for a change of class
+        if getattr(type(value), "full_class", type(value)) is not (
+                self._get_chosen_class()):
             self.store_value(value=self._get_chosen_class()())
         for option in self._get_chosen_class().ui_order:
             cur_frame = tk.Frame(target)
@@ -19,6 +19,7 @@
 
 import tkinter as tk
 import os
+from pyw3d.file_stats import STAT_CACHE
 from .base import InputUI, help_bubble, W3DValidatorInput, ProjectInput
 
 
@@ -91,6 +92,8 @@ class FileInput(StringInput, tk.Frame):
     def open_file_dialog(self, *args, **kwargs):
         """Open GUI dialog for obtaining filename"""
         filename = tk.filedialog.askopenfilename()
+        # The file may have been created since it was last checked
+        STAT_CACHE.invalidate(filename)
         old_value = self.get_input_value()
         self.set_input_value(filename)
         if not self.validate_input():